@@ -1,5 +1,6 @@
 class_name ItemTypes
 
+# BEGIN GENERATED ITEM_TYPES (tools/game_data.py; edit tools/game_data.json)
 # Item type enum — all ingredients MUST come before all potions (is_potion relies on this)
 enum Type {
 	NONE = 0,
@@ -40,7 +41,7 @@ enum Type {
 # Display colors for each item type (used by _draw)
 const COLORS: Dictionary = {
 	# Ingredients
-	Type.MUSHROOM: Color(0.72, 0.28, 0.28),       # Red-brown
+	Type.MUSHROOM: Color(0.72, 0.28, 0.28),        # Red-brown
 	Type.HERB: Color(0.35, 0.75, 0.35),            # Green
 	Type.CRYSTAL: Color(0.55, 0.55, 0.95),         # Light blue
 	Type.WATER: Color(0.25, 0.55, 0.85),           # Blue
@@ -168,7 +169,21 @@ const SPRITE_PATHS: Dictionary = {
 	Type.LUCKY_POTION: "res://assets/sprites/items/lucky_potion.png",
 }
 
-const BOTTLE_OVERLAY_PATH := "res://assets/sprites/items/bottle_overlay.png"
+# Pre-composited bottled potion sprites (potion + bottle overlay, see
+# tools/generate_sprites.py), so a bottled item stays a single Sprite2D
+const BOTTLED_SPRITE_PATHS: Dictionary = {
+	Type.HEALTH_POTION: "res://assets/sprites/items/health_potion_bottled.png",
+	Type.MANA_POTION: "res://assets/sprites/items/mana_potion_bottled.png",
+	Type.SPEED_POTION: "res://assets/sprites/items/speed_potion_bottled.png",
+	Type.LOVE_POTION: "res://assets/sprites/items/love_potion_bottled.png",
+	Type.INVISIBILITY_POTION: "res://assets/sprites/items/invisibility_potion_bottled.png",
+	Type.FIRE_RESISTANCE_POTION: "res://assets/sprites/items/fire_resistance_potion_bottled.png",
+	Type.STRENGTH_POTION: "res://assets/sprites/items/strength_potion_bottled.png",
+	Type.NIGHT_VISION_POTION: "res://assets/sprites/items/night_vision_potion_bottled.png",
+	Type.WATER_BREATHING_POTION: "res://assets/sprites/items/water_breathing_potion_bottled.png",
+	Type.LUCKY_POTION: "res://assets/sprites/items/lucky_potion_bottled.png",
+}
+# END GENERATED ITEM_TYPES
 
 # Whether an item type is a potion
 static func is_potion(type: Type) -> bool:
@@ -1,8 +1,8 @@
 class_name Recipes
 
 # Recipe: a set of 2 ingredient types → result potion type
-# Keys are sorted arrays of ItemTypes.Type values (as a string key for lookup)
-# We use a helper to make lookup order-independent
+# Lookup is order-independent via RecipeTable.LOOKUP, a dense table generated
+# from RECIPE_LIST by tools/gen_recipe_table.py (rerun it after editing the list)
 
 const RECIPE_LIST: Array = [
 	# [ingredient_a, ingredient_b, result]
@@ -21,35 +21,19 @@ const RECIPE_LIST: Array = [
 # Which recipe indices are unlocked (starts with first 2)
 static var unlocked_indices: Array = [0, 1]
 
-# Built at load time: Dictionary mapping "typeA,typeB" (sorted) → [recipe_index, result_type]
-static var _lookup: Dictionary = {}
-
-static func _build_lookup() -> void:
-	if not _lookup.is_empty():
-		return
-	for i in range(RECIPE_LIST.size()):
-		var recipe: Array = RECIPE_LIST[i]
-		var key := _make_key(recipe[0], recipe[1])
-		_lookup[key] = [i, recipe[2]]
-
-static func _make_key(a: int, b: int) -> String:
-	if a > b:
-		var tmp := a
-		a = b
-		b = tmp
-	return "%d,%d" % [a, b]
-
 ## Returns the result potion type, or ItemTypes.Type.NONE if no recipe matches or recipe is locked.
+## Allocation-free: one table read, no string key or Dictionary lookup.
 static func check(ingredient_a: int, ingredient_b: int) -> int:
-	_build_lookup()
-	var key := _make_key(ingredient_a, ingredient_b)
-	var entry: Array = _lookup.get(key, [])
-	if entry.is_empty():
+	var n := RecipeTable.TYPE_COUNT
+	if ingredient_a < 0 or ingredient_a >= n or ingredient_b < 0 or ingredient_b >= n:
+		return ItemTypes.Type.NONE
+	var index: int = RecipeTable.LOOKUP[ingredient_a * n + ingredient_b]
+	if index == RecipeTable.NO_RECIPE:
 		return ItemTypes.Type.NONE
 	# Check if this recipe is unlocked
-	if not (entry[0] in unlocked_indices):
+	if not (index in unlocked_indices):
 		return ItemTypes.Type.NONE
-	return entry[1]
+	return RECIPE_LIST[index][2]
 
 ## Get ingredients used by a specific recipe index.
 static func get_recipe_ingredients(index: int) -> Array:
@@ -62,8 +46,3 @@ static func get_recipe_result(index: int) -> int:
 	if index < 0 or index >= RECIPE_LIST.size():
 		return ItemTypes.Type.NONE
 	return RECIPE_LIST[index][2]
-
-## Rebuild lookup (call after modifying unlocked_indices externally).
-static func rebuild() -> void:
-	_lookup.clear()
-	_build_lookup()
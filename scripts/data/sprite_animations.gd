@@ -0,0 +1,49 @@
+class_name SpriteAnimations
+## Baked machine animations (AnimatedSprite2D frames) from
+## assets/sprites/anim/, generated by tools/generate_sprites.py.
+##
+## Each animation is a horizontal strip of 64x64 frames plus an entry in
+## animations.json (frame count, fps, loop). Machines play these instead of
+## calling queue_redraw() every frame to animate in _draw().
+##
+## A missing table or animation returns null; callers keep the static sprite.
+
+const TABLE_PATH := "res://assets/sprites/anim/animations.json"
+
+# Built on first use: animation name → SpriteFrames (one "default" animation)
+static var _frames: Dictionary = {}
+static var _table: Dictionary = {}
+static var _table_loaded: bool = false
+
+static func _load_table() -> void:
+	if _table_loaded:
+		return
+	_table_loaded = true
+	if not ResourceLoader.exists(TABLE_PATH):
+		return
+	var table := load(TABLE_PATH) as JSON
+	if table == null or not (table.data is Dictionary):
+		return
+	_table = table.data.get("animations", {})
+
+## Get the SpriteFrames for an animation (e.g. "cauldron_brew"), or null.
+static func get_frames(anim_name: String) -> SpriteFrames:
+	if _frames.has(anim_name):
+		return _frames[anim_name]
+	_load_table()
+	var entry: Dictionary = _table.get(anim_name, {})
+	var frames: SpriteFrames = null
+	if not entry.is_empty():
+		var strip: Texture2D = load(entry["texture"])
+		var size: Array = entry["frame_size"]
+		frames = SpriteFrames.new()
+		frames.set_animation_speed("default", float(entry["fps"]))
+		frames.set_animation_loop("default", bool(entry["loop"]))
+		for i in range(int(entry["frames"])):
+			var frame := AtlasTexture.new()
+			frame.atlas = strip
+			frame.region = Rect2(i * size[0], 0, size[0], size[1])
+			frame.filter_clip = true
+			frames.add_frame("default", frame)
+	_frames[anim_name] = frames
+	return frames
@@ -0,0 +1,32 @@
+class_name SpriteAtlas
+## Shared AtlasTextures for item and machine sprites.
+##
+## tools/pack_atlas.py packs every items/*.png and machines/*.png into one
+## power-of-two atlas and generates SpriteRegistry: the atlas sheets as
+## preload()s plus a region table keyed by the original res:// path, so
+## existing path tables (ItemTypes.SPRITE_PATHS, MachineBase.SPRITE_PATHS)
+## keep working unchanged. Serving every item and machine from the same texture
+## lets the canvas renderer batch them without texture switches, and the atlas
+## is loaded with the scripts, so spawning and placing never call load().
+##
+## Paths missing from the registry fall back to load(path).
+
+# Built on first use: sprite path → Texture2D (AtlasTexture, or the plain PNG)
+static var _textures: Dictionary = {}
+
+## Get the texture for a sprite path, as a region of the shared atlas when packed.
+static func get_texture(path: String) -> Texture2D:
+	if _textures.has(path):
+		return _textures[path]
+	var tex: Texture2D = null
+	var region: Array = SpriteRegistry.REGIONS.get(path, [])
+	if not region.is_empty():
+		var atlas_tex := AtlasTexture.new()
+		atlas_tex.atlas = SpriteRegistry.ATLASES[region[0]]
+		atlas_tex.region = region[1]
+		atlas_tex.filter_clip = true  # Never sample neighbouring sprites
+		tex = atlas_tex
+	elif ResourceLoader.exists(path):
+		tex = load(path)
+	_textures[path] = tex
+	return tex
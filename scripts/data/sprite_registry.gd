@@ -0,0 +1,62 @@
+class_name SpriteRegistry
+## Preloaded sprite atlases and their region table, for SpriteAtlas.
+##
+## GENERATED by tools/pack_atlas.py along with the atlas PNGs. Do not edit.
+
+const ATLASES: Array = [
+	preload("res://assets/sprites/atlas/sprites_0.png"),
+]
+
+# res:// sprite path → [atlas index, region]
+const REGIONS: Dictionary = {
+	"res://assets/sprites/items/bottle_overlay.png": [0, Rect2(464, 2, 20, 20)],
+	"res://assets/sprites/items/bubble.png": [0, Rect2(486, 2, 20, 20)],
+	"res://assets/sprites/items/clover.png": [0, Rect2(464, 24, 20, 20)],
+	"res://assets/sprites/items/crystal.png": [0, Rect2(486, 24, 20, 20)],
+	"res://assets/sprites/items/dragon_scale.png": [0, Rect2(464, 46, 20, 20)],
+	"res://assets/sprites/items/ember.png": [0, Rect2(486, 46, 20, 20)],
+	"res://assets/sprites/items/eye.png": [0, Rect2(134, 68, 20, 20)],
+	"res://assets/sprites/items/feather.png": [0, Rect2(156, 68, 20, 20)],
+	"res://assets/sprites/items/fire_resistance_potion.png": [0, Rect2(178, 68, 20, 20)],
+	"res://assets/sprites/items/fire_resistance_potion_bottled.png": [0, Rect2(200, 68, 20, 20)],
+	"res://assets/sprites/items/glowshroom.png": [0, Rect2(222, 68, 20, 20)],
+	"res://assets/sprites/items/health_potion.png": [0, Rect2(244, 68, 20, 20)],
+	"res://assets/sprites/items/health_potion_bottled.png": [0, Rect2(266, 68, 20, 20)],
+	"res://assets/sprites/items/heart.png": [0, Rect2(288, 68, 20, 20)],
+	"res://assets/sprites/items/herb.png": [0, Rect2(310, 68, 20, 20)],
+	"res://assets/sprites/items/ice.png": [0, Rect2(332, 68, 20, 20)],
+	"res://assets/sprites/items/invisibility_potion.png": [0, Rect2(354, 68, 20, 20)],
+	"res://assets/sprites/items/invisibility_potion_bottled.png": [0, Rect2(376, 68, 20, 20)],
+	"res://assets/sprites/items/lava.png": [0, Rect2(398, 68, 20, 20)],
+	"res://assets/sprites/items/lightning.png": [0, Rect2(420, 68, 20, 20)],
+	"res://assets/sprites/items/love_potion.png": [0, Rect2(442, 68, 20, 20)],
+	"res://assets/sprites/items/love_potion_bottled.png": [0, Rect2(464, 68, 20, 20)],
+	"res://assets/sprites/items/lucky_potion.png": [0, Rect2(486, 68, 20, 20)],
+	"res://assets/sprites/items/lucky_potion_bottled.png": [0, Rect2(134, 90, 20, 20)],
+	"res://assets/sprites/items/mana_potion.png": [0, Rect2(156, 90, 20, 20)],
+	"res://assets/sprites/items/mana_potion_bottled.png": [0, Rect2(178, 90, 20, 20)],
+	"res://assets/sprites/items/moonlight.png": [0, Rect2(200, 90, 20, 20)],
+	"res://assets/sprites/items/mushroom.png": [0, Rect2(222, 90, 20, 20)],
+	"res://assets/sprites/items/night_vision_potion.png": [0, Rect2(244, 90, 20, 20)],
+	"res://assets/sprites/items/night_vision_potion_bottled.png": [0, Rect2(266, 90, 20, 20)],
+	"res://assets/sprites/items/rose.png": [0, Rect2(288, 90, 20, 20)],
+	"res://assets/sprites/items/seaweed.png": [0, Rect2(310, 90, 20, 20)],
+	"res://assets/sprites/items/shadow.png": [0, Rect2(332, 90, 20, 20)],
+	"res://assets/sprites/items/speed_potion.png": [0, Rect2(354, 90, 20, 20)],
+	"res://assets/sprites/items/speed_potion_bottled.png": [0, Rect2(376, 90, 20, 20)],
+	"res://assets/sprites/items/star.png": [0, Rect2(398, 90, 20, 20)],
+	"res://assets/sprites/items/strength_potion.png": [0, Rect2(420, 90, 20, 20)],
+	"res://assets/sprites/items/strength_potion_bottled.png": [0, Rect2(442, 90, 20, 20)],
+	"res://assets/sprites/items/water.png": [0, Rect2(464, 90, 20, 20)],
+	"res://assets/sprites/items/water_breathing_potion.png": [0, Rect2(486, 90, 20, 20)],
+	"res://assets/sprites/items/water_breathing_potion_bottled.png": [0, Rect2(134, 112, 20, 20)],
+	"res://assets/sprites/machines/auto_seller.png": [0, Rect2(2, 2, 64, 64)],
+	"res://assets/sprites/machines/bottler.png": [0, Rect2(68, 2, 64, 64)],
+	"res://assets/sprites/machines/cauldron.png": [0, Rect2(134, 2, 64, 64)],
+	"res://assets/sprites/machines/conveyor.png": [0, Rect2(200, 2, 64, 64)],
+	"res://assets/sprites/machines/dispenser.png": [0, Rect2(266, 2, 64, 64)],
+	"res://assets/sprites/machines/fast_belt.png": [0, Rect2(332, 2, 64, 64)],
+	"res://assets/sprites/machines/sorter.png": [0, Rect2(398, 2, 64, 64)],
+	"res://assets/sprites/machines/splitter.png": [0, Rect2(2, 68, 64, 64)],
+	"res://assets/sprites/machines/storage.png": [0, Rect2(68, 68, 64, 64)],
+}
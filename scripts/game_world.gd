@@ -38,6 +38,7 @@ var region_manager: RegionManager = null
 const BUILD_RANGE := 5  # Max cells from player to place/interact
 
 # Sprite paths per machine type (duplicated — don't cross-reference class_name constants)
+# BEGIN GENERATED MACHINE_SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const MACHINE_SPRITE_PATHS: Dictionary = {
 	"conveyor": "res://assets/sprites/machines/conveyor.png",
 	"fast_belt": "res://assets/sprites/machines/fast_belt.png",
@@ -49,6 +50,7 @@ const MACHINE_SPRITE_PATHS: Dictionary = {
 	"bottler": "res://assets/sprites/machines/bottler.png",
 	"auto_seller": "res://assets/sprites/machines/auto_seller.png",
 }
+# END GENERATED MACHINE_SPRITE_PATHS
 
 func _ready() -> void:
 	EffectsManager.setup(effects_container)
@@ -30,8 +30,8 @@ func update_preview(pos: Vector2, texture_path: String, dir: Vector2i, valid: bo
 	direction = dir
 	is_valid = valid
 
-	# Load machine texture
-	var tex := load(texture_path) as Texture2D
+	# Machine texture (cached atlas region, so mouse motion never loads)
+	var tex: Texture2D = SpriteAtlas.get_texture(texture_path) if texture_path != "" else null
 	if tex != null:
 		_sprite.texture = tex
 	_sprite.rotation = Vector2(direction).angle()
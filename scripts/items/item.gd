@@ -2,7 +2,8 @@ class_name Item
 extends Node2D
 ## Moving item entity — represents an ingredient or potion on the grid.
 ## Pushed between machines via the reservation model (see MachineBase).
-## Rendered as a Sprite2D with an optional bottle overlay when bottled.
+## Rendered as a single Sprite2D; bottling swaps in the pre-composited bottled
+## sprite. Textures come from the shared sprite atlas (see SpriteAtlas).
 
 var item_type: int = ItemTypes.Type.NONE
 var is_bottled: bool = false  # Set by Bottler via set_bottled(); doubles sell price
@@ -14,9 +15,8 @@ var move_speed: float = 120.0  # px/s; FastBelt overrides to 240
 const DEFAULT_SPEED := 120.0
 const ITEM_RADIUS := 10.0
 
-# Sprite children
+# Sprite child
 var _sprite: Sprite2D = null
-var _bottle_overlay: Sprite2D = null
 
 # Called when the item finishes arriving at its target
 signal arrived
@@ -34,10 +34,15 @@ func _setup_sprite() -> void:
 	if _sprite != null:
 		_sprite.queue_free()
 	_sprite = Sprite2D.new()
+	_update_texture()
+	add_child(_sprite)
+
+func _update_texture() -> void:
 	var path: String = ItemTypes.SPRITE_PATHS.get(item_type, "")
+	if is_bottled:
+		path = ItemTypes.BOTTLED_SPRITE_PATHS.get(item_type, path)
 	if path != "":
-		_sprite.texture = load(path)
-	add_child(_sprite)
+		_sprite.texture = SpriteAtlas.get_texture(path)
 
 func _process(delta: float) -> void:
 	if not is_moving:
@@ -57,13 +62,8 @@ func move_to(world_pos: Vector2, speed: float = DEFAULT_SPEED) -> void:
 	move_speed = speed
 	is_moving = true
 
-## Set bottled state and add/remove the golden bottle overlay sprite.
+## Set bottled state and swap between the plain and bottled potion sprite.
 func set_bottled(bottled: bool) -> void:
 	is_bottled = bottled
-	if bottled and _bottle_overlay == null:
-		_bottle_overlay = Sprite2D.new()
-		_bottle_overlay.texture = load(ItemTypes.BOTTLE_OVERLAY_PATH)
-		add_child(_bottle_overlay)
-	elif not bottled and _bottle_overlay != null:
-		_bottle_overlay.queue_free()
-		_bottle_overlay = null
+	if _sprite != null:
+		_update_texture()
@@ -14,11 +14,11 @@ func _ready() -> void:
 	machine_color = Color(0.75, 0.55, 0.15)  # Amber
 	machine_label = "Btl"
 	setup_sprite("bottler")
+	setup_animation("bottler_fill", true)  # Fill bar stays upright
 
 func _process(delta: float) -> void:
 	if _is_bottling:
 		_bottle_timer += delta
-		queue_redraw()
 		if _bottle_timer >= BOTTLE_TIME:
 			_finish_bottling()
 		return
@@ -49,10 +49,12 @@ func receive_item(item: Node2D) -> bool:
 func _start_bottling() -> void:
 	_is_bottling = true
 	_bottle_timer = 0.0
+	play_animation()  # Baked fill bar (bottler_fill), spans BOTTLE_TIME
 	queue_redraw()
 
 func _finish_bottling() -> void:
 	_is_bottling = false
+	stop_animation()
 	if current_item != null:
 		current_item.set_bottled(true)
 	# Golden sparkle + sound on bottling complete
@@ -69,10 +71,9 @@ func _try_push_output() -> void:
 		current_item = null
 
 func _draw() -> void:
-	# Bottling progress indicator overlay
-	if _is_bottling:
-		var progress := _bottle_timer / BOTTLE_TIME
-		var fill_height := 14.0 * progress
-		draw_rect(Rect2(-5, 10 - fill_height, 10, fill_height), Color(0.9, 0.8, 0.3, 0.6))
+	# Bottling progress comes from the baked animation (machine_anim); without
+	# it, show a static half-full bar rather than redrawing every frame
+	if _is_bottling and machine_anim == null:
+		draw_rect(Rect2(-5, 3, 10, 7), Color(0.9, 0.8, 0.3, 0.6))
 
 	draw_direction_arrow()
@@ -26,11 +26,11 @@ func _ready() -> void:
 	machine_color = Color(0.6, 0.35, 0.65)
 	machine_label = "Cldn"
 	setup_sprite("cauldron")
+	setup_animation("cauldron_brew")
 
 func _process(delta: float) -> void:
 	if _is_brewing:
 		_brew_timer += delta
-		queue_redraw()  # Animate bubbles
 		if _brew_timer >= BREW_TIME:
 			_finish_brewing()
 		return
@@ -82,10 +82,12 @@ func _start_brewing() -> void:
 	_brew_result = result
 	_is_brewing = true
 	_brew_timer = 0.0
+	play_animation()  # Baked bubbles (cauldron_brew)
 	queue_redraw()
 
 func _finish_brewing() -> void:
 	_is_brewing = false
+	stop_animation()
 	stored_ingredients.clear()
 
 	if item_container == null:
@@ -125,12 +127,12 @@ func _draw() -> void:
 			var color: Color = ItemTypes.COLORS.get(stored_ingredients[i], Color.WHITE)
 			draw_circle(offset, 5.0, color)
 
-	# Brewing indicator — animated bubbles
-	if _is_brewing:
-		var progress := _brew_timer / BREW_TIME
+	# Brewing bubbles: baked animation (machine_anim) when generated,
+	# drawn here only as a fallback. No per-frame redraw either way.
+	if _is_brewing and machine_anim == null:
 		var bubble_color := Color(0.8, 0.6, 1.0, 0.7)
 		for i in range(3):
-			var angle := progress * TAU * 2.0 + i * TAU / 3.0
+			var angle := i * TAU / 3.0
 			var pos := Vector2(cos(angle), sin(angle)) * 10.0
 			draw_circle(pos, 3.0, bubble_color)
 
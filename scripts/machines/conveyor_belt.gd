@@ -5,6 +5,8 @@ func _ready() -> void:
 	machine_color = Color(0.45, 0.45, 0.5)
 	machine_label = "Belt"
 	setup_sprite("conveyor")
+	setup_animation("conveyor")
+	play_animation()  # Rollers scroll continuously
 
 func _process(_delta: float) -> void:
 	if current_item == null:
@@ -7,6 +7,8 @@ func _ready() -> void:
 	machine_color = Color(0.75, 0.6, 0.2)  # Golden
 	machine_label = "Fast"
 	setup_sprite("fast_belt")
+	setup_animation("fast_belt")
+	play_animation()  # Rollers and chevrons scroll continuously
 
 func _process(_delta: float) -> void:
 	if current_item == null:
@@ -18,7 +18,9 @@ extends Node2D
 ## "output item ready to push".
 ##
 ## SUBCLASS CONTRACT:
-## - Override _ready() to call setup_sprite("type_key") for sprite visuals
+## - Override _ready() to call setup_sprite("type_key") for sprite visuals, and
+##   setup_animation("anim_name") for a baked animation (see SpriteAnimations;
+##   pass overlay = true for a strip drawn unrotated over the sprite)
 ## - Override _draw() for overlay visuals (arrows, indicators) drawn ON TOP of sprite
 ## - Override receive_item() to add acceptance conditions (e.g., potions only)
 ## - Call try_push_item() in _process() to push output to the next machine
@@ -50,11 +52,18 @@ var machine_label: String = "?"
 # Sprite child node for machine texture (created by setup_sprite)
 var machine_sprite: Sprite2D = null
 
+# Baked animation child (created by setup_animation). While playing it is
+# shown in place of machine_sprite, so animating never needs _draw().
+var machine_anim: AnimatedSprite2D = null
+# True if machine_anim is an overlay: unrotated, shown on top of machine_sprite
+var machine_anim_overlay: bool = false
+
 # Duplicated from GridManager (can't cross-reference class_name constants reliably)
 const CELL_SIZE := 64
 const MACHINE_SIZE := 52.0  # Slightly smaller than cell for visual gap
 
 # Sprite texture paths per machine type (duplicated — don't cross-reference class_name)
+# BEGIN GENERATED SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const SPRITE_PATHS: Dictionary = {
 	"conveyor": "res://assets/sprites/machines/conveyor.png",
 	"fast_belt": "res://assets/sprites/machines/fast_belt.png",
@@ -66,23 +75,64 @@ const SPRITE_PATHS: Dictionary = {
 	"bottler": "res://assets/sprites/machines/bottler.png",
 	"auto_seller": "res://assets/sprites/machines/auto_seller.png",
 }
+# END GENERATED SPRITE_PATHS
 
-## Create a Sprite2D child with the machine texture, rotated to match direction.
+## Create a Sprite2D child with the machine texture (a region of the shared
+## sprite atlas, see SpriteAtlas), rotated to match direction.
 ## Called from subclass _ready(). show_behind_parent ensures _draw() overlays
 ## render ON TOP of the sprite.
 func setup_sprite(machine_type: String) -> void:
 	if not SPRITE_PATHS.has(machine_type):
 		return
 	machine_sprite = Sprite2D.new()
-	machine_sprite.texture = load(SPRITE_PATHS[machine_type])
+	machine_sprite.texture = SpriteAtlas.get_texture(SPRITE_PATHS[machine_type])
 	machine_sprite.show_behind_parent = true
 	machine_sprite.rotation = Vector2(direction).angle()
 	add_child(machine_sprite)
 
+## Create a hidden AnimatedSprite2D child for a baked animation, rotated like
+## the sprite. An overlay animation stays unrotated and plays on top of the
+## static sprite instead of replacing it. Called from subclass _ready() after
+## setup_sprite(). Does nothing if the animation was not generated.
+func setup_animation(anim_name: String, overlay: bool = false) -> void:
+	var frames := SpriteAnimations.get_frames(anim_name)
+	if frames == null:
+		return
+	machine_anim = AnimatedSprite2D.new()
+	machine_anim.sprite_frames = frames
+	machine_anim.show_behind_parent = true
+	machine_anim_overlay = overlay
+	if not overlay:
+		machine_anim.rotation = Vector2(direction).angle()
+	machine_anim.visible = false
+	add_child(machine_anim)
+
+## Play the baked animation from its first frame in place of the static sprite
+## (over it, for an overlay).
+func play_animation() -> void:
+	if machine_anim == null:
+		return
+	machine_anim.stop()  # Rewind, so one-shot animations restart
+	machine_anim.play()
+	machine_anim.visible = true
+	if machine_sprite != null and not machine_anim_overlay:
+		machine_sprite.visible = false
+
+## Stop the baked animation and show the static sprite again.
+func stop_animation() -> void:
+	if machine_anim == null:
+		return
+	machine_anim.stop()
+	machine_anim.visible = false
+	if machine_sprite != null:
+		machine_sprite.visible = true
+
 ## Update sprite rotation to match current direction.
 func _update_sprite_rotation() -> void:
 	if machine_sprite != null:
 		machine_sprite.rotation = Vector2(direction).angle()
+	if machine_anim != null and not machine_anim_overlay:
+		machine_anim.rotation = Vector2(direction).angle()
 
 func _draw() -> void:
 	# Draw direction arrow overlay (on top of sprite)
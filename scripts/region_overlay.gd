@@ -13,6 +13,8 @@ extends Node2D
 ## inserted after GridOverlay so it draws on top of the grid dots but below machines.
 
 const CELL_SIZE := 64  # Duplicated from GridManager (load order safety)
+const NAME_FONT_SIZE := 16  # Region name label
+const COST_FONT_SIZE := 14  # Region cost label
 
 ## Set by main.gd during initialization.
 var region_manager: RegionManager = null
@@ -74,22 +76,21 @@ func _draw_dashed_line(from: Vector2, to: Vector2, color: Color, width: float, d
 ## Draw region name and cost label centered in the world rect.
 func _draw_region_label(rect: Rect2, region_name: String, cost: int) -> void:
 	var center := rect.get_center()
-	var font: Font = UITheme.get_font()
 	draw_string(
-		font,
+		UITheme.get_sized_font(NAME_FONT_SIZE),
 		center + Vector2(-60, -6),
 		region_name,
 		HORIZONTAL_ALIGNMENT_CENTER,
 		120,
-		16,
+		NAME_FONT_SIZE,
 		Color(0.93, 0.85, 0.6, 0.75),
 	)
 	draw_string(
-		font,
+		UITheme.get_sized_font(COST_FONT_SIZE),
 		center + Vector2(-30, 16),
 		str(cost) + "g",
 		HORIZONTAL_ALIGNMENT_CENTER,
 		60,
-		14,
+		COST_FONT_SIZE,
 		Color(1.0, 0.9, 0.3, 0.65),
 	)
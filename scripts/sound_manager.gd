@@ -1,10 +1,16 @@
 extends Node
-## Autoload singleton for sound effects. Generates all audio programmatically
-## in _ready() using AudioStreamWAV — no external .wav/.ogg files needed.
+## Autoload singleton for sound effects. All audio is synthesized; the _gen_*
+## functions below define every sound.
 ##
 ## Each sound is a short buffer of 16-bit mono PCM samples at 22050 Hz, stored
 ## as an AudioStreamPlayer child node. Call SoundManager.play("name") from anywhere.
 ##
+## tools/bake_sounds.py runs the same generators offline (NumPy) and writes
+## assets/sounds/*.wav plus a manifest. _ready() loads that bank, so launch
+## doesn't pay for synthesis; it only synthesizes here if the bank is missing.
+## Keep SOUNDS in bake_sounds.py in step with the _create_sound() calls in
+## _synthesize_all() (bake_sounds.py --check verifies both the list and the samples).
+##
 ## Sound palette:
 ##   place          — rising sweep (machine placed)
 ##   remove         — falling sweep (machine removed)
@@ -22,10 +28,42 @@ extends Node
 const SAMPLE_RATE := 22050
 const MIX_RATE := 22050
 const BASE_VOLUME_DB := -8.0
+const BANK_MANIFEST := "res://assets/sounds/sounds.json"
 
 var _players: Dictionary = {}  # name → AudioStreamPlayer
 
 func _ready() -> void:
+	if not _load_bank():
+		_synthesize_all()
+
+	# Connect to SettingsManager for SFX volume changes
+	var settings = get_node_or_null("/root/SettingsManager")
+	if settings:
+		settings.settings_changed.connect(_on_settings_changed)
+		_on_settings_changed()  # Apply initial volume
+
+## Load the pre-baked bank (see tools/bake_sounds.py). Returns false, leaving
+## no players behind, if the manifest or any of its sounds is missing.
+func _load_bank() -> bool:
+	if not ResourceLoader.exists(BANK_MANIFEST):
+		return false
+	var manifest := load(BANK_MANIFEST) as JSON
+	if manifest == null or not (manifest.data is Dictionary):
+		return false
+	var sounds: Dictionary = manifest.data.get("sounds", {})
+	for sound_name in sounds:
+		var path: String = sounds[sound_name]["path"]
+		var stream: AudioStream = load(path) as AudioStream if ResourceLoader.exists(path) else null
+		if stream == null:
+			for player in _players.values():
+				player.queue_free()
+			_players.clear()
+			return false
+		_add_player(sound_name, stream)
+	return not _players.is_empty()
+
+## Synthesize every sound in GDScript (fallback when the bank is missing).
+func _synthesize_all() -> void:
 	_create_sound("place", _gen_sweep(300.0, 500.0, 0.08))
 	_create_sound("remove", _gen_sweep(400.0, 200.0, 0.08))
 	_create_sound("brew_complete", _gen_sine_decay(800.0, 0.15))
@@ -36,12 +74,6 @@ func _ready() -> void:
 	_create_sound("order_complete", _gen_arpeggio([500.0, 700.0, 900.0], 0.13))
 	_create_sound("click", _gen_noise_burst(0.03))
 
-	# Connect to SettingsManager for SFX volume changes
-	var settings = get_node_or_null("/root/SettingsManager")
-	if settings:
-		settings.settings_changed.connect(_on_settings_changed)
-		_on_settings_changed()  # Apply initial volume
-
 ## Play a named sound effect.
 func play(sound_name: String) -> void:
 	if _players.has(sound_name):
@@ -54,7 +86,9 @@ func _create_sound(sound_name: String, data: PackedByteArray) -> void:
 	stream.mix_rate = MIX_RATE
 	stream.stereo = false
 	stream.data = data
+	_add_player(sound_name, stream)
 
+func _add_player(sound_name: String, stream: AudioStream) -> void:
 	var player := AudioStreamPlayer.new()
 	player.stream = stream
 	player.volume_db = BASE_VOLUME_DB
@@ -5,6 +5,7 @@ extends PanelContainer
 var _content: VBoxContainer
 
 # Sprite paths per potion type (duplicated — don't cross-reference class_name constants)
+# BEGIN GENERATED POTION_SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const POTION_SPRITE_PATHS: Dictionary = {
 	21: "res://assets/sprites/items/health_potion.png",
 	22: "res://assets/sprites/items/mana_potion.png",
@@ -17,6 +18,7 @@ const POTION_SPRITE_PATHS: Dictionary = {
 	29: "res://assets/sprites/items/water_breathing_potion.png",
 	30: "res://assets/sprites/items/lucky_potion.png",
 }
+# END GENERATED POTION_SPRITE_PATHS
 
 func _ready() -> void:
 	# Position on right side
@@ -72,8 +74,8 @@ func _add_order_card(order: Dictionary) -> void:
 	# Potion sprite icon
 	var potion_icon := TextureRect.new()
 	var tex_path: String = POTION_SPRITE_PATHS.get(order["potion_type"], "")
-	if tex_path != "" and ResourceLoader.exists(tex_path):
-		potion_icon.texture = load(tex_path) as Texture2D
+	if tex_path != "":
+		potion_icon.texture = SpriteAtlas.get_texture(tex_path)
 	potion_icon.custom_minimum_size = Vector2(16, 16)
 	potion_icon.stretch_mode = TextureRect.STRETCH_KEEP_ASPECT_CENTERED
 	top_row.add_child(potion_icon)
@@ -20,6 +20,7 @@ const MACHINE_DEFS: Array = [
 ]
 
 # Sprite paths per machine type (duplicated — don't cross-reference class_name constants)
+# BEGIN GENERATED MACHINE_SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const MACHINE_SPRITE_PATHS: Dictionary = {
 	"conveyor": "res://assets/sprites/machines/conveyor.png",
 	"fast_belt": "res://assets/sprites/machines/fast_belt.png",
@@ -31,6 +32,7 @@ const MACHINE_SPRITE_PATHS: Dictionary = {
 	"bottler": "res://assets/sprites/machines/bottler.png",
 	"auto_seller": "res://assets/sprites/machines/auto_seller.png",
 }
+# END GENERATED MACHINE_SPRITE_PATHS
 
 # Descriptions for tooltips (accessed by tooltip system)
 const MACHINE_DESCRIPTIONS: Dictionary = {
@@ -79,8 +81,8 @@ func _add_button(parent: HBoxContainer, label_text: String, machine_type: String
 	var icon := TextureRect.new()
 	icon.name = "Icon"
 	var tex_path: String = MACHINE_SPRITE_PATHS.get(machine_type, "")
-	if tex_path != "" and ResourceLoader.exists(tex_path):
-		icon.texture = load(tex_path) as Texture2D
+	if tex_path != "":
+		icon.texture = SpriteAtlas.get_texture(tex_path)
 	icon.custom_minimum_size = Vector2(32, 32)
 	icon.stretch_mode = TextureRect.STRETCH_KEEP_ASPECT_CENTERED
 	icon.mouse_filter = Control.MOUSE_FILTER_IGNORE
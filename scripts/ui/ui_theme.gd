@@ -6,6 +6,7 @@ class_name UITheme
 ##
 ## Usage:
 ##   UITheme.get_font()                -> FontFile (m5x7 pixel font)
+##   UITheme.get_sized_font(size)      -> pre-rasterized m5x7 at one size (or get_font())
 ##   UITheme.make_wood_panel_style()   -> StyleBoxTexture (9-slice wood panel)
 ##   UITheme.make_dark_panel_style()   -> StyleBoxTexture (darker variant)
 ##   UITheme.make_parchment_style()    -> StyleBoxTexture (cream/tan paper)
@@ -34,6 +35,7 @@ const FONT_SIZE_TITLE := 28
 # ── Texture paths ────────────────────────────────────────────────────────────
 
 const _FONT_PATH := "res://assets/fonts/m5x7.ttf"
+const _BITMAP_FONT_PATH := "res://assets/fonts/bitmap/m5x7_%d.fnt"  # tools/bake_font.py
 const _WOOD_PANEL_PATH := "res://assets/sprites/ui/wood_panel.png"
 const _DARK_PANEL_PATH := "res://assets/sprites/ui/wood_panel_dark.png"
 const _PARCHMENT_PATH := "res://assets/sprites/ui/parchment.png"
@@ -46,6 +48,7 @@ const _BTN_PRESSED_PATH := "res://assets/sprites/ui/button_wood_pressed.png"
 # ── Lazy-loaded caches ───────────────────────────────────────────────────────
 
 static var _font: Font = null
+static var _sized_fonts: Dictionary = {}  # font size → Font
 static var _coin_tex: Texture2D = null
 static var _lock_tex: Texture2D = null
 
@@ -59,6 +62,15 @@ static func get_font() -> Font:
 			_font = ThemeDB.fallback_font
 	return _font
 
+## Bitmap m5x7 baked at exactly this size by tools/bake_font.py, so nothing
+## is rasterized at runtime. Sizes that weren't baked get the TTF.
+static func get_sized_font(font_size: int) -> Font:
+	if not _sized_fonts.has(font_size):
+		var path := _BITMAP_FONT_PATH % font_size
+		var font: Font = load(path) as Font if ResourceLoader.exists(path) else null
+		_sized_fonts[font_size] = font if font != null else get_font()
+	return _sized_fonts[font_size]
+
 static func get_coin_texture() -> Texture2D:
 	if _coin_tex == null:
 		_coin_tex = load(_COIN_PATH) as Texture2D
@@ -114,13 +126,13 @@ static func make_button_styleboxes() -> Dictionary:
 
 ## Apply pixel font + size + color to any Label node.
 static func apply_label_style(label: Label, font_size: int = FONT_SIZE_MEDIUM, color: Color = COLOR_TEXT) -> void:
-	label.add_theme_font_override("font", get_font())
+	label.add_theme_font_override("font", get_sized_font(font_size))
 	label.add_theme_font_size_override("font_size", font_size)
 	label.add_theme_color_override("font_color", color)
 
 ## Apply pixel font + size + color to a Button node.
 static func apply_button_font(btn: Button, font_size: int = FONT_SIZE_MEDIUM, color: Color = COLOR_TEXT) -> void:
-	btn.add_theme_font_override("font", get_font())
+	btn.add_theme_font_override("font", get_sized_font(font_size))
 	btn.add_theme_font_size_override("font_size", font_size)
 	btn.add_theme_color_override("font_color", color)
 
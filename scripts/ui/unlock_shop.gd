@@ -7,6 +7,7 @@ var _recipe_buttons: Array = []
 var _machine_buttons: Array = []
 
 # Sprite paths (duplicated — don't cross-reference class_name constants)
+# BEGIN GENERATED MACHINE_SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const MACHINE_SPRITE_PATHS: Dictionary = {
 	"conveyor": "res://assets/sprites/machines/conveyor.png",
 	"fast_belt": "res://assets/sprites/machines/fast_belt.png",
@@ -18,7 +19,9 @@ const MACHINE_SPRITE_PATHS: Dictionary = {
 	"bottler": "res://assets/sprites/machines/bottler.png",
 	"auto_seller": "res://assets/sprites/machines/auto_seller.png",
 }
+# END GENERATED MACHINE_SPRITE_PATHS
 
+# BEGIN GENERATED POTION_SPRITE_PATHS (tools/game_data.py; edit tools/game_data.json)
 const POTION_SPRITE_PATHS: Dictionary = {
 	21: "res://assets/sprites/items/health_potion.png",
 	22: "res://assets/sprites/items/mana_potion.png",
@@ -31,6 +34,7 @@ const POTION_SPRITE_PATHS: Dictionary = {
 	29: "res://assets/sprites/items/water_breathing_potion.png",
 	30: "res://assets/sprites/items/lucky_potion.png",
 }
+# END GENERATED POTION_SPRITE_PATHS
 
 func _ready() -> void:
 	# Position centered on screen, slightly larger
@@ -150,8 +154,8 @@ func _add_recipe_item(parent: GridContainer, index: int) -> void:
 	# Potion sprite
 	var icon := TextureRect.new()
 	var tex_path: String = POTION_SPRITE_PATHS.get(recipe[2], "")
-	if tex_path != "" and ResourceLoader.exists(tex_path):
-		icon.texture = load(tex_path) as Texture2D
+	if tex_path != "":
+		icon.texture = SpriteAtlas.get_texture(tex_path)
 	icon.custom_minimum_size = Vector2(24, 24)
 	icon.stretch_mode = TextureRect.STRETCH_KEEP_ASPECT_CENTERED
 	top.add_child(icon)
@@ -197,8 +201,8 @@ func _add_machine_item(parent: GridContainer, key: String) -> void:
 	# Machine sprite
 	var icon := TextureRect.new()
 	var tex_path: String = MACHINE_SPRITE_PATHS.get(key, "")
-	if tex_path != "" and ResourceLoader.exists(tex_path):
-		icon.texture = load(tex_path) as Texture2D
+	if tex_path != "":
+		icon.texture = SpriteAtlas.get_texture(tex_path)
 	icon.custom_minimum_size = Vector2(32, 32)
 	icon.stretch_mode = TextureRect.STRETCH_KEEP_ASPECT_CENTERED
 	card.add_child(icon)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Bound a saved factory's throughput with max flow, without simulating it.
+
+Usage:
+    python3 tools/analyze_factory.py                         # the game's own save
+    python3 tools/analyze_factory.py savegame.json --top 30
+    python3 tools/analyze_factory.py --full-grid --size 120x70
+    python3 tools/analyze_factory.py --check                 # bounds vs the simulator
+
+Builds the directed machine graph of a save (grid positions and
+dir_x/dir_y, Sorter and Splitter fan-out) with capacities in items per
+minute from belt speeds, dispenser, brew, bottle and sell times, and runs
+max flow per unlocked recipe (factory_sim/flow.py). Reports:
+
+  - the most potions per minute each recipe could make on this layout,
+    and which stage limits it (an ingredient's supply, both together, or
+    getting potions to sellers)
+  - bottlenecks: the min-cut edges and machines that cap those numbers,
+    the ones carrying the most flow first
+  - the busiest rate-limited machines, and starved lines: cauldrons no
+    ingredient reaches, sellers no potion reaches
+
+These are upper bounds: items lost to refusing machines, stalls and
+recipes competing for one belt are not modelled. --check verifies that
+the simulator never beats them on a tiled grid, splitter lines and
+--seeds random layouts, and that it comes within 5% of them on the
+tiled grid and the splitter lines, so an over-estimate fails too.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import game_data
+from factory_sim import Simulator, layout_from_save, load_rules
+from factory_sim.flow import analyze, bottlenecks, utilization
+from factory_sim.layout import SAVE_PATH
+from factory_sim.synthetic import random_layout, splitter_layouts, tiled_layout
+
+TIGHT = 0.95  # Share of its bound a layout with no losses must sell
+
+
+def item_names():
+    data = game_data.load_data()
+    values = game_data.type_values(data)
+    return {values[item["id"]]: item["name"] for item in data["items"]}
+
+
+def describe(layout, label, names):
+    what, i, target = label
+    m = layout.machines[i]
+    here = f"{m.type} ({m.x}, {m.y})"
+    if what == "edge":
+        t = layout.machines[target]
+        return f"{here} -> {t.type} ({t.x}, {t.y})"
+    if what == "supply":
+        return f"{here} supply of {names.get(m.ingredient_type, m.ingredient_type)}"
+    return here
+
+
+# ── Report ───────────────────────────────────────────────────────────
+
+def report(name, layout, rules, top):
+    start = time.perf_counter()
+    rates, bounds = analyze(layout, rules)
+    wall = time.perf_counter() - start
+    names = item_names()
+    print(f"{name}: {len(layout.machines)} machines, analyzed in {wall * 1000:.0f} ms")
+    if not bounds:
+        print("  no unlocked recipe has dispensers for both ingredients")
+        return
+    print("  max potions/min (upper bound):")
+    for bound in sorted(bounds, key=lambda b: -b.potions_per_minute):
+        a, b = (names.get(t, t) for t in bound.ingredients)
+        limit = {"a": f"{a} supply", "b": f"{b} supply", "a+b": "ingredient transport",
+                 "potion": "potion transport"}[bound.limit]
+        print(f"    {bound.potions_per_minute:7.1f}  {names.get(bound.potion, bound.potion):24} "
+              f"limited by {limit}")
+
+    print(f"  bottlenecks (min cut), top {top}:")
+    for label, capacity, flow, recipes in bottlenecks(bounds)[:top]:
+        potions = ", ".join(names.get(rules.recipes[r][2], str(r)) for r in recipes)
+        print(f"    {flow:7.1f}/min of {capacity:5.1f}  {describe(layout, label, names):44} {potions}")
+
+    busy = utilization(layout, rates, bounds)
+    print(f"  busiest machines, top {top} (over 100%: recipes bounded separately share it):")
+    for i, flow, capacity in busy[:top]:
+        print(f"    {flow / capacity:6.0%}  {describe(layout, ('machine', i, -1), names):24} "
+              f"{flow:5.1f} of {capacity:5.1f}/min")
+    used = {i for i, flow, _ in busy if flow > 1e-6}
+    starved = [i for i in list(rates.cauldrons) + list(rates.sellers) if i not in used]
+    if starved:
+        print(f"  starved: {len(starved)} machines see no flow")
+        for i in starved[:top]:
+            print(f"    {describe(layout, ('machine', i, -1), names)}")
+
+
+# ── Check ────────────────────────────────────────────────────────────
+
+def check(rules, seeds, minutes):
+    """Simulate each layout and fail if any recipe sells more than its
+    bound, or on the tiled grid and the splitter lines (where nothing is
+    lost or contended) less than TIGHT of it."""
+    layouts = [("tiled 60x35", tiled_layout(rules), True)]
+    layouts += [(name, layout, True) for name, layout in splitter_layouts(rules)]
+    layouts += [(f"random seed {seed}", random_layout(rules, seed, 14, 12, 24), False)
+                for seed in range(seeds)]
+    ok = True
+    for name, layout, tight in layouts:
+        start = time.perf_counter()
+        _, bounds = analyze(layout, rules)
+        wall = time.perf_counter() - start
+        sim = Simulator(layout, rules)
+        sim.run(60 * rules.fps)
+        before = Counter(sim.sold)
+        sim.run(round(minutes * 60 * rules.fps))
+        sold = Counter(sim.sold)
+        sold.subtract(before)
+        by_potion = Counter()
+        for (potion, _), count in sold.items():
+            by_potion[potion] += count
+        bounded = {b.potion: b.potions_per_minute for b in bounds}
+        # One sale of slack for where the measured window starts
+        over = sorted(p for p, count in by_potion.items() if count > bounded.get(p, 0.0) * minutes + 1)
+        under = sorted(p for p, bound in bounded.items()
+                       if tight and by_potion[p] < TIGHT * bound * minutes - 1)
+        problems = ([f"OVER BOUND: {over}"] if over else []) + ([f"UNDER BOUND: {under}"] if under else [])
+        print(f"  {name:26} {len(layout.machines):5} machines {wall * 1000:5.0f} ms  "
+              f"{'; '.join(problems) or 'ok'}")
+        ok = ok and not problems
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Max-flow throughput bounds for savegame.json.")
+    parser.add_argument("save", nargs="?", help=f"savegame.json (default: {SAVE_PATH})")
+    parser.add_argument("--top", type=int, default=15, help="bottlenecks and machines to list")
+    parser.add_argument("--full-grid", action="store_true",
+                        help="analyze a tiled layout filling the grid instead of a save")
+    parser.add_argument("--size", default=None, metavar="WxH",
+                        help="grid size for --full-grid (default: the game's)")
+    parser.add_argument("--check", action="store_true",
+                        help="verify the bounds against the simulator")
+    parser.add_argument("--seeds", type=int, default=20, help="random layouts for --check")
+    parser.add_argument("--check-minutes", type=float, default=10.0,
+                        help="simulated minutes per --check layout")
+    args = parser.parse_args(argv)
+
+    rules = load_rules()
+    if args.check:
+        if not check(rules, args.seeds, args.check_minutes):
+            sys.exit(1)
+        print("OK: no layout sells more than its max-flow bound, and tight ones reach it.")
+        return
+    if args.full_grid:
+        width, height = rules.width, rules.height
+        if args.size:
+            width, height = (int(v) for v in args.size.lower().split("x"))
+        report(f"full grid {width}x{height}", tiled_layout(rules, width, height), rules, args.top)
+        return
+    path = args.save or SAVE_PATH
+    if not os.path.exists(path):
+        parser.error(f"no save at {path}; pass one or use --full-grid")
+    with open(path) as f:
+        report(path, layout_from_save(json.load(f), rules), rules, args.top)
+
+
+if __name__ == "__main__":
+    main()
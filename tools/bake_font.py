@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Pre-rasterize the m5x7 UI font into BMFont bitmap fonts.
+
+Usage:
+    python3 tools/bake_font.py                  # every size the UI uses
+    python3 tools/bake_font.py --sizes 16,20    # just these sizes
+
+Godot rasterizes assets/fonts/m5x7.ttf at runtime for every size a Label or
+draw_string() asks for. This tool renders the font's whole character set
+(read from its cmap) with Pillow at each size and writes:
+
+  assets/fonts/bitmap/m5x7_{size}.png   glyph atlas (white, coverage in alpha)
+  assets/fonts/bitmap/m5x7_{size}.fnt   BMFont text metrics + kerning pairs
+
+Godot imports each .fnt as a bitmap FontFile, which UITheme.get_sized_font()
+hands out, so no glyph is ever rasterized in game.
+
+Sizes are found by scanning scripts/ for the sizes the pixel font is used
+at: every *FONT_SIZE* constant (UITheme.FONT_SIZE_* and friends) and every
+literal size passed to UITheme.apply_label_style/apply_button_font/
+apply_button_theme. Each size's glyphs are skyline-packed
+(pack_atlas.skyline_pack) into one page, trying a range of widths and
+keeping the smallest trimmed area; pages need not be powers of two. The
+fill ratio of each page is printed.
+
+Kerning comes from the font's 'kern' table via FreeType: a pair is kerned
+when laying it out together differs in width from the two glyphs apart.
+m5x7 has no kern table, so its .fnt files have no kernings block.
+"""
+
+import argparse
+import glob
+import io
+import os
+import re
+import struct
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from pack_atlas import skyline_pack, write_if_changed
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+FONT_PATH = os.path.join(ROOT, "assets", "fonts", "m5x7.ttf")
+OUT_DIR = os.path.join(ROOT, "assets", "fonts", "bitmap")
+SCRIPTS = os.path.join(ROOT, "scripts")
+PADDING = 1
+MAX_PAGE = 1024
+
+SIZE_PATTERNS = [
+    re.compile(r"const\s+\w*FONT_SIZE\w*\s*:?=\s*(\d+)"),
+    re.compile(r"UITheme\.apply_(?:label_style|button_font|button_theme)\(\s*[^,()]+,\s*(\d+)\s*[,)]"),
+]
+
+
+# ── Font Inspection ──────────────────────────────────────────────────
+
+def ui_font_sizes(scripts_dir=SCRIPTS):
+    """Sorted font sizes the UI uses the pixel font at (see SIZE_PATTERNS)."""
+    sizes = set()
+    for path in glob.glob(os.path.join(scripts_dir, "**", "*.gd"), recursive=True):
+        with open(path) as f:
+            src = f.read()
+        for pattern in SIZE_PATTERNS:
+            sizes.update(int(s) for s in pattern.findall(src))
+    return sorted(sizes)
+
+
+def read_tables(path):
+    """(font bytes, {table tag: offset}) of a TrueType font."""
+    with open(path, "rb") as f:
+        data = f.read()
+    tables = {}
+    for i in range(struct.unpack_from(">H", data, 4)[0]):
+        tag, _, offset, _ = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag] = offset
+    return data, tables
+
+
+def cmap_codepoints(path):
+    """Codepoints mapped in a TrueType font's Unicode cmap (format 4 or 12)."""
+    data, tables = read_tables(path)
+    cmap = tables[b"cmap"]
+    subtables = {}
+    for i in range(struct.unpack_from(">H", data, cmap + 2)[0]):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + 8 * i)
+        subtables[(platform, encoding)] = cmap + offset
+
+    codepoints = set()
+    for key in [(3, 10), (0, 4), (3, 1), (0, 3)]:
+        if key not in subtables:
+            continue
+        sub = subtables[key]
+        fmt = struct.unpack_from(">H", data, sub)[0]
+        if fmt == 12:
+            for i in range(struct.unpack_from(">I", data, sub + 12)[0]):
+                start, end, _ = struct.unpack_from(">III", data, sub + 16 + 12 * i)
+                codepoints.update(range(start, end + 1))
+        elif fmt == 4:
+            segs = struct.unpack_from(">H", data, sub + 6)[0] // 2
+            ends = struct.unpack_from(f">{segs}H", data, sub + 14)
+            starts = struct.unpack_from(f">{segs}H", data, sub + 16 + 2 * segs)
+            for start, end in zip(starts, ends):
+                if start != 0xFFFF:
+                    codepoints.update(range(start, end + 1))
+        else:
+            continue
+        break
+    # Printable characters only; controls never reach a Label
+    return sorted(c for c in codepoints if c >= 0x20 and not 0x7F <= c < 0xA0)
+
+
+# ── Rasterization ────────────────────────────────────────────────────
+
+def render_glyphs(font, codepoints):
+    """{codepoint: (mask Image or None, xoffset, yoffset, xadvance)}.
+
+    Offsets are from the pen position at the top of the line (BMFont
+    convention); Pillow's default "la" anchor measures from the same place.
+    """
+    glyphs = {}
+    for cp in codepoints:
+        ch = chr(cp)
+        x0, y0, x1, y1 = font.getbbox(ch)
+        advance = round(font.getlength(ch))
+        mask = None
+        if x1 > x0 and y1 > y0:
+            mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+            ImageDraw.Draw(mask).text((-x0, -y0), ch, font=font, fill=255)
+            if mask.getbbox() is None:
+                mask = None
+        glyphs[cp] = (mask, x0, y0, advance)
+    return glyphs
+
+
+def has_kerning(path):
+    """Whether the font has a 'kern' table, the only kerning FreeType applies here."""
+    return b"kern" in read_tables(path)[1]
+
+
+def kerning_pairs(font, codepoints):
+    """[(first, second, amount)] for pairs FreeType kerns, i.e. whose joint
+    advance differs from the sum of their separate advances."""
+    width = {cp: font.getlength(chr(cp)) for cp in codepoints}
+    pairs = []
+    for a in codepoints:
+        for b in codepoints:
+            amount = round(font.getlength(chr(a) + chr(b)) - width[a] - width[b])
+            if amount:
+                pairs.append((a, b, amount))
+    return pairs
+
+
+def tight_pack(sizes, padding, max_side=MAX_PAGE, step=4):
+    """Smallest-area single page for {name: (w, h)}: skyline-pack at every
+    width from the square-root bound up in `step`s, then trim the page to
+    what was used. Returns ((w, h), placements)."""
+    entries = sorted(sizes.items(), key=lambda e: (-e[1][1], -e[1][0], e[0]))
+    area = sum((w + padding) * (h + padding) for w, h in sizes.values())
+    widest = max(w for w, _ in sizes.values()) + 2 * padding
+    best = None
+    for width in range(max(widest, int(area ** 0.5)), max_side + 1, step):
+        placements, leftover = skyline_pack(entries, width, max_side, padding)
+        if leftover:
+            continue
+        used_w = max(x + sizes[n][0] for n, (x, _) in placements.items()) + padding
+        used_h = max(y + sizes[n][1] for n, (_, y) in placements.items()) + padding
+        if best is None or used_w * used_h < best[0][0] * best[0][1]:
+            best = ((used_w, used_h), placements)
+        if used_h < width // 2:  # Only getting wider and flatter from here
+            break
+    if best is None:
+        raise ValueError(f"glyphs do not fit in a {max_side}px page")
+    return best
+
+
+def bake_size(size, codepoints, font_path=FONT_PATH, max_page=MAX_PAGE, padding=PADDING):
+    """Render one size. Returns ({filename: bytes}, [(page size, used px)], glyph count, kerning count)."""
+    font = ImageFont.truetype(font_path, size)
+    ascent, descent = font.getmetrics()
+    glyphs = render_glyphs(font, codepoints)
+    masks = {cp: g[0] for cp, g in glyphs.items() if g[0] is not None}
+    pages = [tight_pack({cp: m.size for cp, m in masks.items()}, padding, max_page)] if masks else []
+
+    stem = f"{os.path.splitext(os.path.basename(font_path))[0]}_{size}"
+    page_names = [f"{stem}.png"] * len(pages)
+    placement = {}
+    files = {}
+    stats = []
+    for index, ((w, h), placements) in enumerate(pages):
+        alpha = Image.new("L", (w, h), 0)
+        for cp, (x, y) in placements.items():
+            alpha.paste(masks[cp], (x, y))
+            placement[cp] = (index, x, y)
+        sheet = Image.new("RGBA", (w, h), (255, 255, 255, 0))
+        sheet.putalpha(alpha)
+        buf = io.BytesIO()
+        sheet.save(buf, format="PNG")
+        files[page_names[index]] = buf.getvalue()
+        stats.append(((w, h), sum(masks[cp].width * masks[cp].height for cp in placements)))
+
+    kerning = kerning_pairs(font, codepoints) if has_kerning(font_path) else []
+    lines = [
+        f'info face="{stem.rsplit("_", 1)[0]}" size={size} bold=0 italic=0 charset="" unicode=1 '
+        f"stretchH=100 smooth=0 aa=1 padding=0,0,0,0 spacing={padding},{padding} outline=0",
+        f"common lineHeight={ascent + descent} base={ascent} "
+        f"scaleW={pages[0][0][0] if pages else 0} scaleH={pages[0][0][1] if pages else 0} "
+        f"pages={len(pages)} packed=0 alphaChnl=0 redChnl=4 greenChnl=4 blueChnl=4",
+    ]
+    lines += [f'page id={i} file="{name}"' for i, name in enumerate(page_names)]
+    lines.append(f"chars count={len(glyphs)}")
+    for cp, (mask, xoff, yoff, advance) in glyphs.items():
+        page, x, y = placement.get(cp, (0, 0, 0))
+        w, h = mask.size if mask is not None else (0, 0)
+        lines.append(f"char id={cp} x={x} y={y} width={w} height={h} xoffset={xoff} "
+                     f"yoffset={yoff} xadvance={advance} page={page} chnl=15")
+    if kerning:
+        lines.append(f"kernings count={len(kerning)}")
+        lines += [f"kerning first={a} second={b} amount={amount}" for a, b, amount in kerning]
+    files[f"{stem}.fnt"] = ("\n".join(lines) + "\n").encode()
+    return files, stats, len(glyphs), len(kerning)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake m5x7.ttf into BMFont bitmap fonts.")
+    parser.add_argument("--sizes", help="comma-separated pixel sizes (default: scan scripts/)")
+    parser.add_argument("--font", default=FONT_PATH, help="TrueType font to bake")
+    parser.add_argument("--out", default=OUT_DIR, help="output directory")
+    args = parser.parse_args(argv)
+    sizes = (sorted({int(s) for s in args.sizes.split(",") if s.strip()})
+             if args.sizes else ui_font_sizes())
+
+    start = time.perf_counter()
+    codepoints = cmap_codepoints(args.font)
+    os.makedirs(args.out, exist_ok=True)
+    total_area = total_used = 0
+    print(f"{len(codepoints)} characters at sizes {', '.join(map(str, sizes))}")
+    for size in sizes:
+        files, stats, glyph_count, kerning_count = bake_size(size, codepoints, args.font)
+        for filename, data in files.items():
+            if write_if_changed(os.path.join(args.out, filename), data):
+                print(f"  {filename}")
+        for (w, h), used in stats:
+            total_area += w * h
+            total_used += used
+            print(f"  size {size:3}: {glyph_count} glyphs, {kerning_count} kerning pairs, "
+                  f"{w}x{h} page, {used / (w * h):.0%} filled")
+    if total_area:
+        print(f"\nDone! {len(sizes)} sizes, {total_used / total_area:.0%} of "
+              f"{total_area} atlas pixels filled ({(time.perf_counter() - start) * 1000:.0f} ms).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Bake SoundManager's synthesized effects into a WAV bank.
+
+Usage:
+    python3 tools/bake_sounds.py           # write assets/sounds/
+    python3 tools/bake_sounds.py --check   # parity + staleness check, exit 1 on failure
+
+SoundManager (scripts/sound_manager.gd) used to synthesize all 9 effects
+sample by sample in GDScript on every launch. This tool runs the same
+generators as whole-array NumPy expressions and writes:
+
+  assets/sounds/{name}.wav     16-bit mono PCM at 22050 Hz
+  assets/sounds/sounds.json    manifest: res:// path, generator, parameters
+                               and sample count per sound
+
+SoundManager loads the bank when it is present and only falls back to its
+GDScript synthesis when it is not.
+
+--check is the parity test. It runs a line-by-line Python transcription of
+each GDScript generator (same double-precision math, same truncating int())
+and compares it with the NumPy output for every sample. It also checks that
+SOUNDS matches the _create_sound() calls in sound_manager.gd and that the
+files on disk are up to date. NumPy's vectorized sin may differ from libm
+in the last bit, so samples may differ by 1 LSB; anything more fails.
+
+Noise bursts use GDScript's randf(), which is never reproducible, so the
+bake draws from a NumPy generator seeded per sound, and the parity test
+feeds the same draws to both implementations.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+import wave
+import zlib
+
+import numpy as np
+
+from pack_atlas import write_if_changed
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+SOUNDS_DIR = os.path.join(ROOT, "assets", "sounds")
+MANIFEST_NAME = "sounds.json"
+RES_PREFIX = "res://assets/sounds/"
+SOUND_MANAGER_PATH = os.path.join(ROOT, "scripts", "sound_manager.gd")
+
+SAMPLE_RATE = 22050  # SoundManager.SAMPLE_RATE
+TAU = 2 * math.pi
+MAX_LSB_DIFF = 1
+
+# name → (generator, params), in SoundManager._ready() order
+SOUNDS = {
+    "place": ("sweep", (300.0, 500.0, 0.08)),
+    "remove": ("sweep", (400.0, 200.0, 0.08)),
+    "brew_complete": ("sine_decay", (800.0, 0.15)),
+    "sell": ("coin_clink", ()),
+    "unlock": ("arpeggio", ([600.0, 800.0, 1000.0], 0.1)),
+    "dispense": ("noise_burst", (0.05,)),
+    "bottle": ("sine_decay", (1000.0, 0.1)),
+    "order_complete": ("arpeggio", ([500.0, 700.0, 900.0], 0.13)),
+    "click": ("noise_burst", (0.03,)),
+}
+
+
+def sample_count(duration):
+    return int(SAMPLE_RATE * duration)
+
+
+def noise_for(name, duration):
+    """Uniform [0, 1) draws standing in for randf(), seeded by the sound name."""
+    rng = np.random.default_rng(zlib.crc32(name.encode()))
+    return rng.random(sample_count(duration))
+
+
+def to_pcm16(values):
+    """int(value * 32767.0) per sample, as in GDScript (truncates toward zero)."""
+    return (values * 32767.0).astype(np.int16)
+
+
+# ── NumPy Generators ─────────────────────────────────────────────────
+
+def gen_sweep(freq_start, freq_end, duration):
+    samples = sample_count(duration)
+    t = np.arange(samples) / samples
+    freq = freq_start + (freq_end - freq_start) * t  # lerpf
+    # phase before sample i: running sum of freq / SAMPLE_RATE (cumsum adds
+    # in the same order as the GDScript loop, so rounding matches)
+    phase = np.concatenate(([0.0], np.cumsum(freq / SAMPLE_RATE)[:-1]))
+    return to_pcm16(np.sin(phase * TAU) * (1.0 - t) * 0.5)
+
+
+def gen_sine_decay(freq, duration):
+    samples = sample_count(duration)
+    i = np.arange(samples)
+    t = i / samples
+    envelope = (1.0 - t) * (1.0 - t)
+    return to_pcm16(np.sin(i / SAMPLE_RATE * freq * TAU) * envelope * 0.4)
+
+
+def gen_coin_clink():
+    samples = sample_count(0.1)
+    i = np.arange(samples)
+    t = i / samples
+    hit1_env = np.maximum(0.0, 1.0 - t * 6.0)
+    hit2_env = np.where(t > 0.4, np.maximum(0.0, 1.0 - (t - 0.4) * 8.0), 0.0)
+    value = np.sin(i / SAMPLE_RATE * 1200.0 * TAU) * hit1_env * 0.35
+    value += np.sin(i / SAMPLE_RATE * 1400.0 * TAU) * hit2_env * 0.3
+    return to_pcm16(value)
+
+
+def gen_arpeggio(freqs, tone_duration):
+    samples = sample_count(tone_duration * len(freqs))
+    tone_samples = sample_count(tone_duration)
+    i = np.arange(samples)
+    tone_idx = np.minimum(i // tone_samples, len(freqs) - 1)
+    tone_t = (i - tone_idx * tone_samples) / tone_samples
+    freq = np.asarray(freqs, dtype=float)[tone_idx]
+    envelope = (1.0 - tone_t) * (1.0 - tone_t) * 0.8
+    return to_pcm16(np.sin(i / SAMPLE_RATE * freq * TAU) * envelope * 0.35)
+
+
+def gen_noise_burst(duration, noise):
+    t = np.arange(sample_count(duration)) / sample_count(duration)
+    envelope = (1.0 - t) * (1.0 - t)
+    return to_pcm16((noise * 2.0 - 1.0) * envelope * 0.3)
+
+
+GENERATORS = {
+    "sweep": gen_sweep,
+    "sine_decay": gen_sine_decay,
+    "coin_clink": gen_coin_clink,
+    "arpeggio": gen_arpeggio,
+    "noise_burst": gen_noise_burst,
+}
+
+
+def synthesize(name, generators=None):
+    """int16 samples for one sound in SOUNDS."""
+    kind, params = SOUNDS[name]
+    fn = (generators or GENERATORS)[kind]
+    if kind == "noise_burst":
+        return fn(*params, noise_for(name, params[0]))
+    return fn(*params)
+
+
+# ── GDScript Reference ───────────────────────────────────────────────
+# Line-by-line transcriptions of SoundManager's _gen_* loops (GDScript
+# float is a double, int() truncates), used only by --check.
+
+def _ref_sample(value):
+    return int(value * 32767.0)
+
+
+def ref_sweep(freq_start, freq_end, duration):
+    samples = sample_count(duration)
+    out = []
+    phase = 0.0
+    for i in range(samples):
+        t = float(i) / float(samples)
+        freq = freq_start + (freq_end - freq_start) * t
+        envelope = 1.0 - t
+        value = math.sin(phase * TAU) * envelope * 0.5
+        phase += freq / SAMPLE_RATE
+        out.append(_ref_sample(value))
+    return out
+
+
+def ref_sine_decay(freq, duration):
+    samples = sample_count(duration)
+    out = []
+    for i in range(samples):
+        t = float(i) / float(samples)
+        envelope = (1.0 - t) * (1.0 - t)
+        out.append(_ref_sample(math.sin(float(i) / SAMPLE_RATE * freq * TAU) * envelope * 0.4))
+    return out
+
+
+def ref_coin_clink():
+    samples = sample_count(0.1)
+    out = []
+    for i in range(samples):
+        t = float(i) / float(samples)
+        hit1_env = max(0.0, 1.0 - t * 6.0)
+        hit2_env = max(0.0, 1.0 - (t - 0.4) * 8.0) if t > 0.4 else 0.0
+        value = math.sin(float(i) / SAMPLE_RATE * 1200.0 * TAU) * hit1_env * 0.35
+        value += math.sin(float(i) / SAMPLE_RATE * 1400.0 * TAU) * hit2_env * 0.3
+        out.append(_ref_sample(value))
+    return out
+
+
+def ref_arpeggio(freqs, tone_duration):
+    samples = sample_count(tone_duration * len(freqs))
+    tone_samples = sample_count(tone_duration)
+    out = []
+    for i in range(samples):
+        tone_idx = min(i // tone_samples, len(freqs) - 1)
+        tone_t = float(i - tone_idx * tone_samples) / float(tone_samples)
+        envelope = (1.0 - tone_t) * (1.0 - tone_t) * 0.8
+        out.append(_ref_sample(math.sin(float(i) / SAMPLE_RATE * freqs[tone_idx] * TAU) * envelope * 0.35))
+    return out
+
+
+def ref_noise_burst(duration, noise):
+    samples = sample_count(duration)
+    out = []
+    for i in range(samples):
+        t = float(i) / float(samples)
+        envelope = (1.0 - t) * (1.0 - t)
+        out.append(_ref_sample((float(noise[i]) * 2.0 - 1.0) * envelope * 0.3))
+    return out
+
+
+REFERENCE = {
+    "sweep": ref_sweep,
+    "sine_decay": ref_sine_decay,
+    "coin_clink": ref_coin_clink,
+    "arpeggio": ref_arpeggio,
+    "noise_burst": ref_noise_burst,
+}
+
+
+def gdscript_sounds(path=SOUND_MANAGER_PATH):
+    """{name: (generator, params)} from the _create_sound() calls in sound_manager.gd."""
+    with open(path) as f:
+        src = f.read()
+    sounds = {}
+    for name, kind, args in re.findall(r'_create_sound\("(\w+)", _gen_(\w+)\((.*?)\)\)', src):
+        params = json.loads(f"[{args}]") if args else []
+        sounds[name] = (kind, tuple(params))
+    return sounds
+
+
+# ── Bank ─────────────────────────────────────────────────────────────
+
+def wav_bytes(samples):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def build_bank():
+    """{filename: bytes} for every sound plus the manifest."""
+    files = {}
+    manifest = {"sample_rate": SAMPLE_RATE, "bits": 16, "channels": 1, "sounds": {}}
+    for name, (kind, params) in SOUNDS.items():
+        samples = synthesize(name)
+        files[f"{name}.wav"] = wav_bytes(samples)
+        manifest["sounds"][name] = {
+            "path": f"{RES_PREFIX}{name}.wav",
+            "generator": kind,
+            "params": list(params),
+            "samples": len(samples),
+        }
+    files[MANIFEST_NAME] = (json.dumps(manifest, indent=2) + "\n").encode()
+    return files
+
+
+def check(sounds_dir=SOUNDS_DIR):
+    """Print every parity or staleness problem. Returns True if there were none."""
+    ok = True
+    if json.dumps(gdscript_sounds()) != json.dumps(SOUNDS):
+        print(f"  SOUNDS does not match the _create_sound() calls in {os.path.relpath(SOUND_MANAGER_PATH)}")
+        ok = False
+
+    for name in SOUNDS:
+        fast = synthesize(name)
+        ref = np.array(synthesize(name, REFERENCE), dtype=np.int32)
+        if len(fast) != len(ref):
+            print(f"  {name}: {len(fast)} samples, reference {len(ref)}")
+            ok = False
+            continue
+        diff = np.abs(fast.astype(np.int32) - ref)
+        exact = int(np.count_nonzero(diff == 0))
+        status = "ok" if diff.max(initial=0) <= MAX_LSB_DIFF else "MISMATCH"
+        ok &= status == "ok"
+        print(f"  {name:15} {len(ref):5} samples, {exact} exact, max diff {diff.max(initial=0)} LSB  {status}")
+
+    for filename, data in build_bank().items():
+        try:
+            with open(os.path.join(sounds_dir, filename), "rb") as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current != data:
+            print(f"  {filename} is stale; rerun tools/bake_sounds.py")
+            ok = False
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake SoundManager effects into assets/sounds/.")
+    parser.add_argument("--check", action="store_true",
+                        help="compare against the GDScript algorithms and the files on disk")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if not check():
+            sys.exit(1)
+        print("OK: NumPy synthesis matches the GDScript generators and the bank is current.")
+        return
+
+    start = time.perf_counter()
+    os.makedirs(SOUNDS_DIR, exist_ok=True)
+    files = build_bank()
+    for filename, data in files.items():
+        if write_if_changed(os.path.join(SOUNDS_DIR, filename), data):
+            print(f"  {filename}")
+    print(f"Done! {len(SOUNDS)} sounds baked ({(time.perf_counter() - start) * 1000:.0f} ms).")
+
+
+if __name__ == "__main__":
+    main()
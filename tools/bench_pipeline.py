@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Benchmark the asset pipeline and gate on regressions.
+
+Usage:
+    python3 tools/bench_pipeline.py --save bench.json        # record a baseline
+    python3 tools/bench_pipeline.py --compare bench.json     # exit 1 on regressions
+    python3 tools/bench_pipeline.py --filter machine_ --repeat 50
+
+Entries:
+  <generator>                 one generate_sprites.py generator, render only
+  <generator>[<sprite>]       parametrized generators, e.g. make_potion[health_potion]
+  main[cold]                  full generate_sprites.main() into an empty temp dir
+  main[no-op]                 the same with every sprite already cached
+  convert_floor[1k|4k|8k]     convert_floor.py on synthetic 1024/4096/8192 px JPEGs
+  convert_floor_lowmem[...]   the same with --low-memory
+
+Every entry runs in its own freshly spawned process, so the reported peak
+RSS belongs to that entry alone (interpreter + Pillow baseline included).
+Timings are reported as median and p95 over the repeats.
+
+--compare fails when an entry's median time or peak RSS grows by more than
+--threshold (relative) over the baseline. Time deltas under --min-delta-ms
+are ignored so sub-millisecond generators don't flap on scheduler noise.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import PIL
+from PIL import Image
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+import convert_floor
+import generate_sprites
+
+FLOOR_SIZES = {"1k": 1024, "4k": 4096, "8k": 8192}
+
+
+def generator_entries():
+    """{entry name: (generator, args)} for every sprite job."""
+    entries = {}
+    for relpath, fn, args in generate_sprites.sprite_jobs():
+        name = fn.__name__
+        if args:
+            name += f"[{os.path.splitext(os.path.basename(relpath))[0]}]"
+        entries[name] = (fn, args)
+    return entries
+
+
+def entry_names():
+    names = list(generator_entries())
+    names += ["main[cold]", "main[no-op]"]
+    names += [f"convert_floor[{label}]" for label in FLOOR_SIZES]
+    names += [f"convert_floor_lowmem[{label}]" for label in FLOOR_SIZES]
+    return names
+
+
+def floor_label(name):
+    """Size label of a convert_floor entry ("8k"), or None for other entries."""
+    if name.startswith("convert_floor"):
+        return name[name.index("[") + 1:-1]
+    return None
+
+
+def is_heavy(name):
+    return name.startswith("main[") or floor_label(name) is not None
+
+
+def synthetic_floor(workdir, label):
+    """Path to a cached synthetic floor photo (noise + gradients, JPEG) of the given size."""
+    path = os.path.join(workdir, f"floor_{label}.jpg")
+    if not os.path.exists(path):
+        size = (FLOOR_SIZES[label],) * 2
+        noise = Image.effect_noise(size, 40)
+        grad = Image.linear_gradient("L").resize(size)
+        Image.merge("RGB", (noise, grad, grad.transpose(Image.Transpose.ROTATE_90))).save(path, quality=90)
+    return path
+
+
+def make_callable(name, workdir):
+    """The zero-argument function timed for an entry (untimed setup happens here)."""
+    if name == "main[cold]":
+        return lambda: generate_sprites.main(["--force", "--out", tempfile.mkdtemp(dir=workdir)])
+    if name == "main[no-op]":
+        out = tempfile.mkdtemp(dir=workdir)
+        generate_sprites.main(["--out", out])
+        return lambda: generate_sprites.main(["--out", out])
+    if floor_label(name) is not None:
+        src = synthetic_floor(workdir, floor_label(name))
+        out = os.path.join(workdir, "floor_atlas.png")
+        low_memory = name.startswith("convert_floor_lowmem[")
+        return lambda: convert_floor.convert_floor(src, out, low_memory=low_memory)
+    fn, args = generator_entries()[name]
+    return lambda: fn(*args)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_entry(name, repeat, workdir, conn):
+    """Child process: time one entry and send back its stats."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn = make_callable(name, workdir)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    times.sort()
+    conn.send({
+        "median_s": statistics.median(times),
+        "p95_s": times[max(0, math.ceil(0.95 * len(times)) - 1)],
+        "peak_rss_mb": peak_rss_mb(),
+        "runs": repeat,
+    })
+    conn.close()
+
+
+def bench(names, repeat, heavy_repeat, workdir):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    print(f"{'entry':40} {'median ms':>10} {'p95 ms':>10} {'peak RSS MB':>12}")
+    for name in names:
+        # Build synthetic inputs up front so their cost never lands in a timed
+        # child, in a process of their own: Linux carries peak RSS across
+        # fork/exec, so a large parent would inflate every later entry.
+        if floor_label(name) is not None:
+            prep = ctx.Process(target=synthetic_floor, args=(workdir, floor_label(name)))
+            prep.start()
+            prep.join()
+        parent, child = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=run_entry,
+                           args=(name, heavy_repeat if is_heavy(name) else repeat, workdir, child))
+        proc.start()
+        child.close()
+        stats = parent.recv()
+        proc.join()
+        results[name] = stats
+        rss = "-" if stats["peak_rss_mb"] is None else f"{stats['peak_rss_mb']:.1f}"
+        print(f"{name:40} {stats['median_s'] * 1000:10.2f} {stats['p95_s'] * 1000:10.2f} {rss:>12}")
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_s):
+    """Print regressions against a baseline's entries. Returns True if any."""
+    regressed = False
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  new         {name}")
+            continue
+        delta = cur["median_s"] - base["median_s"]
+        if delta > min_delta_s and cur["median_s"] > base["median_s"] * (1 + threshold):
+            print(f"  REGRESSION  {name}: median {base['median_s'] * 1000:.2f} -> "
+                  f"{cur['median_s'] * 1000:.2f} ms ({cur['median_s'] / base['median_s']:.2f}x)")
+            regressed = True
+        if (cur["peak_rss_mb"] is not None and base.get("peak_rss_mb")
+                and cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold)):
+            print(f"  REGRESSION  {name}: peak RSS {base['peak_rss_mb']:.1f} -> "
+                  f"{cur['peak_rss_mb']:.1f} MB")
+            regressed = True
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sprite and floor asset pipeline.")
+    parser.add_argument("--filter", default="", help="only run entries containing this substring")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per generator entry")
+    parser.add_argument("--heavy-repeat", type=int, default=5,
+                        help="runs per main[...] and convert_floor*[...] entry")
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline file")
+    parser.add_argument("--compare", metavar="JSON", help="baseline to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative growth in median time / peak RSS (default 0.2)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore median time growth smaller than this (default 1.0)")
+    args = parser.parse_args(argv)
+
+    names = [n for n in entry_names() if args.filter in n]
+    with tempfile.TemporaryDirectory(prefix="cozy_bench_") as workdir:
+        results = bench(names, args.repeat, args.heavy_repeat, workdir)
+
+    if args.save:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "pillow": PIL.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "entries": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nSaved baseline: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["entries"]
+        print(f"\nComparing against {args.compare} (threshold {args.threshold:.0%}):")
+        if compare(results, baseline, args.threshold, args.min_delta_ms / 1000):
+            sys.exit(1)
+        print("  no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,50 +2,491 @@
 """Convert a floor texture image into a 128x64 floor atlas (two 64x64 tiles).
 
 Usage:
-    python3 tools/convert_floor.py /path/to/floor.png
+    python3 tools/convert_floor.py /path/to/floor.png [--out atlas.png]
+    python3 tools/convert_floor.py /path/to/scan.jpg --low-memory [--verify 8]
+    python3 tools/convert_floor.py --batch "scans/*.jpg" --tiles 4 --out-dir DIR [-j 0]
+    python3 tools/convert_floor.py /path/to/floor.jpg --auto-crop [--window 512]
 
 Crops two non-overlapping square regions from the source image,
 resizes each to 64x64 using nearest-neighbor, and saves them
-side by side as assets/sprites/tiles/floor_atlas.png.
+side by side as assets/sprites/tiles/floor_atlas.png. --tiles N takes
+N squares instead, giving an (N*64)x64 atlas.
+
+--auto-crop (needs NumPy) searches every square window of --window source
+pixels (default: half the blind-crop square) instead, scoring how well it
+wraps: the mean difference between its left and right columns plus its
+top and bottom rows, i.e. how visible the seam is when the tile repeats.
+Scoring runs on a copy box-reduced so windows are ~64px, with column and
+row wrap differences summed over every window at once by cumulative sums,
+so it is linear in image size. The best-scoring non-overlapping windows
+become the tiles, best first.
+
+--batch takes a directory or glob of sources and writes one
+<name>_atlas.png per source plus index.json into --out-dir, converting
+across a pool of --jobs worker processes (0 = one per CPU core). Sources
+sharing a name (a.jpg, a.png) get <name>_<ext>_atlas.png instead.
+
+--low-memory never materializes the full-resolution image, for 8K-16K scans:
+  - JPEG sources are decoded at 1/2, 1/4 or 1/8 scale in the DCT domain
+    (Image.draft), picking the smallest scale that keeps each tile >= 64px.
+    Pixels become block averages instead of point samples, so the atlas is
+    visually equivalent rather than byte-identical; --verify TOL rebuilds the
+    exact atlas and fails if the mean per-channel difference exceeds TOL.
+    It first builds sources sized off the draft and scoring grids (2003x1001,
+    2001x1000) every way and fails if any box leaves the source.
+  - Non-interlaced PNG sources decode top-down, so only the band of rows
+    the tiles use is read and decoded: its chunks are copied into a PNG of
+    their own, with IHDR cut to the band's height. Other formats decode
+    whole.
+  - Tiles are sampled straight from the decoded image (resize with a box),
+    with no intermediate full-square crops.
+Peak memory (RSS) is reported at the end.
 """
 
+import argparse
+import glob
+import io
+import json
+import math
 import os
+import struct
 import sys
-from PIL import Image
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageChops, ImageStat
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+OUT_PATH = os.path.join(PROJECT_ROOT, "assets", "sprites", "tiles", "floor_atlas.png")
+TILE = 64
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff", ".bmp")
+
+
+def tile_boxes(w, h, tiles=2):
+    """Crop boxes for the tiles: adjacent squares along the top of the image."""
+    # Use the shorter dimension as the square size
+    square = min(w // tiles, h)
+    if square < 1:
+        raise ValueError(f"{w}x{h} image is too small for {tiles} tiles")
+    return [(i * square, 0, (i + 1) * square, square) for i in range(tiles)]
+
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 tools/convert_floor.py <input_image>")
-        sys.exit(1)
+def default_window(w, h, tiles=2):
+    """--auto-crop window size: half the blind-crop square, leaving room to search."""
+    return max(1, min(w // tiles, h) // 2)
 
-    src_path = sys.argv[1]
+
+def open_low_memory(src_path, tiles=2, window=None):
+    """Open src_path decoding as little as the tile boxes need.
+
+    Returns (image, scale, boxes): boxes are in source pixels; divide by
+    scale for coordinates in the returned image. With a window size (for
+    --auto-crop) the whole image is kept, decoded so windows stay >= 64px.
+    """
     img = Image.open(src_path)
     w, h = img.size
-    print(f"Source image: {w}x{h}")
+    boxes = tile_boxes(w, h, tiles)
+    square = window or boxes[0][2]
 
-    # Crop two square regions from the image
-    # Use the shorter dimension as the square size
-    square = min(w // 2, h)
+    if img.format == "JPEG":
+        # DCT-domain downscale; draft keeps the result >= the requested size
+        img.draft(img.mode, (math.ceil(w * TILE / square), math.ceil(h * TILE / square)))
+        return img, w / img.size[0], boxes
 
-    # Left tile: top-left square
-    tile1 = img.crop((0, 0, square, square))
-    # Right tile: offset to the right for variety
-    tile2 = img.crop((square, 0, square * 2, square))
+    # PNG: only decode the rows the tiles cover
+    band = max(box[3] for box in boxes)
+    if window is None and band < h and img.format == "PNG":
+        data = png_band(src_path, band)
+        if data is not None:
+            img.close()
+            img = Image.open(io.BytesIO(data))
+    return img, 1.0, boxes
 
-    # Resize to 64x64 with nearest-neighbor for pixel art look
-    tile1 = tile1.resize((64, 64), Image.NEAREST)
-    tile2 = tile2.resize((64, 64), Image.NEAREST)
 
-    # Combine into 128x64 atlas
-    atlas = Image.new("RGBA", (128, 64))
-    atlas.paste(tile1, (0, 0))
-    atlas.paste(tile2, (64, 0))
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
 
-    out_dir = os.path.join(os.path.dirname(__file__), "..", "assets", "sprites", "tiles")
-    os.makedirs(out_dir, exist_ok=True)
-    out_path = os.path.join(out_dir, "floor_atlas.png")
+
+def png_band(path, rows):
+    """The top `rows` rows of a non-interlaced PNG as PNG bytes of their own,
+    or None for an interlaced file: the IHDR is rewritten to `rows` high and
+    the IDAT data stops once those rows are in, so Image.open() decodes (and
+    allocates) only them. Reads the source as a stream of chunks."""
+    with open(path, "rb") as f:
+        if f.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+            return None
+        out = [PNG_SIGNATURE]
+        inflate = zlib.decompressobj()
+        need = got = 0
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                return None
+            length, kind = struct.unpack(">I4s", head)
+            data = f.read(length)
+            f.read(4)  # CRC
+            if kind == b"IHDR":
+                width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", data)
+                if interlace or rows >= height:
+                    return None
+                channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color]
+                # Every scanline is a filter byte plus its packed samples
+                need = rows * (1 + math.ceil(width * channels * depth / 8))
+                data = struct.pack(">II", width, rows) + data[8:]
+            elif kind == b"IDAT":
+                pending = data
+                while pending and got < need:
+                    got += len(inflate.decompress(pending, 1 << 20))
+                    pending = inflate.unconsumed_tail
+            elif kind == b"IEND":
+                return None
+            out.append(_png_chunk(kind, data))
+            if kind == b"IDAT" and got >= need:
+                out.append(_png_chunk(b"IEND", b""))
+                return b"".join(out)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def mean_abs_diff(a, b):
+    """Mean absolute per-channel difference between two same-size images."""
+    return sum(ImageStat.Stat(ImageChops.difference(a, b)).mean) / len(a.getbands())
+
+
+# ── Seam Scoring ─────────────────────────────────────────────────────────────
+
+def _sliding_sum(a, size, axis):
+    """Sums of every run of `size` consecutive entries along axis."""
+    import numpy as np
+
+    c = np.cumsum(a, axis=axis, dtype=np.int64)
+    zero = np.zeros_like(np.take(c, [0], axis=axis))
+    c = np.concatenate([zero, c], axis=axis)
+    n = c.shape[axis]
+    return np.take(c, range(size, n), axis=axis) - np.take(c, range(0, n - size), axis=axis)
+
+
+def seam_scores(pixels, size):
+    """Wrap-seam score of every size x size window of an (h, w, channels) array.
+
+    Entry [y, x] is the mean absolute difference between the window's first
+    and last column plus its first and last row: 0 tiles seamlessly.
+    """
+    import numpy as np
+
+    a = pixels.astype(np.int32)
+    h, w, channels = a.shape
+    # Left/right: column x against column x+size-1, summed over size rows
+    cols = np.abs(a[:, :w - size + 1] - a[:, size - 1:]).sum(axis=2)
+    left_right = _sliding_sum(cols, size, axis=0)
+    # Top/bottom: row y against row y+size-1, summed over size columns
+    rows = np.abs(a[:h - size + 1] - a[size - 1:]).sum(axis=2)
+    top_bottom = _sliding_sum(rows, size, axis=1)
+    return (left_right + top_bottom) / (2 * size * channels)
+
+
+def pick_windows(scores, size, count):
+    """Best `count` non-overlapping windows, greedily: [(x, y, score), ...]."""
+    import numpy as np
+
+    scores = scores.astype(np.float64)
+    picks = []
+    for _ in range(count):
+        i = int(np.argmin(scores))
+        y, x = divmod(i, scores.shape[1])
+        if not np.isfinite(scores[y, x]):
+            break
+        picks.append((x, y, float(scores[y, x])))
+        # Rule out every window overlapping this one
+        scores[max(0, y - size + 1):y + size, max(0, x - size + 1):x + size] = np.inf
+    return picks
+
+
+def best_windows(img, count, window, scale=1.0, source_size=None):
+    """Crop boxes (source pixels) and seam scores of the best `count` windows.
+
+    img may be a downscaled decode of the source (scale source px per pixel);
+    source_size is the source's (w, h), by default img's size times scale.
+    """
+    import numpy as np
+
+    w, h = source_size or (round(img.size[0] * scale), round(img.size[1] * scale))
+    factor = max(1, int(window / scale) // TILE)
+    small = img.convert("RGB")
+    if factor > 1:
+        # Whole blocks only: reduce() would average a partial edge block
+        small = small.crop((0, 0, small.width // factor * factor, small.height // factor * factor))
+        small = small.reduce(factor)
+    px = scale * factor  # source pixels per scored pixel
+    size = max(2, round(window / px))
+    if window > min(w, h) or size > min(small.size):
+        raise ValueError(f"--window {window} is larger than the image")
+    picks = pick_windows(seam_scores(np.asarray(small), size), size, count)
+    if len(picks) < count:
+        raise ValueError(f"only {len(picks)} non-overlapping {window}px windows fit; "
+                         f"use a smaller --window")
+    # size rounds window / px, so a window on the last scored pixel can
+    # still end a few source pixels past the edge: keep every box inside
+    boxes = []
+    for x, y, score in picks:
+        x0, y0 = min(round(x * px), w - window), min(round(y * px), h - window)
+        boxes.append(((x0, y0, x0 + window, y0 + window), score))
+    return boxes
+
+
+def edge_source(w, h):
+    """Source whose wrap seams shrink toward the bottom-right corner, so the
+    best windows sit on the last scored pixels; blue stays 255 so any box
+    past the edge shows up as black padding."""
+    def ramp(n):
+        band = Image.new("L", (n, 1))
+        band.putdata([round(255 * (1 - (1 - t / n) ** 2)) for t in range(n)])
+        return band
+
+    red = ramp(w).resize((w, h))
+    green = ramp(h).rotate(-90, expand=True).resize((w, h))
+    return Image.merge("RGB", (red, green, Image.new("L", (w, h), 255)))
+
+
+def verify_edges(tiles=2):
+    """Problems building sources whose sizes are no multiple of the scoring
+    reduction or the JPEG draft scale, in both modes: auto-crop boxes
+    outside the source, tiles padded past its edge, or builds that fail."""
+    import tempfile
+
+    problems = []
+    src = edge_source(2003, 1001)
+    for img, scale in ((src, 1.0), (src.reduce(4), 2003 / 501)):
+        for box, _ in best_windows(img, tiles, 900, scale, src.size):
+            if box[0] < 0 or box[1] < 0 or box[2] > src.width or box[3] > src.height:
+                problems.append(f"1/{scale:g} scale: window {box} outside {src.width}x{src.height}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, size in (("edge.png", (2003, 1001)), ("edge.jpg", (2001, 1000))):
+            path = os.path.join(tmp, name)
+            edge_source(*size).save(path)
+            for low_memory in (False, True):
+                for auto_crop in (False, True):
+                    what = (f"{name} {size[0]}x{size[1]}{' --low-memory' if low_memory else ''}"
+                            f"{' --auto-crop' if auto_crop else ''}")
+                    try:
+                        atlas = build_atlas(path, low_memory, tiles, lambda _: None, auto_crop,
+                                            900 if auto_crop else None)
+                    except ValueError as e:
+                        problems.append(f"{what}: {e}")
+                        continue
+                    if atlas.convert("RGB").getextrema()[2][0] < 128:
+                        problems.append(f"{what}: tiles padded past the source edge")
+    return problems
+
+
+def build_atlas(src_path, low_memory=False, tiles=2, log=print, auto_crop=False, window=None):
+    """Build the (tiles*64)x64 atlas image from src_path."""
+    if auto_crop:
+        with Image.open(src_path) as probe:
+            source_size = probe.size
+        if window is None:
+            window = default_window(*source_size, tiles)
+    if low_memory:
+        img, scale, boxes = open_low_memory(src_path, tiles, window if auto_crop else None)
+        log(f"Source image: decoded at {img.size[0]}x{img.size[1]} (1/{scale:g} scale)")
+    else:
+        img = Image.open(src_path)
+        scale = 1.0
+        boxes = tile_boxes(*img.size, tiles)
+        log(f"Source image: {img.size[0]}x{img.size[1]}")
+
+    if auto_crop:
+        scored = best_windows(img, tiles, window, scale, source_size)
+        for box, score in scored:
+            log(f"  window {box[:2]} size {window}: seam score {score:.1f}")
+        boxes = [box for box, _ in scored]
+
+    if low_memory:
+        # A draft decode rounds its size up or down per axis, so a box edge
+        # on the source edge can land a fraction past the decoded image
+        limit = img.size * 2
+        tile_images = [
+            img.resize((TILE, TILE), Image.NEAREST,
+                       box=tuple(min(v / scale, lim) for v, lim in zip(box, limit)))
+            for box in boxes
+        ]
+    else:
+        # Crop square regions, then resize to 64x64 with nearest-neighbor
+        # for pixel art look
+        tile_images = [img.crop(box).resize((TILE, TILE), Image.NEAREST) for box in boxes]
+
+    # Combine into one row of tiles
+    atlas = Image.new("RGBA", (TILE * tiles, TILE))
+    for i, tile in enumerate(tile_images):
+        atlas.paste(tile, (i * TILE, 0))
+    return atlas
+
+
+def convert_floor(src_path, out_path=OUT_PATH, low_memory=False, tiles=2, log=print,
+                  auto_crop=False, window=None):
+    """Build the atlas from src_path, save it to out_path and return it."""
+    atlas = build_atlas(src_path, low_memory, tiles, log, auto_crop, window)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
     atlas.save(out_path)
-    print(f"Saved: {out_path}")
+    log(f"Saved: {out_path}")
+    return atlas
+
+
+# ── Batch Mode ───────────────────────────────────────────────────────────────
+
+def find_sources(pattern):
+    """Image files in a directory, or matching a glob pattern, sorted."""
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern)
+    return sorted(p for p in paths if os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS)
+
+
+def res_path(path):
+    """res:// path for files inside the Godot project, else the absolute path."""
+    path = os.path.abspath(path)
+    if os.path.commonpath([path, PROJECT_ROOT]) == PROJECT_ROOT:
+        return "res://" + os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+    return path
+
+
+def atlas_names(sources):
+    """<stem>_atlas.png per source; sources sharing a stem (a.jpg, a.png)
+    keep their extension too (a_jpg_atlas.png) so no two write one file."""
+    def key(path):
+        return os.path.splitext(os.path.basename(path))[0].lower()
+
+    shared = {k for k in map(key, sources) if sum(key(p) == k for p in sources) > 1}
+    names = []
+    for src in sources:
+        stem, ext = os.path.splitext(os.path.basename(src))
+        names.append(f"{stem}_{ext[1:]}_atlas.png" if key(src) in shared else f"{stem}_atlas.png")
+    clash = sorted({n for n in names if sum(m.lower() == n.lower() for m in names) > 1})
+    if clash:
+        raise SystemExit(f"Sources would write the same atlas: {', '.join(clash)}")
+    return names
+
+
+def _convert_one(job):
+    """Worker: convert one source. Returns its index entry and elapsed time."""
+    src, out, low_memory, tiles, auto_crop, window = job
+    start = time.perf_counter()
+    atlas = convert_floor(src, out, low_memory, tiles, lambda _: None, auto_crop, window)
+    entry = {
+        "source": os.path.abspath(src),
+        "atlas": res_path(out),
+        "size": list(atlas.size),
+        "tiles": tiles,
+    }
+    return entry, time.perf_counter() - start
+
+
+def convert_batch(pattern, out_dir, tiles=2, jobs=1, low_memory=False, auto_crop=False,
+                  window=None):
+    """Convert every source matching pattern; write atlases and index.json to out_dir."""
+    sources = find_sources(pattern)
+    if not sources:
+        raise SystemExit(f"No source images match {pattern}")
+    os.makedirs(out_dir, exist_ok=True)
+    names = atlas_names(sources)
+    work = [(src, os.path.join(out_dir, name), low_memory, tiles, auto_crop, window)
+            for src, name in zip(sources, names)]
+
+    workers = min(jobs or os.cpu_count() or 1, len(work))
+    start = time.perf_counter()
+    entries = {}
+
+    def finish(entry, elapsed):
+        entries[entry["source"]] = entry
+        print(f"  {os.path.basename(entry['source'])} -> {entry['atlas']} ({elapsed:.2f}s)")
+
+    if workers == 1:
+        for job in work:
+            finish(*_convert_one(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(_convert_one, job) for job in work]):
+                finish(*future.result())
+    wall = time.perf_counter() - start
+
+    index = {
+        "tile_size": TILE,
+        "tiles": tiles,
+        "atlases": [entries[os.path.abspath(src)] for src in sources],
+    }
+    index_path = os.path.join(out_dir, "index.json")
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    print(f"\n{len(sources)} atlases in {wall:.2f}s ({len(sources) / wall:.1f} images/s, "
+          f"{workers} workers)")
+    print(f"Index: {index_path}")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a floor texture into the 128x64 floor atlas.")
+    parser.add_argument("input", nargs="?", help="source floor texture")
+    parser.add_argument("--out", default=OUT_PATH, help="atlas path (default: assets/sprites/tiles/floor_atlas.png)")
+    parser.add_argument("--tiles", type=int, default=2, help="tile variants per atlas (default 2)")
+    parser.add_argument("--batch", metavar="DIR_OR_GLOB",
+                        help="convert every image in a directory or matching a glob")
+    parser.add_argument("--out-dir", help="with --batch: where atlases and index.json go")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="with --batch: worker processes (0 = one per CPU core)")
+    parser.add_argument("--auto-crop", action="store_true",
+                        help="pick the tile windows that wrap with the least visible seam (needs NumPy)")
+    parser.add_argument("--window", type=int, metavar="PX",
+                        help="with --auto-crop: window size in source pixels "
+                             "(default: half the blind-crop square)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="never decode the full-resolution image (JPEG draft / row band)")
+    parser.add_argument("--verify", type=float, metavar="TOL",
+                        help="with --low-memory: also build the exact atlas and fail if the "
+                             "mean per-channel difference exceeds TOL (0-255)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        if not args.out_dir:
+            parser.error("--batch needs --out-dir")
+        convert_batch(args.batch, args.out_dir, args.tiles, args.jobs, args.low_memory,
+                      args.auto_crop, args.window)
+        return
+    if not args.input:
+        parser.error("an input image (or --batch) is required")
+
+    atlas = convert_floor(args.input, args.out, low_memory=args.low_memory, tiles=args.tiles,
+                          auto_crop=args.auto_crop, window=args.window)
+    if args.low_memory:
+        rss = peak_rss_mb()
+        if rss is not None:
+            print(f"Peak memory: {rss:.1f} MB RSS")
+    if args.verify is not None:
+        problems = verify_edges(args.tiles)
+        for problem in problems:
+            print(f"  FAIL: {problem}")
+        if problems:
+            sys.exit(1)
+        exact = build_atlas(args.input, tiles=args.tiles, log=lambda _: None,
+                            auto_crop=args.auto_crop, window=args.window)
+        diff = mean_abs_diff(atlas, exact)
+        print(f"Mean difference vs exact atlas: {diff:.2f} (tolerance {args.verify:g})")
+        if diff > args.verify:
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
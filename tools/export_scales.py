@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Export HiDPI and mip variants of every generated sprite.
+
+Usage:
+    python3 tools/export_scales.py                  # 2x and 4x
+    python3 tools/export_scales.py --scales 2,3,4 --mips 2 --jobs 0
+
+Run tools/generate_sprites.py first: each sprite is rendered once there,
+and every variant here is derived from its 1x PNG.
+
+  assets/sprites@{n}x/...      integer nearest-neighbor upscales (exact pixel
+                               art: every source pixel becomes an n x n block)
+  assets/sprites@mip{k}/...    --mips K: box-filtered 1/2, 1/4, ... downscales
+                               for the minimap and zoomed-out camera
+  assets/sprite_scales.json    manifest: res:// path and size of every variant
+
+Trees mirror assets/sprites/ except atlas/ (pack a scaled tree with
+pack_atlas.build_atlases if it needs one). Files whose bytes are unchanged
+are not rewritten. Sprites are split across --jobs worker processes.
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+from pack_atlas import write_if_changed
+
+ASSETS = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+SPRITES = os.path.join(ASSETS, "sprites")
+MANIFEST_PATH = os.path.join(ASSETS, "sprite_scales.json")
+SKIPPED_DIRS = ["atlas"]
+
+
+def find_sprites(sprites_dir=SPRITES):
+    """Sprite paths relative to sprites_dir, sorted, skipping SKIPPED_DIRS."""
+    paths = []
+    for path in sorted(glob.glob(os.path.join(sprites_dir, "**", "*.png"), recursive=True)):
+        relpath = os.path.relpath(path, sprites_dir).replace(os.sep, "/")
+        if relpath.split("/")[0] not in SKIPPED_DIRS:
+            paths.append(relpath)
+    return paths
+
+
+def tree_name(variant):
+    """Directory for a variant under assets/: sprites@2x, sprites@mip1."""
+    return f"sprites@{variant}"
+
+
+def upscale(img, n):
+    """Exact integer nearest-neighbor upscale (one C-level pass)."""
+    return img.resize((img.width * n, img.height * n), Image.NEAREST)
+
+
+def mip_chain(img, levels):
+    """Box-filtered 1/2, 1/4, ... downscales, stopping at 1px.
+
+    Image.reduce weights RGBA by alpha, so transparent pixels don't darken
+    sprite edges.
+    """
+    chain = []
+    for _ in range(levels):
+        if min(img.size) <= 1:
+            break
+        img = img.reduce(2)
+        chain.append(img)
+    return chain
+
+
+def export_sprite(relpath, scales, mips, sprites_dir=SPRITES, assets_dir=ASSETS):
+    """Worker: write every variant of one sprite. Returns (relpath, {variant: entry}, written)."""
+    img = Image.open(os.path.join(sprites_dir, relpath)).convert("RGBA")
+    variants = [(f"{n}x", upscale(img, n)) for n in scales]
+    variants += [(f"mip{k}", mip) for k, mip in enumerate(mip_chain(img, mips), 1)]
+
+    entries = {"1x": {"path": "res://assets/sprites/" + relpath, "size": list(img.size)}}
+    written = []
+    for variant, scaled in variants:
+        path = os.path.join(assets_dir, tree_name(variant), relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buf = io.BytesIO()
+        scaled.save(buf, format="PNG")
+        if write_if_changed(path, buf.getvalue()):
+            written.append(f"{tree_name(variant)}/{relpath}")
+        entries[variant] = {"path": f"res://assets/{tree_name(variant)}/{relpath}",
+                            "size": list(scaled.size)}
+    return relpath, entries, written
+
+
+def export_all(scales=(2, 4), mips=0, jobs=1, sprites_dir=SPRITES, assets_dir=ASSETS):
+    """Export every sprite's variants and write the manifest. Returns (manifest, files written)."""
+    relpaths = find_sprites(sprites_dir)
+    if not relpaths:
+        raise SystemExit(f"No sprites in {sprites_dir}; run tools/generate_sprites.py first")
+    workers = min(jobs or os.cpu_count() or 1, len(relpaths))
+    sprites = {}
+    written = 0
+
+    def finish(relpath, entries, paths):
+        nonlocal written
+        sprites[os.path.splitext(relpath)[0]] = entries
+        for path in paths:
+            print(f"  {path}")
+        written += len(paths)
+
+    if workers == 1:
+        for relpath in relpaths:
+            finish(*export_sprite(relpath, scales, mips, sprites_dir, assets_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(export_sprite, relpath, scales, mips, sprites_dir, assets_dir)
+                       for relpath in relpaths]
+            for future in as_completed(futures):
+                finish(*future.result())
+
+    manifest = {
+        "scales": [1] + list(scales),
+        "mip_levels": mips,
+        "sprites": {name: sprites[name] for name in sorted(sprites)},
+    }
+    data = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode()
+    if write_if_changed(os.path.join(assets_dir, os.path.basename(MANIFEST_PATH)), data):
+        print(f"  {os.path.basename(MANIFEST_PATH)}")
+    return manifest, written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export 2x/4x and mip variants of every sprite.")
+    parser.add_argument("--scales", default="2,4",
+                        help="comma-separated integer upscale factors (default 2,4)")
+    parser.add_argument("--mips", type=int, default=0,
+                        help="box-filtered mip levels to export (default 0)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes (0 = one per CPU core)")
+    args = parser.parse_args(argv)
+    scales = sorted({int(s) for s in args.scales.split(",") if s.strip()})
+    if any(n < 2 for n in scales):
+        parser.error("--scales factors must be integers >= 2")
+
+    start = time.perf_counter()
+    manifest, written = export_all(scales, args.mips, args.jobs)
+    print(f"\nDone! {len(manifest['sprites'])} sprites x {len(scales)} scales"
+          f"{f' + {args.mips} mip levels' if args.mips else ''}: {written} files written "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms).")
+
+
+if __name__ == "__main__":
+    main()
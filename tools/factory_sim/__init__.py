@@ -0,0 +1,30 @@
+"""Headless factory simulation for The Cozy Cauldron.
+
+Runs a saved factory (the `machines` array SaveManager writes) without
+Godot, to measure throughput and gold per minute:
+
+    from factory_sim import load_rules, load_layout, Simulator
+    rules = load_rules()
+    sim = Simulator(load_layout("savegame.json", rules), rules)
+    sim.run(60 * rules.fps)   # one in-game minute
+    print(sim.gold)
+
+  rules.py      timing constants and recipes parsed from the .gd sources
+  layout.py     savegame.json <-> Layout (machines on a flat cell array)
+  engine.py     event-driven Simulator, frame-exact with the game
+  kernel.py     vectorized Kernel: the whole grid one NumPy step per frame
+  flow.py       max-flow throughput bounds and bottlenecks, no simulation
+  plan.py       production ratios: fewest machines for a potions/gold target
+  optimize.py   simulated-annealing layout search within a budget and regions
+  reference.py  frame-by-frame transcription of the machine scripts (--check)
+  synthetic.py  tiled full-grid and random layouts
+
+tools/simulate_factory.py, tools/analyze_factory.py,
+tools/plan_production.py and tools/optimize_layout.py are the
+command-line front ends.
+"""
+
+from factory_sim.engine import Simulator
+from factory_sim.kernel import Kernel
+from factory_sim.layout import Layout, Machine, layout_from_save, load_layout, machine_entry
+from factory_sim.rules import Rules, load_rules
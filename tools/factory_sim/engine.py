@@ -0,0 +1,334 @@
+"""Event-driven simulator for the push + reservation transport model.
+
+The game calls every machine's _process() every frame and every Item's
+after them (MachineContainer comes before ItemContainer in main.tscn).
+Most of those calls do nothing: a belt whose item is still moving, a
+cauldron halfway through a brew. This engine only runs a machine on the
+frames where its _process() could change something:
+
+  - the frame its incoming item is first seen at rest (Rules.*_travel),
+  - the frame one of its timers runs out (spawn, brew, bottle, sell),
+  - the frame after it made a new item it has to push out,
+  - when it is blocked, the first frame the blocking machine could take
+    an item again. The blocked machine waits on that machine and is woken
+    when it frees its slot or stops refusing input: on the same frame if
+    it comes later in placement order, otherwise on the next one.
+
+Running a machine on any other frame is harmless (it would repeat what the
+game does on that frame), so wake-ups only have to be complete, not exact.
+Events sit in a heap keyed `frame * machine_count + index`, which runs
+each frame's machines in placement order like the scene tree does.
+
+Machine state lives in flat per-index lists; an item is a list
+[type, bottled, ready frame, spawn frame] owned by whichever slot
+(current_item) reserves it. Items a Sorter or Splitter hands to a machine
+that refuses them are lost, as in game (receive_item() is not checked).
+"""
+
+import heapq
+from collections import Counter
+
+from factory_sim.layout import KIND
+
+CONVEYOR, FAST_BELT, DISPENSER, CAULDRON, STORAGE, SPLITTER, SORTER, BOTTLER, SELLER = (
+    KIND[k] for k in ("conveyor", "fast_belt", "dispenser", "cauldron", "storage",
+                      "splitter", "sorter", "bottler", "auto_seller"))
+
+# Item fields
+TYPE, BOTTLED, READY, BORN = range(4)
+
+
+class Simulator:
+    """A layout's machines, advanced with run(frames). Frame 1 is the first
+    frame after loading; gold counts AutoSeller sales only (order rewards
+    are random and not simulated)."""
+
+    def __init__(self, layout, rules, log_sales=False):
+        self.rules = rules
+        self.layout = layout
+        n = self.n = len(layout.machines)
+        self.frame = 0
+        self.gold = 0
+        self.sold = Counter()  # (potion type, bottled) → count
+        self.lost = 0          # items handed to a machine that refused them
+        self.sales = [] if log_sales else None  # (frame, potion type, bottled)
+
+        self.kind = [m.kind for m in layout.machines]
+        outputs = [layout.outputs(i) for i in range(n)]
+        self.fwd = [o[0] for o in outputs]
+        self.side = [o[1] for o in outputs]
+        self.travel = [rules.fast_travel if k == FAST_BELT else rules.belt_travel for k in self.kind]
+        self.config = [m.filter_type if m.kind == SORTER else m.ingredient_type for m in layout.machines]
+
+        self.cur = [None] * n        # current_item
+        self.wait = [False] * n      # _waiting_for_arrival
+        self.busy_end = [-1] * n     # frame a brew/bottle/sale finishes, -1 when idle
+        self.stored = [list(m.stored_items) if m.kind == STORAGE else [] for m in layout.machines]
+        self.stage = [0] * n         # Splitter._output_stage
+        self.pending = [None] * n    # brew result, splitter type, or (type, bottled) being sold
+        self.blocked_on = [-1] * n
+        self.waiters = [[] for _ in range(n)]
+
+        self.recipes = {}  # (a, b) → potion, unlocked recipes only
+        for a, b, _ in rules.recipes:
+            result = rules.recipe_for(a, b, layout.unlocked_recipes)
+            if result is not None:
+                self.recipes[(a, b)] = self.recipes[(b, a)] = result
+        self.potions = rules.potion_types
+
+        self._heap = []
+        self._last = -1
+        self._process = [None] * n
+        handlers = {
+            CONVEYOR: None, FAST_BELT: None, DISPENSER: None,  # Inlined in run()
+            CAULDRON: self._cauldron, STORAGE: self._storage, SPLITTER: self._splitter,
+            SORTER: self._sorter, BOTTLER: self._bottler, SELLER: self._seller,
+        }
+        for i, k in enumerate(self.kind):
+            self._process[i] = handlers[k]
+            if k == DISPENSER:
+                self._schedule(rules.spawn_frames, i)
+            elif k == STORAGE and self.stored[i]:
+                self._schedule(1, i)
+
+    # ── Scheduling ───────────────────────────────────────────────────
+
+    def _schedule(self, frame, i):
+        heapq.heappush(self._heap, frame * self.n + i)
+
+    def _block(self, i, target):
+        """Wait for target to free its slot or stop refusing input."""
+        if self.blocked_on[i] != target:
+            self.blocked_on[i] = target
+            self.waiters[target].append(i)
+
+    def _notify(self, t, f):
+        """t (running on frame f) may accept an item now: wake what waits on it."""
+        waiting = self.waiters[t]
+        if not waiting:
+            return
+        self.waiters[t] = []
+        n = self.n
+        for w in waiting:
+            self.blocked_on[w] = -1
+            heapq.heappush(self._heap, (f if w > t else f + 1) * n + w)
+
+    def run(self, frames):
+        """Advance `frames` frames.
+
+        Belts and dispensers are most of the events on any real layout, so
+        their step (try_push_item() to the machine ahead, then the
+        dispenser's spawn timer) is inlined here; every other machine goes
+        through its handler below.
+        """
+        end = (self.frame + frames + 1) * self.n
+        heap = self._heap
+        process = self._process
+        kind, fwd, travel, config = self.kind, self.fwd, self.travel, self.config
+        cur, wait, waiters = self.cur, self.wait, self.waiters
+        accepts, block, notify = self._accepts, self._block, self._notify
+        spawn = self.rules.spawn_frames
+        n = self.n
+        last = self._last
+        pop, push = heapq.heappop, heapq.heappush
+        while heap and heap[0] < end:
+            key = pop(heap)
+            if key == last:
+                continue
+            last = key
+            f, i = divmod(key, n)
+            k = kind[i]
+            if k > DISPENSER:
+                process[i](i, f)
+                continue
+            item = cur[i]
+            if item is not None and item[READY] <= f:
+                t = fwd[i]
+                if t < 0:
+                    pass
+                elif cur[t] is not None or (kind[t] > DISPENSER and not accepts(t, item)):
+                    block(i, t)
+                else:
+                    cur[i] = None
+                    cur[t] = item
+                    if kind[t] > DISPENSER:
+                        wait[t] = True
+                    ready = item[READY] = (f if item[BORN] < f else f + 1) + travel[i]
+                    push(heap, ready * n + t)
+                    if waiters[i]:
+                        notify(i, f)
+            if k == DISPENSER and f % spawn == 0:
+                push(heap, (f + spawn) * n + i)
+                if cur[i] is None:
+                    cur[i] = [config[i], False, f, f]
+                    push(heap, (f + 1) * n + i)
+        self._last = last
+        self.frame += frames
+
+    # ── Transport ────────────────────────────────────────────────────
+
+    def _accepts(self, t, item):
+        """receive_item() of machine t, given its slot is free."""
+        k = self.kind[t]
+        if k <= DISPENSER or k == SORTER:
+            return True
+        if k == CAULDRON:
+            return self.busy_end[t] < 0 and len(self.stored[t]) < self.rules.max_ingredients
+        if k == STORAGE:
+            return not self.wait[t] and len(self.stored[t]) < self.rules.max_stored
+        if k == SPLITTER:
+            return not self.wait[t] and self.stage[t] == 0
+        if item[TYPE] not in self.potions or self.busy_end[t] >= 0 or self.wait[t]:
+            return False
+        return k == SELLER or not item[BOTTLED]
+
+    def _deliver(self, t, item, f, travel):
+        """Reserve t's slot for item and move it there (receive_item + move_to).
+        An item spawned this frame is not in this frame's process list, so
+        it starts moving one frame later."""
+        self.cur[t] = item
+        if self.kind[t] > DISPENSER:
+            self.wait[t] = True
+        item[READY] = (f if item[BORN] < f else f + 1) + travel
+        heapq.heappush(self._heap, item[READY] * self.n + t)
+
+    def _push(self, i, f, target):
+        """try_push_item() of machine i's current item to target."""
+        if target < 0:
+            return False
+        item = self.cur[i]
+        if self.cur[target] is not None or not self._accepts(target, item):
+            self._block(i, target)
+            return False
+        self.cur[i] = None
+        self._deliver(target, item, f, self.travel[i])
+        self._notify(i, f)
+        return True
+
+    def _hand_over(self, i, f, target, item):
+        """Sorter/Splitter hand-off: waits for a free slot only, and an item
+        the target refuses is lost. Returns False while blocked."""
+        if target < 0:
+            return False
+        if self.cur[target] is not None:
+            self._block(i, target)
+            return False
+        if self._accepts(target, item):
+            self._deliver(target, item, f, self.rules.belt_travel)
+        else:
+            self.lost += 1
+        return True
+
+    # ── Machines ─────────────────────────────────────────────────────
+
+    def _cauldron(self, i, f):
+        if self.busy_end[i] >= 0:
+            if f >= self.busy_end[i]:
+                self.busy_end[i] = -1
+                self.stored[i].clear()
+                self.cur[i] = [self.pending[i], False, f, f]
+                self._schedule(f + 1, i)
+            return
+        item = self.cur[i]
+        if item is None or item[READY] > f:
+            return
+        if not self.wait[i]:
+            self._push(i, f, self.fwd[i])
+            return
+        self.wait[i] = False
+        self.cur[i] = None
+        stored = self.stored[i]
+        stored.append(item[TYPE])
+        if len(stored) >= self.rules.max_ingredients:
+            result = self.recipes.get((stored[0], stored[1]))
+            if result is None:
+                stored.clear()  # Invalid or locked recipe: ingredients discarded
+            else:
+                self.pending[i] = result
+                self.busy_end[i] = f + self.rules.brew_frames
+                self._schedule(self.busy_end[i], i)
+                return
+        self._notify(i, f)
+
+    def _storage(self, i, f):
+        item = self.cur[i]
+        if self.wait[i]:
+            if item[READY] <= f:
+                self.wait[i] = False
+                self.cur[i] = None
+                self.stored[i].append(item[TYPE])
+                self._notify(i, f)
+                self._schedule(f + 1, i)
+            return
+        if item is None:
+            if not self.stored[i]:
+                return
+            item = self.cur[i] = [self.stored[i].pop(0), False, f, f]
+        if item[READY] <= f and self._push(i, f, self.fwd[i]) and self.stored[i]:
+            self._schedule(f + 1, i)
+
+    def _splitter(self, i, f):
+        if self.wait[i]:
+            item = self.cur[i]
+            if item[READY] > f:
+                return
+            self.wait[i] = False
+            self.cur[i] = None
+            self.pending[i] = item[TYPE]
+            self.stage[i] = 1
+        if self.stage[i] == 1:
+            if self._hand_over(i, f, self.fwd[i], [self.pending[i], False, f, f]):
+                self.stage[i] = 2
+                self._schedule(f + 1, i)
+        elif self.stage[i] == 2:
+            if self._hand_over(i, f, self.side[i], [self.pending[i], False, f, f]):
+                self.stage[i] = 0
+                self.pending[i] = None
+                self._notify(i, f)
+
+    def _sorter(self, i, f):
+        item = self.cur[i]
+        if item is None or item[READY] > f:
+            return
+        self.wait[i] = False
+        matches = self.config[i] == 0 or item[TYPE] == self.config[i]
+        if self._hand_over(i, f, self.fwd[i] if matches else self.side[i], item):
+            self.cur[i] = None
+            self._notify(i, f)
+
+    def _bottler(self, i, f):
+        if self.busy_end[i] >= 0:
+            if f >= self.busy_end[i]:
+                self.busy_end[i] = -1
+                self.cur[i][BOTTLED] = True
+                self._schedule(f + 1, i)
+            return
+        item = self.cur[i]
+        if item is None or item[READY] > f:
+            return
+        if self.wait[i]:
+            self.wait[i] = False
+            self.busy_end[i] = f + self.rules.bottle_frames
+            self._schedule(self.busy_end[i], i)
+        else:
+            self._push(i, f, self.fwd[i])
+
+    def _seller(self, i, f):
+        if self.busy_end[i] >= 0:
+            if f >= self.busy_end[i]:
+                self.busy_end[i] = -1
+                potion_type, bottled = self.pending[i]
+                self.gold += self.rules.price(potion_type, bottled)
+                self.sold[self.pending[i]] += 1
+                if self.sales is not None:
+                    self.sales.append((f, potion_type, bottled))
+                self.pending[i] = None
+                self._notify(i, f)
+            return
+        item = self.cur[i]
+        if item is not None and self.wait[i] and item[READY] <= f:
+            self.wait[i] = False
+            self.cur[i] = None
+            self.pending[i] = (item[TYPE], item[BOTTLED])
+            self.busy_end[i] = f + self.rules.sell_frames
+            self._schedule(self.busy_end[i], i)
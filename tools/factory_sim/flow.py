@@ -0,0 +1,414 @@
+"""Static throughput bounds: max-flow over a layout's machine graph.
+
+Every machine is a pair of nodes (in -> out) and every push an edge from
+its out node to the target's in node, so both can carry a capacity in
+items per minute, taken from the same frame counts the simulator runs on:
+
+  push edge     one item per Rules.*_travel frames (belt 120 px/s or fast
+                belt 240 px/s over a 64 px cell): the target's slot stays
+                reserved until the item arrives
+  dispenser     one item per spawn_frames, from the source
+  cauldron      MAX_INGREDIENTS arrivals plus BREW_TIME per potion
+  bottler       an arrival plus BOTTLE_TIME per potion
+  seller        an arrival plus SELL_TIME per potion, into the sink
+  splitter      an arrival plus one frame per item in
+
+Edges follow each machine's direction, per item type: a Sorter sends
+its filter type forward and everything else to the side; a push into a
+machine that refuses the type (a bottler or seller for ingredients, a
+cauldron for potions, which it swallows) is left out.
+
+Each unlocked recipe (a, b) -> p is bounded in stages, each a max flow:
+
+  a alone, b alone, and a + b together from their dispensers into every
+  cauldron; a cauldron brews at most min(a in, b in, (a + b) in / 2,
+  its brew rate) potions per minute, and those are the sources of
+  p from the cauldrons through bottlers into sellers. That last flow is
+  the bound; the stage limiting it is the potion one when it carries
+  less than is brewed, otherwise the smallest ingredient stage.
+
+A Splitter sends a copy of every item both ways and does not take the
+next item until the side has taken the copy, so the flow through it is
+capped by what its side cell can drain: nothing when the cell is empty,
+its push rate when the machine there refuses the copy (it is lost),
+otherwise a max flow from the side cell into the stage's sinks and the
+hand-offs that lose items. The flow through it goes forward, and the
+side gets a copy supply equal to that flow, re-solved until the copies
+stop changing.
+
+The result is an upper bound per recipe (recipes sharing a belt are
+bounded as if each had it to itself) and the min cut of each recipe's
+limiting stage: the edges and machines that cap it.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from factory_sim.engine import BOTTLER, CAULDRON, DISPENSER, FAST_BELT, SELLER, SORTER, SPLITTER
+
+EPSILON = 1e-9
+
+
+# ── Max Flow ─────────────────────────────────────────────────────────
+
+class FlowNetwork:
+    """Dinic's max flow on float capacities."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.head = [[] for _ in range(nodes)]
+        self.to = []
+        self.cap = []
+        self.initial = []
+
+    def add_edge(self, u, v, cap):
+        """Edge u -> v; returns its id (the reverse edge is id ^ 1)."""
+        edge = len(self.to)
+        self.head[u].append(edge)
+        self.head[v].append(edge + 1)
+        self.to += (v, u)
+        self.cap += (cap, 0.0)
+        self.initial += (cap, 0.0)
+        return edge
+
+    def flow(self, edge):
+        return self.initial[edge] - self.cap[edge]
+
+    def _levels(self, s, t):
+        level = [-1] * self.nodes
+        level[s] = 0
+        queue = deque([s])
+        head, to, cap = self.head, self.to, self.cap
+        while queue:
+            u = queue.popleft()
+            for e in head[u]:
+                v = to[e]
+                if level[v] < 0 and cap[e] > EPSILON:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level if level[t] >= 0 else None
+
+    def max_flow(self, s, t):
+        total = 0.0
+        head, to, cap = self.head, self.to, self.cap
+        while True:
+            level = self._levels(s, t)
+            if level is None:
+                return total
+            arc = [0] * self.nodes
+            while True:
+                # Walk one augmenting path in the level graph
+                path = []
+                u = s
+                while u != t:
+                    edges = head[u]
+                    while arc[u] < len(edges):
+                        e = edges[arc[u]]
+                        v = to[e]
+                        if cap[e] > EPSILON and level[v] == level[u] + 1:
+                            break
+                        arc[u] += 1
+                    else:
+                        if u == s:
+                            break
+                        level[u] = -1  # Dead end: retreat
+                        u = to[path.pop() ^ 1]
+                        arc[u] += 1
+                        continue
+                    path.append(edges[arc[u]])
+                    u = to[edges[arc[u]]]
+                if u != t:
+                    break
+                push = min(cap[e] for e in path)
+                for e in path:
+                    cap[e] -= push
+                    cap[e ^ 1] += push
+                total += push
+
+    def reachable(self, s):
+        """Nodes reachable from s in the residual graph (the source side of the min cut)."""
+        seen = [False] * self.nodes
+        seen[s] = True
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for e in self.head[u]:
+                v = self.to[e]
+                if not seen[v] and self.cap[e] > EPSILON:
+                    seen[v] = True
+                    queue.append(v)
+        return seen
+
+
+# ── Capacities ───────────────────────────────────────────────────────
+
+def per_minute(rules, frames):
+    return 60.0 * rules.fps / frames
+
+
+class Rates:
+    """Items per minute through each machine of a layout."""
+
+    def __init__(self, layout, rules):
+        n = len(layout.machines)
+        kinds = [m.kind for m in layout.machines]
+        self.outputs = [layout.outputs(i) for i in range(n)]
+        travel = [rules.fast_travel if k == FAST_BELT else rules.belt_travel for k in kinds]
+        self.push = [per_minute(rules, t) for t in travel]
+        arrival = [rules.belt_travel] * n  # Fastest push into each machine
+        for i, (fwd, side) in enumerate(self.outputs):
+            for t in (fwd, side):
+                if t >= 0:
+                    arrival[t] = min(arrival[t], travel[i])
+        self.spawn = per_minute(rules, rules.spawn_frames)
+        self.node = [float("inf")] * n
+        for i, k in enumerate(kinds):
+            if k == CAULDRON:
+                self.node[i] = per_minute(rules, rules.brew_frames + rules.max_ingredients * arrival[i])
+            elif k == BOTTLER:
+                self.node[i] = per_minute(rules, rules.bottle_frames + arrival[i])
+            elif k == SELLER:
+                self.node[i] = per_minute(rules, rules.sell_frames + arrival[i])
+            elif k == SPLITTER:
+                self.node[i] = per_minute(rules, arrival[i] + 1)
+        self.cauldrons = {i: self.node[i] for i, k in enumerate(kinds) if k == CAULDRON}
+        self.sellers = {i: self.node[i] for i, k in enumerate(kinds) if k == SELLER}
+        self.dispensers = {}  # ingredient type → [machine index]
+        for i, m in enumerate(layout.machines):
+            if m.kind == DISPENSER:
+                self.dispensers.setdefault(m.ingredient_type, []).append(i)
+
+
+def accepts(kind, potion):
+    """Whether a machine of `kind` takes (and keeps) items of that class."""
+    if kind in (BOTTLER, SELLER):
+        return potion
+    return not (kind == CAULDRON and potion)
+
+
+# ── Stages ───────────────────────────────────────────────────────────
+
+@dataclass
+class Stage:
+    """One max flow: its value, and the min cut as (label, capacity, flow)."""
+    name: str
+    value: float
+    cut: list
+    through: dict  # machine index → items/min through it
+
+
+class _Graph:
+    """The flow network of some item types, over the machines their
+    sources can reach: machine i (local index j) is in node 2j, out 2j+1.
+
+    With `drain`, the network of what one splitter's side cell can take:
+    the source feeds its in node, items lost in a hand-off (or swallowed
+    by a cauldron) count as drained, and nested splitters are not capped
+    by their own side, which keeps it an upper bound."""
+
+    def __init__(self, layout, rates, item_types, potion, sources, sinks, sink_scale=1.0,
+                 drain=False):
+        machines = layout.machines
+
+        def targets(i):
+            m = machines[i]
+            fwd, side = rates.outputs[i]
+            if m.kind == SORTER:
+                found = {fwd if m.filter_type in (0, t) else side for t in item_types}
+            else:
+                found = {fwd}
+            return [t for t in found if t >= 0]
+
+        def kept(i):
+            return [t for t in targets(i) if accepts(machines[t].kind, potion)]
+
+        def lost(i):
+            """Targets an item vanishes into: refused in a Sorter or Splitter
+            hand-off, or swallowed by a cauldron."""
+            if not drain:
+                return []
+            handoff = machines[i].kind in (SORTER, SPLITTER)
+            return [t for t in targets(i) if not accepts(machines[t].kind, potion)
+                    and (handoff or machines[t].kind == CAULDRON)]
+
+        def is_sink(i):
+            return i in sinks and (drain or i not in sources)
+
+        local = {i: j for j, i in enumerate(sources)}
+        order = list(sources)
+        queue = deque(order)
+        while queue:
+            i = queue.popleft()
+            if is_sink(i):
+                continue
+            out = kept(i)
+            side = rates.outputs[i][1]
+            if machines[i].kind == SPLITTER and side >= 0 and accepts(machines[side].kind, potion):
+                out.append(side)
+            for t in out:
+                if t not in local:
+                    local[t] = len(order)
+                    order.append(t)
+                    queue.append(t)
+
+        self.s, self.t = 2 * len(order), 2 * len(order) + 1
+        net = self.net = FlowNetwork(2 * len(order) + 2)
+        self.labels = {}  # edge id → ("machine" | "edge" | "supply" | "sink", i, t)
+        self.node_edges = {}
+        self.copy_edges = {}  # splitter → copy supply edge into its side target
+        for i in order:
+            j = local[i]
+            if i in sources:
+                e = net.add_edge(self.s, 2 * j if drain else 2 * j + 1, sources[i])
+                self.labels[e] = ("supply", i, -1)
+            if is_sink(i):
+                e = net.add_edge(2 * j, self.t, sinks[i] * sink_scale)
+                self.labels[e] = ("sink", i, -1)
+                self.node_edges[i] = e
+                continue
+            capacity = rates.node[i]
+            if machines[i].kind == SPLITTER and not drain:
+                capacity = min(capacity, self._side_capacity(layout, rates, item_types, potion,
+                                                             sinks, sink_scale, i))
+            e = net.add_edge(2 * j, 2 * j + 1, capacity)
+            self.labels[e] = ("machine", i, -1)
+            self.node_edges[i] = e
+            for t in kept(i):
+                e = net.add_edge(2 * j + 1, 2 * local[t], rates.push[i])
+                self.labels[e] = ("edge", i, t)
+            for t in lost(i):
+                e = net.add_edge(2 * j + 1, self.t, rates.push[i])
+                self.labels[e] = ("edge", i, t)
+            side = rates.outputs[i][1]
+            if machines[i].kind == SPLITTER and side in local and not drain:
+                e = net.add_edge(self.s, 2 * local[side], 0.0)
+                self.labels[e] = ("edge", i, side)
+                self.copy_edges[i] = e
+
+    @staticmethod
+    def _side_capacity(layout, rates, item_types, potion, sinks, sink_scale, i):
+        """Items per minute splitter i's side cell can take copies at."""
+        side = rates.outputs[i][1]
+        if side < 0:
+            return 0.0  # Splitter._try_push_secondary() waits forever
+        if not accepts(layout.machines[side].kind, potion):
+            return rates.push[i]  # Refused copies are lost, never blocking
+        graph = _Graph(layout, rates, item_types, potion, {side: rates.push[i]}, sinks,
+                       sink_scale, drain=True)
+        return graph.net.max_flow(graph.s, graph.t)
+
+    def solve(self, name, rates):
+        """Max flow, re-solved while splitter copy supplies change."""
+        net = self.net
+        copies = {i: 0.0 for i in self.copy_edges}
+        for _ in range(len(copies) + 1):
+            net.cap = list(net.initial)
+            value = net.max_flow(self.s, self.t)
+            through = {i: net.flow(e) for i, e in self.node_edges.items()}
+            changed = False
+            for i, e in self.copy_edges.items():
+                supply = min(through.get(i, 0.0), rates.push[i])
+                if abs(supply - copies[i]) > 1e-6:
+                    copies[i] = supply
+                    net.initial[e] = supply
+                    changed = True
+            if not changed:
+                break
+        seen = net.reachable(self.s)
+        cut = []
+        for e, (what, i, target) in self.labels.items():
+            u, v = net.to[e ^ 1], net.to[e]
+            if seen[u] and not seen[v] and net.initial[e] > EPSILON:
+                cut.append(((what, i, target), net.initial[e], net.flow(e)))
+        return Stage(name, value, cut, through)
+
+
+@dataclass
+class RecipeBound:
+    recipe: int
+    ingredients: tuple
+    potion: int
+    potions_per_minute: float
+    limit: str                    # name of the limiting stage
+    stages: list = field(default_factory=list)
+
+    @property
+    def cut(self):
+        """The limiting stage's min cut, largest flow first."""
+        stage = next(s for s in self.stages if s.name == self.limit)
+        return sorted(stage.cut, key=lambda c: -c[2])
+
+
+def bound_recipe(layout, rules, rates, recipe):
+    """RecipeBound for RECIPE_LIST[recipe] on layout."""
+    a, b, potion = rules.recipes[recipe]
+    cauldrons = rates.cauldrons
+
+    def dispensers(*types):
+        return {i: rates.spawn for t in types for i in rates.dispensers.get(t, ())}
+
+    stages = []
+    flows = {}
+    for name, types, scale in (("a", (a,), 1.0), ("b", (b,), 1.0), ("a+b", (a, b), 2.0)):
+        graph = _Graph(layout, rates, types, False, dispensers(*types), cauldrons, scale)
+        stage = graph.solve(name, rates)
+        if name == "a+b":
+            stage.value /= 2  # Potions' worth: two ingredients each
+        stages.append(stage)
+        flows[name] = {i: stage.through.get(i, 0.0) for i in cauldrons}
+    brewed = {i: min(cap, flows["a"][i], flows["b"][i], flows["a+b"][i] / 2)
+              for i, cap in cauldrons.items()}
+    sources = {i: rate for i, rate in brewed.items() if rate > EPSILON}
+    graph = _Graph(layout, rates, (potion,), True, sources, rates.sellers)
+    sold = graph.solve("potion", rates)
+    stages.append(sold)
+    # Splitter copies can sell more potions than are brewed, so the potion
+    # stage is the bound; it is limited by brewing unless it falls short
+    if sold.value < sum(sources.values()) - 1e-6:
+        limit = sold
+    else:
+        limit = min(stages[:3], key=lambda s: s.value)
+    return RecipeBound(recipe, (a, b), potion, sold.value, limit.name, stages)
+
+
+def analyze(layout, rules):
+    """(Rates, [RecipeBound]) for every unlocked recipe whose ingredients
+    both have a dispenser."""
+    rates = Rates(layout, rules)
+    bounds = []
+    for recipe in layout.unlocked_recipes:
+        a, b, potion = rules.recipes[recipe]
+        if a in rates.dispensers and b in rates.dispensers and rules.recipe_for(a, b, layout.unlocked_recipes) == potion:
+            bounds.append(bound_recipe(layout, rules, rates, recipe))
+    return rates, bounds
+
+
+def utilization(layout, rates, bounds):
+    """[(machine index, items/min through it, capacity)] for machines with
+    a rate limit, summed over every recipe's a+b and potion flows (a
+    cauldron counts potions' worth of ingredients), busiest first."""
+    through = {}
+    for bound in bounds:
+        for stage in bound.stages:
+            if stage.name not in ("a+b", "potion"):
+                continue
+            for i, flow in stage.through.items():
+                if stage.name == "a+b" and layout.machines[i].kind == CAULDRON:
+                    flow /= 2
+                through[i] = through.get(i, 0.0) + flow
+    rows = [(i, flow, rates.node[i]) for i, flow in through.items() if rates.node[i] != float("inf")]
+    return sorted(rows, key=lambda r: -r[1] / r[2])
+
+
+def bottlenecks(bounds):
+    """[(label, capacity, potions/min through it, [recipes])]: the limiting
+    min cuts of all recipes merged, the ones carrying the most first. A
+    label is ("machine" | "edge" | "supply" | "sink", machine, target)."""
+    merged = {}
+    for bound in bounds:
+        scale = 0.5 if bound.limit == "a+b" else 1.0
+        for label, capacity, flow in bound.cut:
+            entry = merged.setdefault(label, [label, capacity, 0.0, []])
+            entry[2] += flow * scale
+            entry[3].append(bound.recipe)
+    return sorted((tuple(e) for e in merged.values()), key=lambda e: (-e[2], e[1]))
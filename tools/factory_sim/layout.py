@@ -0,0 +1,130 @@
+"""Factory layouts: the savegame.json machine list on a flat cell array.
+
+SaveManager._serialize_machines() writes one entry per machine, in
+placement order:
+
+    {"type": "dispenser", "grid_x": 3, "grid_y": 4, "dir_x": 1, "dir_y": 0,
+     "ingredient_type": 1}          # dispensers
+     "filter_type": 0               # sorters
+     "stored_items": [1, 1, 2]      # non-empty storage chests
+
+main.gd restores them in that order, so placement order is also the order
+the machines' _process() runs in every frame, which the simulator keeps.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+
+# Machine keys in SaveManager._get_machine_type_key(); index = kind code
+MACHINE_TYPES = ("conveyor", "fast_belt", "dispenser", "cauldron", "storage",
+                 "splitter", "sorter", "bottler", "auto_seller")
+KIND = {key: code for code, key in enumerate(MACHINE_TYPES)}
+DEFAULT_UNLOCKED_RECIPES = (0, 1)  # SaveManager default when the key is missing
+
+SAVE_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "godot",
+                         "app_userdata", "The Cozy Cauldron", "savegame.json")
+
+
+@dataclass
+class Machine:
+    kind: int
+    x: int
+    y: int
+    dx: int = 1
+    dy: int = 0
+    ingredient_type: int = 0
+    filter_type: int = 0
+    stored_items: list = field(default_factory=list)
+
+    @property
+    def type(self):
+        return MACHINE_TYPES[self.kind]
+
+
+@dataclass
+class Layout:
+    """Machines in placement order on a width x height grid.
+
+    cells[y * width + x] is the index of the machine on that cell, or -1.
+    Like GridManager.place_machine(), a machine restored onto an occupied
+    or out-of-bounds cell stays in `machines` (it still runs) but not in
+    `cells` (nothing can push to it).
+    """
+    width: int
+    height: int
+    machines: list
+    unlocked_recipes: tuple = DEFAULT_UNLOCKED_RECIPES
+    cells: list = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.cells is None:
+            self.cells = [-1] * (self.width * self.height)
+            for i, m in enumerate(self.machines):
+                if self.in_bounds(m.x, m.y) and self.cells[m.y * self.width + m.x] < 0:
+                    self.cells[m.y * self.width + m.x] = i
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def machine_at(self, x, y):
+        """Index of the machine on (x, y), or -1."""
+        return self.cells[y * self.width + x] if self.in_bounds(x, y) else -1
+
+    def outputs(self, i):
+        """(forward, side) machine indices for machine i, -1 where empty.
+        The side output is 90 degrees clockwise: (x, y) -> (-y, x)."""
+        m = self.machines[i]
+        return (self.machine_at(m.x + m.dx, m.y + m.dy),
+                self.machine_at(m.x - m.dy, m.y + m.dx))
+
+
+# ── Save Format ──────────────────────────────────────────────────────
+
+def machine_from_entry(entry):
+    """Machine for one savegame entry, or None for an unknown type (main.gd skips those)."""
+    kind = KIND.get(entry.get("type", ""))
+    if kind is None:
+        return None
+    return Machine(
+        kind=kind,
+        x=int(entry.get("grid_x", 0)),
+        y=int(entry.get("grid_y", 0)),
+        dx=int(entry.get("dir_x", 1)),
+        dy=int(entry.get("dir_y", 0)),
+        ingredient_type=int(entry.get("ingredient_type", 0)),
+        filter_type=int(entry.get("filter_type", 0)),
+        stored_items=[int(t) for t in entry.get("stored_items", [])],
+    )
+
+
+def machine_entry(m):
+    """The savegame entry SaveManager would write for m."""
+    entry = {"type": m.type, "grid_x": m.x, "grid_y": m.y, "dir_x": m.dx, "dir_y": m.dy}
+    if m.type == "dispenser":
+        entry["ingredient_type"] = m.ingredient_type
+    if m.type == "sorter":
+        entry["filter_type"] = m.filter_type
+    if m.type == "storage" and m.stored_items:
+        entry["stored_items"] = list(m.stored_items)
+    return entry
+
+
+def layout_from_save(data, rules):
+    """Layout for a parsed savegame.json dict."""
+    unlocked = tuple(int(r) for r in data.get("unlocked_recipes", DEFAULT_UNLOCKED_RECIPES))
+    machines = []
+    for entry in data.get("machines", []):
+        m = machine_from_entry(entry)
+        if m is None:
+            continue
+        if m.type == "dispenser" and "ingredient_type" not in entry and unlocked:
+            # Dispenser._ready(): first ingredient of the first unlocked recipe
+            m.ingredient_type = rules.recipes[unlocked[0]][0]
+        machines.append(m)
+    return Layout(rules.width, rules.height, machines, unlocked)
+
+
+def load_layout(path, rules):
+    with open(path) as f:
+        return layout_from_save(json.load(f), rules)
@@ -0,0 +1,350 @@
+"""Layout search: simulated annealing over machine placements.
+
+A candidate is a tuple of genes, one per machine in placement order:
+
+    (kind, x, y, dir_x, dir_y, ingredient_type, filter_type)
+
+restricted to the cells of the unlocked regions (RegionManager.REGIONS)
+and the machine types the budget unlocks (GameState.MACHINE_COSTS). Its
+score is the gold per minute the event-driven Simulator measures after a
+warmup, less a small charge per machine so that, of two layouts earning
+the same, the smaller wins.
+
+The search runs `chains` annealing chains side by side. Every generation
+each chain proposes one mutation of its current layout, the proposals are
+scored together (the only expensive step, spread over a process pool by
+the caller), and each chain accepts or rejects its own by the Metropolis
+rule at the generation's temperature. Every `sync` generations the worst
+quarter of the chains restart from the best layout found so far.
+
+Each chain draws from its own random.Random seeded by (seed, chain), and
+scores come back in proposal order, so a run depends on the seed and the
+settings only, never on the worker count or on which worker finished
+first.
+"""
+
+import math
+import random
+import re
+import time
+from dataclasses import dataclass
+
+from factory_sim.engine import Simulator
+from factory_sim.layout import KIND, MACHINE_TYPES, Layout, Machine, machine_entry
+from factory_sim.rules import SCRIPTS, _read
+
+R, D, L, U = (1, 0), (0, 1), (-1, 0), (0, -1)
+DIRECTIONS = (R, D, L, U)
+
+DEFAULT_MACHINES = ("conveyor", "dispenser", "cauldron")  # SaveManager default
+# Machine types the budget buys, most useful first: nothing sells without
+# a seller, bottling doubles the price, the rest only route items
+BUY_ORDER = ("auto_seller", "bottler", "fast_belt", "splitter", "sorter", "storage")
+# Types a placed machine may be changed into (dispensers are only placed with a line)
+RETYPE = ("conveyor", "fast_belt", "cauldron", "storage", "splitter", "sorter",
+          "bottler", "auto_seller")
+MACHINE_CHARGE = 0.01  # gold/min a machine has to earn to be worth keeping
+
+
+# ── Game Data ────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Region:
+    id: int
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    cost: int
+
+    def cells(self):
+        return {(x, y) for x in range(self.x, self.x + self.width)
+                for y in range(self.y, self.y + self.height)}
+
+
+def load_regions(scripts_dir=SCRIPTS):
+    """RegionManager.REGIONS in id order."""
+    src = _read("region_manager.gd", scripts_dir)
+    regions = [Region(int(i), name, int(x), int(y), int(w), int(h), int(cost))
+               for i, name, x, y, w, h, cost in re.findall(
+                   r'"id":\s*(\d+),\s*"name":\s*"([^"]*)",\s*"rect":\s*Rect2i\(\s*(\d+),\s*(\d+),'
+                   r'\s*(\d+),\s*(\d+)\s*\),\s*"cost":\s*(\d+)', src)]
+    if not regions:
+        raise SystemExit("const REGIONS not found")
+    return sorted(regions, key=lambda r: r.id)
+
+
+def load_machine_costs(scripts_dir=SCRIPTS):
+    """GameState.MACHINE_COSTS as {type key: gold}."""
+    match = re.search(r"^const\s+MACHINE_COSTS\b[^=]*=\s*\{([^}]*)\}",
+                      _read("game_state.gd", scripts_dir), re.M)
+    if match is None:
+        raise SystemExit("const MACHINE_COSTS not found")
+    return {key: int(cost) for key, cost in re.findall(r'"(\w+)":\s*(\d+)', match.group(1))}
+
+
+def buy_machines(costs, budget):
+    """(unlocked machine types, gold left) after unlocking BUY_ORDER types
+    while the budget lasts, on top of the free defaults."""
+    unlocked = [key for key in DEFAULT_MACHINES]
+    for key in BUY_ORDER:
+        if costs.get(key, 0) <= budget:
+            budget -= costs.get(key, 0)
+            unlocked.append(key)
+    return unlocked, budget
+
+
+# ── Problem ──────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Problem:
+    regions: tuple           # unlocked region ids
+    cells: frozenset         # (x, y) a machine may go on
+    recipes: tuple           # unlocked RECIPE_LIST indices
+    machines: tuple          # unlocked machine type keys
+    gold: int                # left after buying them
+    warmup_frames: int
+    eval_frames: int
+
+
+def make_problem(rules, regions, region_ids, recipes, budget, costs, warmup=0.5, minutes=2.0):
+    """Problem for a budget, unlocked region ids and recipe indices;
+    warmup and minutes are the scoring window in in-game minutes."""
+    by_id = {r.id: r for r in regions}
+    cells = set()
+    for i in region_ids:
+        cells |= by_id[i].cells()
+    cells = {(x, y) for x, y in cells if 0 <= x < rules.width and 0 <= y < rules.height}
+    machines, gold = buy_machines(costs, budget)
+    return Problem(
+        regions=tuple(sorted(region_ids)),
+        cells=frozenset(cells),
+        recipes=tuple(sorted(recipes)),
+        machines=tuple(machines),
+        gold=gold,
+        warmup_frames=round(warmup * 60 * rules.fps),
+        eval_frames=round(minutes * 60 * rules.fps),
+    )
+
+
+def layout_of(genes, rules, problem):
+    machines = [Machine(kind, x, y, dx, dy, ingredient_type=ingredient, filter_type=filt)
+                for kind, x, y, dx, dy, ingredient, filt in genes]
+    return Layout(rules.width, rules.height, machines, problem.recipes)
+
+
+def score(genes, rules, problem):
+    """Gold per minute of the layout over the scoring window, less
+    MACHINE_CHARGE per machine."""
+    if not genes:
+        return 0.0
+    sim = Simulator(layout_of(genes, rules, problem), rules)
+    sim.run(problem.warmup_frames)
+    before = sim.gold
+    sim.run(problem.eval_frames)
+    minutes = problem.eval_frames / (60 * rules.fps)
+    return (sim.gold - before) / minutes - MACHINE_CHARGE * len(genes)
+
+
+def save_data(genes, rules, problem):
+    """The savegame.json dict SaveManager.load_game() restores the layout from."""
+    return {
+        "gold": problem.gold,
+        "unlocked_recipes": list(problem.recipes),
+        "unlocked_machines": list(problem.machines),
+        "machines": [machine_entry(m) for m in layout_of(genes, rules, problem).machines],
+        "orders": [],
+        "tutorial_seen": [],
+        "unlocked_regions": list(problem.regions),
+        "endgame_shown": False,
+    }
+
+
+# ── Mutations ────────────────────────────────────────────────────────
+
+class Mutator:
+    """Random edits of a gene tuple that keep every machine on a free,
+    unlocked cell and of an unlocked type."""
+
+    def __init__(self, rules, problem):
+        self.rules = rules
+        self.problem = problem
+        self.cells = sorted(problem.cells)
+        self.ingredients = sorted({t for r in problem.recipes for t in rules.recipes[r][:2]})
+        self.filters = [0] + sorted(set(self.ingredients) |
+                                    {rules.recipes[r][2] for r in problem.recipes})
+        self.retype = [KIND[key] for key in RETYPE if key in problem.machines]
+        self.ops = [(self.add_line, 4), (self.remove, 2), (self.rotate, 2),
+                    (self.retype_one, 2), (self.ingredient, 1)]
+
+    def mutate(self, genes, rng):
+        """A changed copy of genes; tries other edits until one applies."""
+        for _ in range(20):
+            op = rng.choices([op for op, _ in self.ops], [w for _, w in self.ops])[0]
+            changed = op(list(genes), rng)
+            if changed is not None:
+                return tuple(changed)
+        return genes
+
+    def add_line(self, genes, rng):
+        """Append a line: dispenser, belt with the second dispenser beside
+        it, cauldron, then belts (maybe through a bottler) to a seller."""
+        taken = {(g[1], g[2]) for g in genes}
+        free = [c for c in self.cells if c not in taken]
+        if not free:
+            return None
+        a, b, _ = self.rules.recipes[rng.choice(self.problem.recipes)]
+        x, y = rng.choice(free)
+        dx, dy = rng.choice(DIRECTIONS)
+        bottler = "bottler" in self.problem.machines and rng.random() < 0.6
+        belt = KIND["fast_belt"] if "fast_belt" in self.problem.machines and rng.random() < 0.3 \
+            else KIND["conveyor"]
+        length = rng.randint(5, 12)
+        line = []
+        for step in range(length):
+            if (x, y) not in self.problem.cells or (x, y) in taken:
+                break
+            if step > 2 and rng.random() < 0.25:
+                dx, dy = rng.choice([(dx, dy), (-dy, dx), (dy, -dx)])  # Never back into the line
+            if step == 0:
+                gene = (KIND["dispenser"], x, y, dx, dy, a, 0)
+            elif step == 2:
+                gene = (KIND["cauldron"], x, y, dx, dy, 0, 0)
+            elif bottler and step == 3 + (length - 4) // 2:
+                gene = (KIND["bottler"], x, y, dx, dy, 0, 0)
+            else:
+                gene = (belt, x, y, dx, dy, 0, 0)
+            line.append(gene)
+            taken.add((x, y))
+            if step == 1:
+                # Second dispenser beside the first belt, pushing into it
+                side = (x - dy, y + dx)
+                if side not in self.problem.cells or side in taken:
+                    return None
+                line.append((KIND["dispenser"], side[0], side[1], dy, -dx, b, 0))
+                taken.add(side)
+            x, y = x + dx, y + dy
+        if len(line) < 5:
+            return None
+        _, x, y, dx, dy, _, _ = line[-1]
+        line[-1] = (KIND["auto_seller"], x, y, dx, dy, 0, 0)
+        return genes + line
+
+    def remove(self, genes, rng):
+        """Drop one machine, or a machine and the run it pushes into."""
+        if not genes:
+            return None
+        start = rng.randrange(len(genes))
+        if rng.random() < 0.5:
+            return genes[:start] + genes[start + 1:]
+        at = {(g[1], g[2]): i for i, g in enumerate(genes)}
+        drop = set()
+        i = start
+        while i is not None and i not in drop and len(drop) < 12:
+            drop.add(i)
+            _, x, y, dx, dy, _, _ = genes[i]
+            i = at.get((x + dx, y + dy))
+        return [g for i, g in enumerate(genes) if i not in drop]
+
+    def rotate(self, genes, rng):
+        if not genes:
+            return None
+        i = rng.randrange(len(genes))
+        kind, x, y, dx, dy, ingredient, filt = genes[i]
+        dx, dy = rng.choice([d for d in DIRECTIONS if d != (dx, dy)])
+        genes[i] = (kind, x, y, dx, dy, ingredient, filt)
+        return genes
+
+    def retype_one(self, genes, rng):
+        placed = [i for i, g in enumerate(genes) if g[0] != KIND["dispenser"]]
+        if not placed or len(self.retype) < 2:
+            return None
+        i = rng.choice(placed)
+        kind, x, y, dx, dy, _, _ = genes[i]
+        kind = rng.choice([k for k in self.retype if k != kind])
+        filt = rng.choice(self.filters) if MACHINE_TYPES[kind] == "sorter" else 0
+        genes[i] = (kind, x, y, dx, dy, 0, filt)
+        return genes
+
+    def ingredient(self, genes, rng):
+        dispensers = [i for i, g in enumerate(genes) if g[0] == KIND["dispenser"]]
+        if not dispensers:
+            return None
+        i = rng.choice(dispensers)
+        kind, x, y, dx, dy, _, filt = genes[i]
+        genes[i] = (kind, x, y, dx, dy, rng.choice(self.ingredients), filt)
+        return genes
+
+
+# ── Annealing ────────────────────────────────────────────────────────
+
+@dataclass
+class Generation:
+    """One row of the convergence log."""
+    generation: int
+    evaluations: int
+    best: float
+    mean: float
+    acceptance: float
+    temperature: float
+    elapsed: float
+
+
+def temperature(t0, t1, generation, generations):
+    """Geometric cooling from t0 at generation 0 to t1 at the last."""
+    return t0 * (t1 / t0) ** (generation / max(1, generations - 1))
+
+
+def anneal(rules, problem, score_batch, seed=0, chains=16, generations=200,
+           t0=20.0, t1=0.2, sync=25, start_lines=3, on_generation=None):
+    """(best genes, best score, [Generation]). score_batch(list of gene
+    tuples) returns their scores in order; it is called once per
+    generation with every proposal not scored before."""
+    mutator = Mutator(rules, problem)
+    rngs = [random.Random(f"{seed}:{chain}") for chain in range(chains)]
+    scores = {}
+    evaluations = 0
+
+    def evaluate(batch):
+        nonlocal evaluations
+        fresh = list(dict.fromkeys(g for g in batch if g not in scores))
+        for genes, value in zip(fresh, score_batch(fresh)):
+            scores[genes] = value
+        evaluations += len(fresh)
+        return [scores[g] for g in batch]
+
+    current = []
+    for rng in rngs:
+        genes = ()
+        for _ in range(start_lines):
+            genes = tuple(mutator.add_line(list(genes), rng) or genes)
+        current.append(genes)
+    values = evaluate(current)
+    best_index = max(range(chains), key=lambda c: values[c])
+    best, best_score = current[best_index], values[best_index]
+
+    start = time.perf_counter()
+    log = []
+    for generation in range(generations):
+        t = temperature(t0, t1, generation, generations)
+        proposals = [mutator.mutate(genes, rng) for genes, rng in zip(current, rngs)]
+        proposed = evaluate(proposals)
+        accepted = 0
+        for c, rng in enumerate(rngs):
+            delta = proposed[c] - values[c]
+            if delta >= 0 or rng.random() < math.exp(delta / t):
+                current[c], values[c] = proposals[c], proposed[c]
+                accepted += 1
+            if values[c] > best_score:
+                best, best_score = current[c], values[c]
+        if sync and (generation + 1) % sync == 0:
+            # Ties keep chain order, so restarts don't depend on anything but scores
+            for c in sorted(range(chains), key=lambda c: values[c])[:chains // 4]:
+                current[c], values[c] = best, best_score
+        row = Generation(generation, evaluations, best_score, sum(values) / chains,
+                         accepted / chains, t, time.perf_counter() - start)
+        log.append(row)
+        if on_generation is not None:
+            on_generation(row)
+    return best, best_score, log
@@ -0,0 +1,228 @@
+"""Production ratios: the fewest machines that hit a potions or gold target.
+
+A production line for one recipe is `pairs` dispenser pairs (one per
+ingredient) feeding cauldrons, optionally bottlers, and sellers. Every
+rate comes from the same frame counts as the simulator (see flow.py):
+
+  dispenser   one ingredient per SPAWN_INTERVAL
+  cauldron    MAX_INGREDIENTS arrivals plus BREW_TIME per potion
+  bottler     an arrival plus BOTTLE_TIME per potion
+  seller      an arrival plus SELL_TIME per potion
+  lane        one item per belt (or fast belt) travel time
+
+Dispensers set the output (pairs * dispenser rate potions per minute);
+every other count is that output over the machine's rate, rounded up, and
+lanes are the belts needed side by side for each ingredient and for the
+potions.
+
+A total target is split over the unlocked recipes by a knapsack over
+machine counts: for every recipe, each pair count up to what it would
+need alone, bottled or not (bottling doubles the price), and the mix
+reaching the target with the fewest machines wins, the most gold on a
+tie. Every recipe has the same timings, so for potions that is always
+one line, but for gold a cheap recipe's spare pair can top up an
+expensive line for fewer machines than another pair of it would.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from factory_sim.flow import per_minute
+
+
+@dataclass(frozen=True)
+class MachineRates:
+    """Items (or potions) per minute one machine or lane handles."""
+    dispenser: float
+    cauldron: float
+    bottler: float
+    seller: float
+    lane: float
+
+
+def machine_rates(rules, fast=False):
+    travel = rules.fast_travel if fast else rules.belt_travel
+    return MachineRates(
+        dispenser=per_minute(rules, rules.spawn_frames),
+        cauldron=per_minute(rules, rules.brew_frames + rules.max_ingredients * travel),
+        bottler=per_minute(rules, rules.bottle_frames + travel),
+        seller=per_minute(rules, rules.sell_frames + travel),
+        lane=per_minute(rules, travel),
+    )
+
+
+@dataclass(frozen=True)
+class Line:
+    recipe: int
+    bottled: bool
+    pairs: int               # dispensers per ingredient
+    cauldrons: int
+    bottlers: int
+    sellers: int
+    ingredient_lanes: int    # per ingredient
+    potion_lanes: int
+    potions_per_minute: float
+    gold_per_minute: float
+
+    @property
+    def machines(self):
+        return 2 * self.pairs + self.cauldrons + self.bottlers + self.sellers
+
+
+def size_line(rules, rates, recipe, pairs, bottled):
+    """The Line `pairs` dispenser pairs of RECIPE_LIST[recipe] need."""
+    potions = pairs * rates.dispenser
+
+    def count(rate):
+        # Rounding guard: 5 dispensers at exactly a lane's rate need one lane
+        return math.ceil(potions / rate - 1e-9)
+
+    return Line(
+        recipe=recipe,
+        bottled=bottled,
+        pairs=pairs,
+        cauldrons=count(rates.cauldron),
+        bottlers=count(rates.bottler) if bottled else 0,
+        sellers=count(rates.seller),
+        ingredient_lanes=count(rates.lane),
+        potion_lanes=count(rates.lane),
+        potions_per_minute=potions,
+        gold_per_minute=potions * rules.price(rules.recipes[recipe][2], bottled),
+    )
+
+
+def plan_line(rules, rates, recipe, potions=None, gold=None):
+    """The Line of one recipe with the fewest machines reaching the target
+    (fewer lanes, then more gold, on a tie)."""
+    options = []
+    for bottled in (False, True):
+        if potions is not None:
+            need = potions
+        else:
+            need = gold / rules.price(rules.recipes[recipe][2], bottled)
+        pairs = max(1, math.ceil(need / rates.dispenser - 1e-9))
+        options.append(size_line(rules, rates, recipe, pairs, bottled))
+        if potions is not None:
+            break  # Bottling adds machines and no potions
+    return min(options, key=lambda line: (line.machines, line.ingredient_lanes + line.potion_lanes,
+                                          -line.gold_per_minute))
+
+
+def _options(rules, rates, recipe, potions, gold):
+    """Every line of one recipe up to what it needs to reach the target alone."""
+    need = potions if potions is not None else gold / rules.price(rules.recipes[recipe][2], False)
+    most = max(1, math.ceil(need / rates.dispenser - 1e-9))
+    lines = sorted((size_line(rules, rates, recipe, pairs, bottled)
+                    for pairs in range(1, most + 1) for bottled in (False, True)),
+                   key=lambda line: (line.machines, -line.gold_per_minute))
+    # Drop lines that make no more than a line with fewer machines
+    kept = []
+    for line in lines:
+        made = line.potions_per_minute if potions is not None else line.gold_per_minute
+        if not kept or made > (kept[-1].potions_per_minute if potions is not None
+                               else kept[-1].gold_per_minute) + 1e-9:
+            kept.append(line)
+    return kept
+
+
+def _extend(best, options, potions):
+    """Knapsack step. best[0, c] is the most made (potions or gold) with
+    exactly c machines and best[1, c] its gold; returns the new best and
+    the option index taken at each c (-1 for none)."""
+    size = best.shape[1]
+    cur = best.copy()
+    pick = np.full(size, -1, np.int32)
+    for j, line in enumerate(options):
+        cost = line.machines
+        if cost >= size:
+            continue
+        made = line.potions_per_minute if potions is not None else line.gold_per_minute
+        candidate = np.full((2, size), -np.inf)
+        candidate[0, cost:] = best[0, :size - cost] + made
+        candidate[1, cost:] = best[1, :size - cost] + line.gold_per_minute
+        better = (candidate[0] > cur[0] + 1e-9) | ((candidate[0] > cur[0] - 1e-9) &
+                                                   (candidate[1] > cur[1] + 1e-9))
+        cur[:, better] = candidate[:, better]
+        pick[better] = j
+    return cur, pick
+
+
+def _chosen(steps, target):
+    """[Line] of the cheapest mix in a chain of (options, best, pick) steps."""
+    reached = steps[-1][1][0] >= target - 1e-9
+    if not reached.any():
+        return None
+    c = int(np.argmax(reached))
+    lines = []
+    for options, _, pick in reversed(steps):
+        j = pick[c]
+        if j >= 0:
+            lines.append(options[j])
+            c -= options[j].machines
+    return sorted(lines, key=lambda line: line.recipe)
+
+
+def _budget(rules, rates, recipe, potions, gold):
+    """Table size for a subset with `recipe` in it: its own plan's machines
+    plus one, since no mix that may also use it needs more."""
+    return plan_line(rules, rates, recipe, potions, gold).machines + 1
+
+
+def _start(size):
+    """Knapsack table before any recipe: nothing made, at 0 machines only."""
+    best = np.full((2, size), -np.inf)
+    best[:, 0] = 0.0
+    return best
+
+
+def plan(rules, rates, unlocked, potions=None, gold=None, each=False):
+    """[Line] hitting the target with the fewest machines across the
+    unlocked recipes, or with `each`, the full target on every one."""
+    if not unlocked:
+        return []
+    if each:
+        return [plan_line(rules, rates, r, potions, gold) for r in sorted(unlocked)]
+    best = _start(min(_budget(rules, rates, r, potions, gold) for r in unlocked))
+    steps = []
+    for recipe in sorted(unlocked):
+        options = _options(rules, rates, recipe, potions, gold)
+        best, pick = _extend(best, options, potions)
+        steps.append((options, best, pick))
+    return _chosen(steps, potions if potions is not None else gold)
+
+
+# ── Batch ────────────────────────────────────────────────────────────
+
+def subsets(count):
+    """Every unlock subset as (bitmask, recipe indices), bit i = recipe i."""
+    for mask in range(1 << count):
+        yield mask, tuple(i for i in range(count) if mask >> i & 1)
+
+
+def plan_all(rules, rates, potions=None, gold=None, each=False):
+    """{bitmask: [Line]} answering the query for every unlock subset, bit
+    i = RECIPE_LIST[i]. Subsets sharing their lowest recipes share those
+    knapsack steps: a depth-first walk adds one recipe per level."""
+    count = len(rules.recipes)
+    if each:
+        lines = [plan_line(rules, rates, r, potions, gold) for r in range(count)]
+        return {mask: [lines[r] for r in unlocked] for mask, unlocked in subsets(count)}
+    target = potions if potions is not None else gold
+    options = [_options(rules, rates, r, potions, gold) for r in range(count)]
+    budgets = [_budget(rules, rates, r, potions, gold) for r in range(count)]
+    table = {0: []}
+    steps = []
+
+    def walk(mask, first):
+        for recipe in range(first, count):
+            best = steps[-1][1] if steps else _start(budgets[recipe])
+            new_best, pick = _extend(best[:, :budgets[recipe]], options[recipe], potions)
+            steps.append((options[recipe], new_best, pick))
+            table[mask | 1 << recipe] = _chosen(steps, target)
+            walk(mask | 1 << recipe, recipe + 1)
+            steps.pop()
+
+    walk(0, 0)
+    return table
@@ -0,0 +1,299 @@
+"""Frame-by-frame transcription of the machine scripts, used only by --check.
+
+Every frame runs each machine's _process() in placement order, then each
+Item's _process() in spawn order, with the same float timers (double
+precision) and Vector2.move_toward() positions (single precision) as the
+.gd files. Items added to the scene during a frame are not processed until
+the next one, as in Godot 4's process loop. It is slow on purpose: it is
+the ground truth the event-driven engine is compared against.
+"""
+
+import numpy as np
+
+from factory_sim.engine import BOTTLER, CAULDRON, DISPENSER, SELLER, SPLITTER, STORAGE
+from factory_sim.rules import parse_const
+
+F32 = np.float32
+CELL_SIZE = 64
+CMP_EPSILON = F32(0.00001)
+
+
+class RefItem:
+    def __init__(self, item_type, pos):
+        self.item_type = item_type
+        self.is_bottled = False
+        self.position = pos
+        self.target_position = pos
+        self.is_moving = False
+        self.move_speed = 120.0
+
+    def process(self, delta):
+        if not self.is_moving:
+            return
+        dx = self.target_position[0] - self.position[0]
+        dy = self.target_position[1] - self.position[1]
+        length = np.sqrt(dx * dx + dy * dy)
+        if length < 1.0:
+            self.position = self.target_position
+            self.is_moving = False
+            return
+        step = F32(self.move_speed * delta)
+        if length <= step or length < CMP_EPSILON:
+            self.position = self.target_position
+        else:
+            self.position = (self.position[0] + dx / length * step,
+                             self.position[1] + dy / length * step)
+
+    def move_to(self, pos, speed):
+        self.target_position = pos
+        self.move_speed = speed
+        self.is_moving = True
+
+
+class RefMachine:
+    def __init__(self, world, index, spec):
+        self.world = world
+        self.index = index
+        self.kind = spec.kind
+        self.grid_pos = (spec.x, spec.y)
+        self.direction = (spec.dx, spec.dy)
+        self.current_item = None
+        self.waiting = False
+        self.timer = 0.0
+        self.busy = False
+        self.stored = list(spec.stored_items) if spec.kind == STORAGE else []
+        self.ingredient_type = spec.ingredient_type
+        self.filter_type = spec.filter_type
+        self.result = 0
+        self.pending = 0
+        self.stage = 0
+        self.sell = None
+
+    # MachineBase
+    def output_pos(self, side=False):
+        (x, y), (dx, dy) = self.grid_pos, self.direction
+        return (x - dy, y + dx) if side else (x + dx, y + dy)
+
+    def target(self, side=False):
+        return self.world.machine_at(self.output_pos(side))
+
+    def push(self, item, speed=None):
+        target = self.target()
+        if target is None or target.current_item is not None or not target.receive_item(item):
+            return False
+        item.move_to(self.world.to_world(self.output_pos()), speed or self.world.belt_speed)
+        return True
+
+    def receive_item(self, item):
+        k = self.kind
+        r = self.world.rules
+        if self.current_item is not None:
+            return False
+        if k == CAULDRON and (self.busy or len(self.stored) >= r.max_ingredients):
+            return False
+        if k == STORAGE and (self.waiting or len(self.stored) >= r.max_stored):
+            return False
+        if k == SPLITTER and (self.waiting or self.stage != 0):
+            return False
+        if k in (BOTTLER, SELLER):
+            if self.busy or self.waiting or item.item_type not in r.potion_types:
+                return False
+            if k == BOTTLER and item.is_bottled:
+                return False
+        self.current_item = item
+        self.waiting = k > DISPENSER
+        return True
+
+    def spawn(self, item_type):
+        return self.world.spawn(item_type, self.world.to_world(self.grid_pos))
+
+    def process(self, delta):
+        getattr(self, "_process_%d" % self.kind)(delta)
+
+    def _pass_on(self, speed=None):
+        item = self.current_item
+        if item is not None and not item.is_moving and self.push(item, speed):
+            self.current_item = None
+
+    # ConveyorBelt / FastBelt
+    def _process_0(self, delta):
+        self._pass_on()
+
+    def _process_1(self, delta):
+        self._pass_on(self.world.fast_speed)
+
+    # Dispenser
+    def _process_2(self, delta):
+        self._pass_on()
+        self.timer += delta
+        if self.timer >= self.world.spawn_interval:
+            self.timer = 0.0
+            if self.current_item is None:
+                self.current_item = self.spawn(self.ingredient_type)
+
+    # Cauldron
+    def _process_3(self, delta):
+        if self.busy:
+            self.timer += delta
+            if self.timer >= self.world.brew_time:
+                self.busy = False
+                self.stored.clear()
+                self.current_item = self.spawn(self.result)
+            return
+        item = self.current_item
+        if self.waiting and item is not None and not item.is_moving:
+            self.waiting = False
+            self.current_item = None
+            self.stored.append(item.item_type)
+            if len(self.stored) >= self.world.rules.max_ingredients:
+                result = self.world.rules.recipe_for(self.stored[0], self.stored[1],
+                                                     self.world.unlocked)
+                if result is None:
+                    self.stored.clear()
+                else:
+                    self.result = result
+                    self.busy = True
+                    self.timer = 0.0
+            return
+        if item is not None and not item.is_moving and not self.waiting:
+            self._pass_on()
+
+    # StorageChest
+    def _process_4(self, delta):
+        item = self.current_item
+        if self.waiting and item is not None and not item.is_moving:
+            self.waiting = False
+            self.stored.append(item.item_type)
+            self.current_item = None
+            return
+        if self.current_item is None and self.stored and not self.waiting:
+            self.current_item = self.spawn(self.stored.pop(0))
+        if self.current_item is not None and not self.current_item.is_moving and not self.waiting:
+            self._pass_on()
+
+    # Splitter
+    def _hand_over(self, side):
+        target = self.target(side)
+        if target is None or target.current_item is not None:
+            return False
+        item = self.spawn(self.pending)
+        target.receive_item(item)
+        item.move_to(self.world.to_world(self.output_pos(side)), self.world.belt_speed)
+        return True
+
+    def _process_5(self, delta):
+        item = self.current_item
+        if self.waiting and item is not None and not item.is_moving:
+            self.waiting = False
+            self.pending = item.item_type
+            self.current_item = None
+            self.stage = 1
+            if self._hand_over(False):
+                self.stage = 2
+            return
+        if self.stage == 1:
+            if self._hand_over(False):
+                self.stage = 2
+        elif self.stage == 2:
+            if self._hand_over(True):
+                self.stage = 0
+
+    # Sorter
+    def _process_6(self, delta):
+        item = self.current_item
+        if item is None or item.is_moving:
+            return
+        self.waiting = False
+        side = not (self.filter_type == 0 or item.item_type == self.filter_type)
+        target = self.target(side)
+        if target is not None and target.current_item is None:
+            target.receive_item(item)
+            item.move_to(self.world.to_world(self.output_pos(side)), self.world.belt_speed)
+            self.current_item = None
+
+    # Bottler
+    def _process_7(self, delta):
+        if self.busy:
+            self.timer += delta
+            if self.timer >= self.world.bottle_time:
+                self.busy = False
+                self.current_item.is_bottled = True
+            return
+        item = self.current_item
+        if self.waiting and item is not None and not item.is_moving:
+            self.waiting = False
+            self.busy = True
+            self.timer = 0.0
+            return
+        if item is not None and not item.is_moving and not self.waiting:
+            self._pass_on()
+
+    # AutoSeller
+    def _process_8(self, delta):
+        if self.busy:
+            self.timer += delta
+            if self.timer >= self.world.sell_time:
+                self.busy = False
+                self.world.sell(*self.sell)
+            return
+        item = self.current_item
+        if self.waiting and item is not None and not item.is_moving:
+            self.waiting = False
+            self.sell = (item.item_type, item.is_bottled)
+            self.current_item = None
+            self.busy = True
+            self.timer = 0.0
+
+
+class ReferenceWorld:
+    """The scene tree for one layout: machines, then items, every frame."""
+
+    def __init__(self, layout, rules, scripts_dir=None):
+        from factory_sim.rules import SCRIPTS, _read
+        scripts_dir = scripts_dir or SCRIPTS
+
+        def const(path, name):
+            return float(parse_const(_read(path, scripts_dir), name))
+
+        self.rules = rules
+        self.unlocked = set(layout.unlocked_recipes)
+        self.belt_speed = const("items/item.gd", "DEFAULT_SPEED")
+        self.fast_speed = const("machines/fast_belt.gd", "FAST_SPEED")
+        self.spawn_interval = const("machines/dispenser.gd", "SPAWN_INTERVAL")
+        self.brew_time = const("machines/cauldron.gd", "BREW_TIME")
+        self.bottle_time = const("machines/bottler.gd", "BOTTLE_TIME")
+        self.sell_time = const("machines/auto_seller.gd", "SELL_TIME")
+        self.delta = 1.0 / rules.fps
+        self.layout = layout
+        self.machines = [RefMachine(self, i, m) for i, m in enumerate(layout.machines)]
+        self.items = []
+        self.frame = 0
+        self.gold = 0
+        self.sales = []  # (frame, potion type, bottled)
+
+    def machine_at(self, pos):
+        i = self.layout.machine_at(*pos)
+        return self.machines[i] if i >= 0 else None
+
+    def to_world(self, pos):
+        return (F32(pos[0] * CELL_SIZE + CELL_SIZE / 2), F32(pos[1] * CELL_SIZE + CELL_SIZE / 2))
+
+    def spawn(self, item_type, pos):
+        item = RefItem(item_type, pos)
+        self.items.append(item)
+        return item
+
+    def sell(self, potion_type, bottled):
+        self.gold += self.rules.price(potion_type, bottled)
+        self.sales.append((self.frame, potion_type, bottled))
+
+    def step(self):
+        self.frame += 1
+        items = list(self.items)  # Nodes added this frame wait for the next one
+        for m in self.machines:
+            m.process(self.delta)
+        for item in items:
+            item.process(self.delta)
+        # Drop items no machine holds any more (queue_free()d or sold)
+        held = {id(m.current_item) for m in self.machines if m.current_item is not None}
+        self.items = [item for item in self.items if id(item) in held or item.is_moving]
@@ -0,0 +1,185 @@
+"""Game rules read from the .gd sources, converted to whole frames.
+
+Every timing constant the simulator needs is parsed from the script that
+owns it, so retuning a machine in GDScript retunes the simulator too:
+
+  GridManager   CELL_SIZE, GRID_WIDTH, GRID_HEIGHT
+  Item          DEFAULT_SPEED
+  FastBelt      FAST_SPEED
+  Dispenser     SPAWN_INTERVAL
+  Cauldron      BREW_TIME, MAX_INGREDIENTS
+  Bottler       BOTTLE_TIME
+  AutoSeller    SELL_TIME
+  StorageChest  MAX_STORED
+  GameState     PRICE_BY_RECIPE
+  ItemTypes     Type, is_potion()
+
+Recipes come from RECIPE_LIST via gen_recipe_table.py. Everything is read
+from the scripts_dir passed to load_rules().
+
+The game runs its timers as `timer += delta; if timer >= LIMIT` in double
+precision, and items step with Vector2.move_toward() in single precision
+until they are under 1 px from the target. At a fixed frame rate both are
+whole frame counts, computed here once by replaying that arithmetic (at
+60 fps the 3.0 s spawn interval is 181 frames, not 180).
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from gen_recipe_table import ITEM_TYPES, load_sources
+
+SCRIPTS = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+DEFAULT_FPS = 60
+DEFAULT_PRICE = 5  # GameState.get_potion_price() for potions with no price
+
+# (script relative to scripts/, constant) for every number the simulator reads
+CONSTANTS = {
+    "CELL_SIZE": ("grid_manager.gd", "CELL_SIZE"),
+    "GRID_WIDTH": ("grid_manager.gd", "GRID_WIDTH"),
+    "GRID_HEIGHT": ("grid_manager.gd", "GRID_HEIGHT"),
+    "BELT_SPEED": ("items/item.gd", "DEFAULT_SPEED"),
+    "FAST_SPEED": ("machines/fast_belt.gd", "FAST_SPEED"),
+    "SPAWN_INTERVAL": ("machines/dispenser.gd", "SPAWN_INTERVAL"),
+    "BREW_TIME": ("machines/cauldron.gd", "BREW_TIME"),
+    "MAX_INGREDIENTS": ("machines/cauldron.gd", "MAX_INGREDIENTS"),
+    "BOTTLE_TIME": ("machines/bottler.gd", "BOTTLE_TIME"),
+    "SELL_TIME": ("machines/auto_seller.gd", "SELL_TIME"),
+    "MAX_STORED": ("machines/storage_chest.gd", "MAX_STORED"),
+}
+
+
+# ── Parsing ──────────────────────────────────────────────────────────
+
+def _read(relpath, scripts_dir):
+    with open(os.path.join(scripts_dir, relpath)) as f:
+        return f.read()
+
+
+def parse_const(src, name):
+    """Value of `const NAME := 1.5` (or `const NAME: float = 1.5`) as int or float."""
+    match = re.search(r"^const\s+%s\s*(?::\s*\w+\s*)?:?=\s*(-?[\d.]+)" % name, src, re.M)
+    if match is None:
+        raise SystemExit(f"const {name} not found")
+    text = match.group(1)
+    return float(text) if "." in text else int(text)
+
+
+def parse_potion_types(src, enum):
+    """ItemTypes.is_potion() as a set of Type values: `return type >= Type.X`."""
+    match = re.search(r"func\s+is_potion\b.*?return\s+\w+\s*>=\s*Type\.(\w+)", src, re.S)
+    if match is None:
+        raise SystemExit("ItemTypes.is_potion() not found")
+    first = enum[match.group(1)]
+    return frozenset(value for value in enum.values() if value >= first)
+
+
+def parse_int_array(src, name):
+    """Values of `const NAME: Array = [1, 2, 3]`."""
+    match = re.search(r"^const\s+%s\b[^=]*=\s*\[([^\]]*)\]" % name, src, re.M)
+    if match is None:
+        raise SystemExit(f"const {name} not found")
+    return [int(v) for v in re.findall(r"-?\d+", re.sub(r"#[^\n]*", "", match.group(1)))]
+
+
+# ── Frame Conversion ─────────────────────────────────────────────────
+
+def timer_frames(limit, fps):
+    """Frames until `timer += delta` first reaches limit (the game's double math)."""
+    delta = 1.0 / fps
+    timer = 0.0
+    frames = 0
+    while timer < limit:
+        timer += delta
+        frames += 1
+    return frames
+
+
+def move_frames(distance, speed, fps):
+    """Frames an Item spends moving `distance` px: move_toward() steps in
+    float32 until the remaining distance is under 1 px."""
+    step = np.float32(speed * (1.0 / fps))
+    remaining = np.float32(distance)
+    frames = 0
+    while remaining >= 1.0:
+        remaining = np.float32(0.0) if remaining <= step else np.float32(remaining - step)
+        frames += 1
+    return frames
+
+
+# ── Rules ────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Rules:
+    """Everything the simulator needs, timings in frames at `fps`."""
+    fps: int
+    width: int
+    height: int
+    cell_size: int       # px
+    belt_speed: float    # px/s, Item.DEFAULT_SPEED
+    fast_speed: float
+    belt_travel: int     # frames from a push until the target sees the item arrive
+    fast_travel: int
+    spawn_frames: int
+    brew_frames: int
+    bottle_frames: int
+    sell_frames: int
+    max_ingredients: int
+    max_stored: int
+    recipes: tuple       # RECIPE_LIST as ((a, b, result), ...)
+    potion_types: frozenset
+    prices: dict         # potion type → base sell price
+
+    def recipe_index(self, a, b):
+        """RECIPE_LIST index for ingredients a, b in either order, or None
+        (RecipeTable.LOOKUP: a later duplicate pair wins)."""
+        found = None
+        for index, (x, y, _) in enumerate(self.recipes):
+            if (x, y) in ((a, b), (b, a)):
+                found = index
+        return found
+
+    def recipe_for(self, a, b, unlocked):
+        """Cauldron result for ingredients a, b, or None (Recipes.check)."""
+        index = self.recipe_index(a, b)
+        return self.recipes[index][2] if index is not None and index in unlocked else None
+
+    def price(self, potion_type, bottled):
+        price = self.prices.get(potion_type, DEFAULT_PRICE)
+        return price * 2 if bottled else price
+
+
+def load_rules(fps=DEFAULT_FPS, scripts_dir=SCRIPTS):
+    """Rules parsed from the .gd sources under scripts_dir."""
+    c = {key: parse_const(_read(path, scripts_dir), name) for key, (path, name) in CONSTANTS.items()}
+    enum, recipes = load_sources(scripts_dir)
+    potion_types = parse_potion_types(_read(ITEM_TYPES, scripts_dir), enum)
+    price_list = parse_int_array(_read("game_state.gd", scripts_dir), "PRICE_BY_RECIPE")
+    prices = {}
+    for i, (_, _, result) in enumerate(recipes):
+        if i < len(price_list):
+            prices[result] = price_list[i]
+    # A pushed item moves from one frame to the next, then is seen one frame
+    # after it stops (items process after machines in the scene tree)
+    return Rules(
+        fps=fps,
+        width=c["GRID_WIDTH"],
+        height=c["GRID_HEIGHT"],
+        cell_size=c["CELL_SIZE"],
+        belt_speed=float(c["BELT_SPEED"]),
+        fast_speed=float(c["FAST_SPEED"]),
+        belt_travel=move_frames(c["CELL_SIZE"], c["BELT_SPEED"], fps) + 1,
+        fast_travel=move_frames(c["CELL_SIZE"], c["FAST_SPEED"], fps) + 1,
+        spawn_frames=timer_frames(c["SPAWN_INTERVAL"], fps),
+        brew_frames=timer_frames(c["BREW_TIME"], fps),
+        bottle_frames=timer_frames(c["BOTTLE_TIME"], fps),
+        sell_frames=timer_frames(c["SELL_TIME"], fps),
+        max_ingredients=c["MAX_INGREDIENTS"],
+        max_stored=c["MAX_STORED"],
+        recipes=tuple(recipes),
+        potion_types=potion_types,
+        prices=prices,
+    )
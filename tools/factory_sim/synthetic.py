@@ -0,0 +1,136 @@
+"""Synthetic layouts: a tiled full grid for benchmarks, random ones for --check."""
+
+import random
+
+from factory_sim.layout import KIND, Layout, Machine
+
+R, D, L, U = (1, 0), (0, 1), (-1, 0), (0, -1)
+
+# One 6x5 production tile, a machine letter plus its direction per cell.
+# Two dispensers feed a cauldron; the potion runs back along row 2, through
+# a bottler and into a seller. Row 4 is a dispenser -> fast belt -> chest
+# spur into the same seller, which refuses ingredients, so it fills up and
+# stalls. Dispenser "A" makes the tile recipe's first ingredient, "B" its
+# second.
+MODULE = [
+    "A> c> c> c> c> cv",
+    "B> c> c> c> c> Cv",
+    "cv c< c< c< c< c<",
+    "T> c> c> c> c> cv",
+    "A> F> F> F> H> $>",
+]
+MODULE_W, MODULE_H = 6, len(MODULE)
+
+LETTERS = {"c": "conveyor", "F": "fast_belt", "A": "dispenser", "B": "dispenser",
+           "C": "cauldron", "H": "storage", "T": "bottler", "$": "auto_seller"}
+ARROWS = {">": R, "v": D, "<": L, "^": U}
+
+
+def _module_cells():
+    """[(x, y, type, (dir_x, dir_y), ingredient slot or None)] for MODULE."""
+    cells = []
+    for y, row in enumerate(MODULE):
+        for x, (letter, arrow) in enumerate(row.split()):
+            cells.append((x, y, LETTERS[letter], ARROWS[arrow], {"A": 0, "B": 1}.get(letter)))
+    return cells
+
+
+def tiled_layout(rules, width=None, height=None, recipes=None):
+    """Every cell of a width x height grid (default: the game's) filled with
+    MODULE tiles; tile k brews recipe recipes[k % len(recipes)]."""
+    width = width or rules.width
+    height = height or rules.height
+    recipes = list(recipes if recipes is not None else range(len(rules.recipes)))
+    cells = _module_cells()
+    machines = []
+    tiles = 0
+    for oy in range(0, height - MODULE_H + 1, MODULE_H):
+        for ox in range(0, width - MODULE_W + 1, MODULE_W):
+            a, b, _ = rules.recipes[recipes[tiles % len(recipes)]]
+            for x, y, kind, (dx, dy), slot in cells:
+                machines.append(Machine(KIND[kind], ox + x, oy + y, dx, dy,
+                                        ingredient_type=(a, b)[slot] if slot is not None else 0))
+            tiles += 1
+    return Layout(width, height, machines, tuple(recipes))
+
+
+def random_layout(rules, seed, width=12, height=10, lines=16):
+    """A random layout for engine/reference parity checks. Each line is a
+    pair of dispensers (usually a recipe's two ingredients) feeding a
+    random walk of belts with other machine types dropped along the way,
+    ending in a seller; lines merge where they run into each other."""
+    rng = random.Random(seed)
+    unlocked = tuple(sorted(rng.sample(range(len(rules.recipes)), rng.randint(1, 3))))
+    ingredients = sorted({t for a, b, _ in rules.recipes for t in (a, b)})
+    types = sorted(set(ingredients) | set(rules.potion_types))
+    along = ["cauldron", "cauldron", "storage", "splitter", "sorter", "bottler", "bottler",
+             "fast_belt", "auto_seller"]
+    taken = {}
+
+    def place(kind, x, y, dx, dy):
+        m = taken[(x, y)] = Machine(KIND[kind], x, y, dx, dy)
+        if kind == "sorter":
+            m.filter_type = rng.choice([0] + types)
+        elif kind == "storage" and rng.random() < 0.5:
+            m.stored_items = [rng.choice(types) for _ in range(rng.randint(1, rules.max_stored))]
+        return m
+
+    for _ in range(lines):
+        pair = list(rules.recipes[rng.choice(unlocked)][:2])
+        if rng.random() < 0.1:
+            pair[1] = rng.choice(ingredients)  # Exercise discarded brews too
+        free = [(x, y) for x in range(width) for y in range(height) if (x, y) not in taken]
+        if not free:
+            break
+        x, y = rng.choice(free)
+        dx, dy = rng.choice([R, D, L, U])
+        last = None
+        for step in range(rng.randint(4, 16)):
+            if (x, y) in taken:
+                break
+            if step and rng.random() < 0.2:
+                dx, dy = rng.choice([R, D, L, U])
+            if step == 0:
+                kind = "dispenser"
+            elif step == 2 and rng.random() < 0.7:
+                kind = "cauldron"  # Brew what the two dispensers make
+            else:
+                kind = rng.choice(along) if rng.random() < 0.2 else "conveyor"
+            last = place(kind, x, y, dx, dy)
+            if step == 0:
+                last.ingredient_type = pair[0]
+            elif step == 1:
+                # Second dispenser beside the first belt, pushing into it
+                sx, sy = x - dy, y + dx
+                if 0 <= sx < width and 0 <= sy < height and (sx, sy) not in taken:
+                    place("dispenser", sx, sy, dy, -dx).ingredient_type = pair[1]
+            x, y = x + dx, y + dy
+            if not (0 <= x < width and 0 <= y < height):
+                break
+        if last is not None and last.type == "conveyor":
+            last.kind = KIND["auto_seller"]
+    machines = list(taken.values())
+    rng.shuffle(machines)  # Placement order matters; don't make it path order
+    return Layout(width, height, machines, unlocked)
+
+
+def splitter_layouts(rules, recipe=0):
+    """[(name, Layout)]: one line of RECIPE_LIST[recipe] whose potions pass
+    a splitter, once per thing on its side cell. Splitter sales depend on
+    that cell, so these pin max-flow bounds from both sides."""
+    a, b, _ = rules.recipes[recipe]
+    line = [("dispenser", 0, 0, R, a), ("conveyor", 1, 0, R, 0), ("dispenser", 1, 1, U, b),
+            ("cauldron", 2, 0, R, 0), ("conveyor", 3, 0, R, 0), ("splitter", 4, 0, R, 0),
+            ("conveyor", 5, 0, R, 0), ("auto_seller", 6, 0, R, 0)]
+    sides = {
+        "empty side": [],
+        "dead-end side": [("conveyor", 4, 1, D, 0)],
+        "seller side": [("auto_seller", 4, 1, D, 0)],
+        "belt to seller": [("conveyor", 4, 1, D, 0), ("auto_seller", 4, 2, D, 0)],
+    }
+    layouts = []
+    for name, side in sides.items():
+        machines = [Machine(KIND[kind], x, y, dx, dy, ingredient_type=ingredient)
+                    for kind, x, y, (dx, dy), ingredient in line + side]
+        layouts.append((f"splitter, {name}", Layout(8, 4, machines, (recipe,))))
+    return layouts
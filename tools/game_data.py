@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Single source for item and machine data: tools/game_data.json.
+
+Usage:
+    python3 tools/game_data.py           # rewrite the generated .gd blocks
+    python3 tools/game_data.py --check   # exit 1 if any block is stale
+
+game_data.json lists every item (enum id, display name, kind, color, sprite
+paths) and every machine (key, sprite path). From it this tool writes the
+GDScript const tables that used to be kept in sync by hand: the ItemTypes
+enum, COLORS, NAMES, INGREDIENTS and sprite path tables, and the machine and
+potion sprite path tables duplicated across scripts that avoid
+cross-referencing class_name constants. generate_sprites.py reads the same
+file for which sprites to draw, where to write them and the potion colors.
+
+Generated code sits between marker comments and is replaced wholesale:
+
+    # BEGIN GENERATED <NAME> (tools/game_data.py; edit tools/game_data.json)
+    ...
+    # END GENERATED <NAME>
+
+Item order is enum order. Ingredients must come before potions
+(ItemTypes.is_potion relies on it); load_data() rejects anything else.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from pack_atlas import write_if_changed
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+SCRIPTS = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+RES_PREFIX = "res://assets/sprites/"
+KINDS = ["ingredient", "potion"]
+COMMENT_COLUMN = 48  # trailing color comments line up here, as in item_types.gd
+
+
+# ── Data ─────────────────────────────────────────────────────────────
+
+def load_data(path=DATA_PATH):
+    """Parsed game_data.json, validated."""
+    with open(path) as f:
+        data = json.load(f)
+    ids = [item["id"] for item in data["items"]]
+    if len(set(ids)) != len(ids) or "NONE" in ids:
+        raise SystemExit(f"{path}: item ids must be unique and not NONE")
+    kinds = [KINDS.index(item["kind"]) for item in data["items"]]
+    if kinds != sorted(kinds):
+        raise SystemExit(f"{path}: every ingredient must come before every potion")
+    for item in potions(data):
+        if "bottled_sprite" not in item:
+            raise SystemExit(f"{path}: potion {item['id']} has no bottled_sprite")
+    keys = [machine["id"] for machine in data["machines"]]
+    if len(set(keys)) != len(keys):
+        raise SystemExit(f"{path}: machine ids must be unique")
+    return data
+
+
+def ingredients(data):
+    return [item for item in data["items"] if item["kind"] == "ingredient"]
+
+
+def potions(data):
+    return [item for item in data["items"] if item["kind"] == "potion"]
+
+
+def type_values(data):
+    """{item id: ItemTypes.Type value}; NONE is 0."""
+    return {item["id"]: i for i, item in enumerate(data["items"], 1)}
+
+
+def res_path(relpath):
+    return RES_PREFIX + relpath
+
+
+# ── GDScript Rendering ───────────────────────────────────────────────
+
+def gd_dict(name, entries, type_hint="Dictionary"):
+    """const NAME: Dictionary = {...} from (key, value[, comment]) rows or "# section" strings."""
+    lines = [f"const {name}: {type_hint} = {{"]
+    for entry in entries:
+        if isinstance(entry, str):
+            lines.append(f"\t{entry}")
+            continue
+        key, value, *comment = entry
+        line = f"\t{key}: {value},"
+        if comment:
+            line = line.ljust(COMMENT_COLUMN - 1) + f" # {comment[0]}"
+        lines.append(line)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def by_kind(items, row):
+    """Rows for items grouped under "# Ingredients" / "# Potions" section comments."""
+    rows = []
+    for kind in KINDS:
+        group = [item for item in items if item["kind"] == kind]
+        if group:
+            rows.append(f"# {kind.capitalize()}s")
+            rows += [row(item) for item in group]
+    return rows
+
+
+def gd_color(rgb):
+    return "Color(%s)" % ", ".join(repr(float(c)) for c in rgb)
+
+
+def render_item_types(data, name):
+    """ItemTypes: enum Type plus its per-type const tables."""
+    values = type_values(data)
+    enum = ["enum Type {", "\tNONE = 0,"]
+    for kind in KINDS:
+        group = [item for item in data["items"] if item["kind"] == kind]
+        enum.append(f"\t# {kind.capitalize()}s ({values[group[0]['id']]}–{values[group[-1]['id']]})")
+        enum += [f"\t{item['id']}," for item in group]
+    enum.append("}")
+
+    names = [("Type.NONE", '"None"')] + [(f"Type.{item['id']}", json.dumps(item["name"]))
+                                         for item in data["items"]]
+    ingredient_ids = [f"\tType.{item['id']}," for item in ingredients(data)]
+    return "\n".join([
+        "# Item type enum — all ingredients MUST come before all potions (is_potion relies on this)",
+        "\n".join(enum),
+        "",
+        "# Display colors for each item type (used by _draw)",
+        gd_dict("COLORS", by_kind(data["items"], lambda item: (
+            f"Type.{item['id']}", gd_color(item["color"]), item["color_note"]))),
+        "",
+        "# Display names",
+        gd_dict("NAMES", names),
+        "",
+        f"# All {len(ingredient_ids)} ingredients (full list — dispenser uses "
+        "get_available_ingredients() for filtering)",
+        "const INGREDIENTS: Array = [\n" + "\n".join(ingredient_ids) + "\n]",
+        "",
+        "# Sprite texture paths per item type",
+        gd_dict("SPRITE_PATHS", by_kind(data["items"], lambda item: (
+            f"Type.{item['id']}", json.dumps(res_path(item["sprite"]))))),
+        "",
+        "# Pre-composited bottled potion sprites (potion + bottle overlay, see",
+        "# tools/generate_sprites.py), so a bottled item stays a single Sprite2D",
+        gd_dict("BOTTLED_SPRITE_PATHS", [(f"Type.{item['id']}", json.dumps(res_path(item["bottled_sprite"])))
+                                         for item in potions(data)]),
+    ])
+
+
+def render_machine_paths(data, name):
+    """Machine key → sprite path."""
+    return gd_dict(name, [(json.dumps(m["id"]), json.dumps(res_path(m["sprite"])))
+                          for m in data["machines"]])
+
+
+def render_potion_paths(data, name):
+    """Potion type value → sprite path, for scripts that can't use ItemTypes.Type."""
+    values = type_values(data)
+    return gd_dict(name, [(values[item["id"]], json.dumps(res_path(item["sprite"])))
+                          for item in potions(data)])
+
+
+# Script (relative to scripts/) → {block name: renderer}
+BLOCKS = {
+    "data/item_types.gd": {"ITEM_TYPES": render_item_types},
+    "machines/machine_base.gd": {"SPRITE_PATHS": render_machine_paths},
+    "game_world.gd": {"MACHINE_SPRITE_PATHS": render_machine_paths},
+    "ui/toolbar.gd": {"MACHINE_SPRITE_PATHS": render_machine_paths},
+    "ui/unlock_shop.gd": {"MACHINE_SPRITE_PATHS": render_machine_paths,
+                          "POTION_SPRITE_PATHS": render_potion_paths},
+    "ui/order_panel.gd": {"POTION_SPRITE_PATHS": render_potion_paths},
+}
+
+
+# ── Block Replacement ────────────────────────────────────────────────
+
+def begin_marker(name):
+    return f"# BEGIN GENERATED {name} (tools/game_data.py; edit tools/game_data.json)"
+
+
+def end_marker(name):
+    return f"# END GENERATED {name}"
+
+
+def replace_block(src, name, body, path):
+    """src with the named generated block's contents replaced by body."""
+    pattern = re.compile(r"^# BEGIN GENERATED %s\b[^\n]*\n.*?^# END GENERATED %s$" % (name, name),
+                         re.S | re.M)
+    if not pattern.search(src):
+        raise SystemExit(f"{path}: no generated block {name}")
+    block = f"{begin_marker(name)}\n{body}\n{end_marker(name)}"
+    return pattern.sub(lambda _: block, src, count=1)
+
+
+def render_scripts(data, scripts_dir=SCRIPTS):
+    """{script path: (current source, generated source)} for every script in BLOCKS."""
+    result = {}
+    for relpath, blocks in BLOCKS.items():
+        path = os.path.join(scripts_dir, relpath)
+        with open(path) as f:
+            src = f.read()
+        new = src
+        for name, render in blocks.items():
+            new = replace_block(new, name, render(data, name), relpath)
+        result[path] = (src, new)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate .gd const tables from game_data.json.")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if any generated block is out of date instead of writing")
+    args = parser.parse_args(argv)
+
+    data = load_data()
+    stale = 0
+    for path, (src, new) in render_scripts(data).items():
+        if src == new:
+            continue
+        stale += 1
+        if args.check:
+            print(f"  {os.path.relpath(path)} is stale; rerun tools/game_data.py")
+        elif write_if_changed(path, new.encode()):
+            print(f"  {os.path.relpath(path)}")
+    if args.check and stale:
+        sys.exit(1)
+    print(f"{'OK' if args.check else 'Done!'} {len(data['items'])} items, "
+          f"{len(data['machines'])} machines, {len(BLOCKS)} scripts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Generate the dense recipe lookup table used by Recipes.check().
+
+Usage:
+    python3 tools/gen_recipe_table.py           # write scripts/data/recipe_table.gd
+    python3 tools/gen_recipe_table.py --check   # exit 1 if stale or wrong
+
+Parses the ItemTypes.Type enum (scripts/data/item_types.gd) and RECIPE_LIST
+(scripts/data/recipes.gd) and writes RecipeTable.LOOKUP: a PackedInt32Array
+of TYPE_COUNT x TYPE_COUNT entries where LOOKUP[a * TYPE_COUNT + b] is the
+index into RECIPE_LIST for ingredients a and b (either order), or -1.
+Recipes.check() then costs one array read instead of formatting a string
+key and hashing it into a Dictionary.
+
+--check reads TYPE_COUNT, NO_RECIPE and LOOKUP back out of the
+recipe_table.gd on disk and runs Recipes.check()'s lookup on them for all
+TYPE_COUNT x TYPE_COUNT ingredient pairs, both orders, comparing each
+result with a brute-force scan of RECIPE_LIST (the last matching recipe
+wins, as the old Dictionary did). It also fails if the file is stale.
+Rerun after editing RECIPE_LIST or the enum.
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from pack_atlas import write_if_changed
+
+SCRIPTS = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+ITEM_TYPES = os.path.join("data", "item_types.gd")  # relative to scripts/
+RECIPES = os.path.join("data", "recipes.gd")
+TABLE_PATH = os.path.join(SCRIPTS, "data", "recipe_table.gd")
+NO_RECIPE = -1
+
+
+# ── Parsing ──────────────────────────────────────────────────────────
+
+def strip_comments(src):
+    return re.sub(r"#[^\n]*", "", src)
+
+
+def parse_enum(src, name="Type"):
+    """{member: value} of a GDScript enum, following implicit numbering."""
+    body = re.search(r"enum\s+%s\s*\{(.*?)\}" % name, strip_comments(src), re.S)
+    if body is None:
+        raise SystemExit(f"enum {name} not found")
+    members = {}
+    value = 0
+    for entry in body.group(1).split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        member, _, explicit = entry.partition("=")
+        if explicit.strip():
+            value = int(explicit.strip())
+        members[member.strip()] = value
+        value += 1
+    return members
+
+
+def parse_recipes(src, enum):
+    """RECIPE_LIST as [(a, b, result), ...] of enum values."""
+    body = re.search(r"const\s+RECIPE_LIST[^=]*=\s*\[(.*?)\n\]", strip_comments(src), re.S)
+    if body is None:
+        raise SystemExit("RECIPE_LIST not found")
+    recipes = []
+    for row in re.findall(r"\[([^\[\]]*)\]", body.group(1)):
+        names = re.findall(r"ItemTypes\.Type\.(\w+)", row)
+        if len(names) != 3:
+            raise SystemExit(f"unexpected RECIPE_LIST row: [{row.strip()}]")
+        recipes.append(tuple(enum[n] for n in names))
+    return recipes
+
+
+def load_sources(scripts_dir=SCRIPTS):
+    """(enum, recipes) parsed from the .gd sources under scripts_dir."""
+    with open(os.path.join(scripts_dir, ITEM_TYPES)) as f:
+        enum = parse_enum(f.read())
+    with open(os.path.join(scripts_dir, RECIPES)) as f:
+        recipes = parse_recipes(f.read(), enum)
+    return enum, recipes
+
+
+# ── Table ────────────────────────────────────────────────────────────
+
+def type_count(enum):
+    return max(enum.values()) + 1
+
+
+def build_table(recipes, n):
+    """Flat n*n list of recipe indices (NO_RECIPE where none), symmetric in a, b."""
+    table = [NO_RECIPE] * (n * n)
+    for i, (a, b, _) in enumerate(recipes):
+        table[a * n + b] = i
+        table[b * n + a] = i
+    return table
+
+
+def scan_recipes(recipes, a, b):
+    """Index of the last RECIPE_LIST entry brewed from a and b, or NO_RECIPE."""
+    found = NO_RECIPE
+    for i, (x, y, _) in enumerate(recipes):
+        if (x, y) in ((a, b), (b, a)):
+            found = i
+    return found
+
+
+def parse_table_gd(src):
+    """(TYPE_COUNT, NO_RECIPE, LOOKUP) as written in recipe_table.gd."""
+    consts = dict(re.findall(r"^const\s+(TYPE_COUNT|NO_RECIPE)\s*:=\s*(-?\d+)", src, re.M))
+    body = re.search(r"^const\s+LOOKUP\b[^=]*=\s*PackedInt32Array\(\[(.*?)\]\)", src, re.M | re.S)
+    if len(consts) != 2 or body is None:
+        raise SystemExit("recipe_table.gd: TYPE_COUNT, NO_RECIPE or LOOKUP not found")
+    lookup = [int(v) for v in re.findall(r"-?\d+", strip_comments(body.group(1)))]
+    return int(consts["TYPE_COUNT"]), int(consts["NO_RECIPE"]), lookup
+
+
+def check_gd(src, enum, recipes):
+    """Mismatches between Recipes.check() reading the generated table in
+    src (every recipe unlocked) and a scan of RECIPE_LIST, as strings."""
+    n, no_recipe, lookup = parse_table_gd(src)
+    if n != type_count(enum):
+        return [f"TYPE_COUNT is {n}, the enum has {type_count(enum)} types"]
+    if len(lookup) != n * n:
+        return [f"LOOKUP has {len(lookup)} entries, not {n} x {n}"]
+    errors = []
+    for a in range(n):
+        for b in range(n):
+            # Recipes.check(): one table read, then RECIPE_LIST[index][2]
+            index = lookup[a * n + b]
+            got = "none" if index == no_recipe else recipes[index][2]
+            want = scan_recipes(recipes, a, b)
+            want = "none" if want == NO_RECIPE else recipes[want][2]
+            if got != want:
+                errors.append(f"check({a}, {b}): table gives {got}, RECIPE_LIST {want}")
+    return errors
+
+
+def render_gd(table, n):
+    rows = []
+    for a in range(n):
+        rows.append("\t" + ", ".join(str(v) for v in table[a * n:(a + 1) * n]) + ",")
+    return (
+        "class_name RecipeTable\n"
+        "## Dense recipe lookup for Recipes.check().\n"
+        "##\n"
+        "## GENERATED by tools/gen_recipe_table.py from ItemTypes.Type and\n"
+        "## Recipes.RECIPE_LIST. Do not edit; rerun the tool after changing either.\n"
+        "##\n"
+        "## LOOKUP[a * TYPE_COUNT + b] is the RECIPE_LIST index brewed from\n"
+        "## ingredients a and b (in either order), or NO_RECIPE.\n"
+        "\n"
+        f"const TYPE_COUNT := {n}\n"
+        f"const NO_RECIPE := {NO_RECIPE}\n"
+        "\n"
+        "const LOOKUP: PackedInt32Array = PackedInt32Array([\n"
+        + "\n".join(rows) + "\n"
+        "])\n"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate RecipeTable (recipe_table.gd).")
+    parser.add_argument("--check", action="store_true",
+                        help="verify the table and the file on disk instead of writing")
+    args = parser.parse_args(argv)
+
+    enum, recipes = load_sources()
+    n = type_count(enum)
+    data = render_gd(build_table(recipes, n), n).encode()
+
+    if args.check:
+        try:
+            with open(TABLE_PATH, "rb") as f:
+                current = f.read()
+        except FileNotFoundError:
+            print(f"  {os.path.relpath(TABLE_PATH)} is missing; run tools/gen_recipe_table.py")
+            sys.exit(1)
+        errors = check_gd(current.decode(), enum, recipes)
+        for error in errors:
+            print(f"  MISMATCH {error}")
+        if current != data:
+            print(f"  {os.path.relpath(TABLE_PATH)} is stale; rerun tools/gen_recipe_table.py")
+        if errors or current != data:
+            sys.exit(1)
+        print(f"OK: {len(recipes)} recipes, {n * n} pairs of {os.path.relpath(TABLE_PATH)} "
+              f"match a scan of RECIPE_LIST.")
+        return
+    errors = check_gd(data.decode(), enum, recipes)
+    for error in errors:
+        print(f"  MISMATCH {error}")
+    if errors:
+        sys.exit(1)
+    if write_if_changed(TABLE_PATH, data):
+        print(f"  {os.path.relpath(TABLE_PATH)}")
+    print(f"Done! {len(recipes)} recipes in a {n}x{n} table.")
+
+
+if __name__ == "__main__":
+    main()
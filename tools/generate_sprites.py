@@ -6,6 +6,7 @@ Output structure:
   assets/sprites/machines/{type}.png         (9 files, 64x64)
   assets/sprites/items/{name}.png            (30 files, 20x20)
   assets/sprites/items/bottle_overlay.png    (20x20)
+  assets/sprites/items/{potion}_bottled.png  (10 files, 20x20: potion + overlay)
   assets/sprites/player/player_spritesheet.png (128x192: 4 cols x 4 rows, 32x48)
   assets/sprites/ui/wood_panel.png           (48x48, 9-slice wood panel)
   assets/sprites/ui/wood_panel_dark.png      (48x48, darker variant)
@@ -15,17 +16,93 @@ Output structure:
   assets/sprites/ui/button_wood.png          (32x16, 9-slice button normal)
   assets/sprites/ui/button_wood_hover.png    (32x16, button hover)
   assets/sprites/ui/button_wood_pressed.png  (32x16, button pressed)
+  assets/sprites/atlas/sprites_0.png         (items + machines, see pack_atlas.py)
+  assets/sprites/anim/{name}.png             (64px-frame animation strips)
+  assets/sprites/anim/animations.json        (frame count / fps / loop per strip)
+
+Usage:
+    python3 tools/generate_sprites.py            # serial
+    python3 tools/generate_sprites.py --jobs 4   # render across 4 processes
+    python3 tools/generate_sprites.py --jobs 0   # one process per CPU core
+    python3 tools/generate_sprites.py --force    # ignore the build cache
+    python3 tools/generate_sprites.py --backend numpy  # vectorized raster backend
+    python3 tools/generate_sprites.py --palette shared  # palette-indexed PNGs
+    python3 tools/generate_sprites.py --force --profile build/sprites  # timing report
+    python3 tools/generate_sprites.py --watch    # rebuild on every save of this file
+
+Which items and machines get sprites, their output paths and the potion
+colors come from tools/game_data.json (see game_data.py), the same file the
+game's ItemTypes and sprite path tables are generated from.
+
+Builds are incremental: assets/sprites/.manifest.json records a hash of each
+sprite's generator source (plus every helper it calls) and arguments. Sprites
+whose hash is unchanged are skipped, and files whose bytes come out identical
+are never rewritten, so Godot only re-imports textures that really changed.
+
+--palette stores sprites with 256 or fewer colors as lossless palette-indexed
+PNGs (see png_palette.py): "file" gives each its own palette, "shared" indexes
+as many as fit against one project palette built from all of them
+(assets/sprites/.palette.json), at some cost in bytes, and re-encodes every
+sprite when any changed. Others stay RGBA. Bytes saved over RGBA are printed
+per file and in total.
+
+--profile PREFIX times every generator call and PNG encode (.save()) with
+tracemalloc running, and writes PREFIX.json (per-sprite render/encode time
+and peak allocation, sorted for diffing between runs) plus PREFIX.trace.json
+(Chrome trace events; open in chrome://tracing or Perfetto). Only sprites
+that actually render are profiled, so pair it with --force. tracemalloc
+only sees Python-heap allocations, not Pillow's C-side image buffers.
+
+--watch builds once, then stays resident and polls this file and
+game_data.json. On each save it reloads the module with importlib and runs
+the incremental build again: the cache keys above already hash each
+generator's source plus everything it calls, and its arguments, so only the
+sprites whose code or data changed re-render. Sprites (and
+the atlas) are written via a temp file and os.replace, so Godot never
+imports a half-written PNG.
 """
 
+import argparse
+import functools
+import hashlib
+import inspect
+import io
+import json
+import linecache
 import os
 import math
+import platform
 import random
-from PIL import Image, ImageDraw
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import PIL
+from PIL import Image, ImageChops, ImageDraw
 
-# Deterministic for reproducibility
-random.seed(42)
+import game_data
+import pack_atlas
+import png_palette
 
 BASE = os.path.join(os.path.dirname(__file__), "..", "assets", "sprites")
+PROFILE = False
+MANIFEST_PATH = os.path.join(BASE, ".manifest.json")
+PALETTE_PATH = os.path.join(BASE, ".palette.json")
+
+
+def set_output_dir(path):
+    """Write sprites (and the build manifest) under path instead of assets/sprites."""
+    global BASE, MANIFEST_PATH, PALETTE_PATH
+    BASE = path
+    MANIFEST_PATH = os.path.join(BASE, ".manifest.json")
+    PALETTE_PATH = os.path.join(BASE, ".palette.json")
+
+
+def init_worker(backend, profile):
+    """Pool initializer: carry the parent's backend and profiling settings."""
+    global PROFILE
+    set_backend(backend)
+    PROFILE = profile
 
 
 def ensure_dir(path):
@@ -53,12 +130,86 @@ def lighten(c, factor=1.3):
     return rgba(min(255, c[0] * factor), min(255, c[1] * factor), min(255, c[2] * factor), c[3])
 
 
+# ── Raster Backend ───────────────────────────────────────────────────────────
+# Generators that only need rects, axis-aligned 1px lines, filled ellipses and
+# random pixel scatter draw through new_canvas(), so they can run on either
+# backend: "pil" (ImageDraw) or "numpy" (raster_np.ArrayCanvas, vectorized
+# and pixel-identical). NumPy is only imported when that backend is selected.
+
+BACKEND = "pil"
+
+
+def set_backend(name):
+    global BACKEND
+    BACKEND = name
+
+
+def new_canvas(size):
+    """Blank transparent RGBA canvas and its draw object for the active backend."""
+    if BACKEND == "numpy":
+        import raster_np
+        canvas = raster_np.ArrayCanvas(size)
+        return canvas, canvas
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    return img, ImageDraw.Draw(img)
+
+
+def to_image(canvas):
+    return canvas if isinstance(canvas, Image.Image) else canvas.to_image()
+
+
+def scatter_pixels(img, rng, count, x_range, y_range, shade, color, factors, ox=0):
+    """Set `count` random pixels to shade(color, factor) (shade: darken or lighten).
+
+    Each pixel draws x, y, then factor from rng, in that order. Callers pass
+    their own fixed-seed random.Random, so output never depends on render
+    order or process.
+    """
+    if not isinstance(img, Image.Image):
+        img.scatter(rng, count, x_range, y_range, color, factors, ox)
+        return
+    for _ in range(count):
+        gx = ox + rng.randint(*x_range)
+        gy = rng.randint(*y_range)
+        img.putpixel((gx, gy), shade(color, rng.uniform(*factors)))
+
+
+# ── Layer Cache ──────────────────────────────────────────────────────────────
+# Sub-layers shared across sprites (machine bodies, potion glass, player hat,
+# head and shoes) are drawn once per key and pasted. ImageDraw overwrites
+# pixels rather than blending, so a layer goes on through its coverage mask
+# (every pixel it drew, at full strength) instead of alpha_composite: that
+# reproduces the original draw calls exactly, translucent ink included.
+# Layers never draw fully transparent ink, so alpha > 0 marks coverage.
+
+_layer_cache = {}
+
+
+def cached_layer(key, size, draw_layer):
+    """Layer drawn once per key by draw_layer(draw) on a size canvas.
+
+    Stored cropped to what was drawn: (image, coverage mask, (x, y) offset).
+    """
+    if key not in _layer_cache:
+        layer = Image.new("RGBA", size, (0, 0, 0, 0))
+        draw_layer(ImageDraw.Draw(layer))
+        mask = layer.getchannel("A").point(lambda a: 255 if a else 0)
+        bbox = mask.getbbox() or (0, 0, 1, 1)
+        _layer_cache[key] = (layer.crop(bbox), mask.crop(bbox), bbox[:2])
+    return _layer_cache[key]
+
+
+def paste_layer(img, layer, xy=(0, 0)):
+    """Draw a cached layer onto img (Image or ArrayCanvas), its canvas origin at xy."""
+    layer_img, mask, (dx, dy) = layer
+    img.paste(layer_img, (xy[0] + dx, xy[1] + dy), mask)
+
+
 # ── Floor Tiles ──────────────────────────────────────────────────────────────
 
 def generate_floor_atlas():
     """128x64 atlas: 2 warm wood plank tile variants side by side."""
-    img = Image.new("RGBA", (128, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((128, 64))
 
     for tile_idx in range(2):
         ox = tile_idx * 64
@@ -86,20 +237,12 @@ def generate_floor_atlas():
 
         # Subtle wood grain (random darker pixels)
         rng = random.Random(42 + tile_idx)
-        for _ in range(50):
-            gx = ox + rng.randint(0, 63)
-            gy = rng.randint(0, 63)
-            grain = darken(base, rng.uniform(0.85, 0.95))
-            img.putpixel((gx, gy), grain)
+        scatter_pixels(img, rng, 50, (0, 63), (0, 63), darken, base, (0.85, 0.95), ox)
 
         # Subtle lighter highlights
-        for _ in range(25):
-            gx = ox + rng.randint(0, 63)
-            gy = rng.randint(0, 63)
-            highlight = lighten(base, rng.uniform(1.05, 1.15))
-            img.putpixel((gx, gy), highlight)
+        scatter_pixels(img, rng, 25, (0, 63), (0, 63), lighten, base, (1.05, 1.15), ox)
 
-    return img
+    return to_image(img)
 
 
 # ── Machine Sprites (64x64, art in ~52x52 centered) ─────────────────────────
@@ -115,12 +258,17 @@ def draw_rounded_rect(draw, bbox, color, radius=4):
     draw.ellipse([x1 - radius * 2, y1 - radius * 2, x1, y1], fill=color)
 
 
+def machine_body(color, bbox=(6, 6, 57, 57), radius=4, size=(64, 64)):
+    """Cached rounded-rect machine body layer."""
+    return cached_layer(("rounded_rect", size, bbox, color, radius), size,
+                        lambda draw: draw_rounded_rect(draw, list(bbox), color, radius))
+
+
 def machine_conveyor():
     """Conveyor belt: grey with rollers."""
-    img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((64, 64))
     body = rgba(105, 105, 115)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Belt track (darker strip)
     track = darken(body, 0.7)
     draw.rectangle([10, 20, 53, 43], fill=track)
@@ -132,7 +280,7 @@ def machine_conveyor():
     rail = lighten(body, 1.2)
     draw.rectangle([10, 18, 53, 20], fill=rail)
     draw.rectangle([10, 43, 53, 45], fill=rail)
-    return img
+    return to_image(img)
 
 
 def machine_fast_belt():
@@ -140,7 +288,7 @@ def machine_fast_belt():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(180, 145, 50)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Belt track
     track = darken(body, 0.7)
     draw.rectangle([10, 20, 53, 43], fill=track)
@@ -165,7 +313,7 @@ def machine_dispenser():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(70, 155, 95)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Hopper (trapezoid top)
     hopper = darken(body, 0.8)
     draw.polygon([(14, 10), (49, 10), (43, 26), (20, 26)], fill=hopper)
@@ -186,7 +334,7 @@ def machine_cauldron():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(145, 85, 155)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Cauldron pot (darker interior circle)
     pot = rgba(35, 25, 45)
     draw.ellipse([14, 16, 49, 51], fill=pot)
@@ -209,10 +357,9 @@ def machine_cauldron():
 
 def machine_storage_chest():
     """Storage chest: brown wooden chest with metal trim."""
-    img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((64, 64))
     body = rgba(130, 90, 45)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Lid (upper portion, slightly lighter)
     lid = lighten(body, 1.15)
     draw.rectangle([8, 8, 55, 26], fill=lid)
@@ -231,7 +378,7 @@ def machine_storage_chest():
     brace = rgba(140, 130, 80)
     for bx, by in [(8, 8), (52, 8), (8, 52), (52, 52)]:
         draw.rectangle([bx, by, bx + 4, by + 4], fill=brace)
-    return img
+    return to_image(img)
 
 
 def machine_splitter():
@@ -239,7 +386,7 @@ def machine_splitter():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(145, 70, 170)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Y-fork symbol (lighter)
     fork_color = rgba(200, 160, 220)
     # Stem from left
@@ -260,7 +407,7 @@ def machine_sorter():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(50, 145, 145)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Filter lens (top area)
     lens = rgba(70, 180, 180)
     draw.ellipse([22, 10, 41, 29], fill=lens)
@@ -283,7 +430,7 @@ def machine_bottler():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(180, 130, 35)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Bottle silhouette (centered)
     bottle = rgba(220, 200, 160)
     # Body
@@ -306,7 +453,7 @@ def machine_auto_seller():
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     body = rgba(190, 165, 25)
-    draw_rounded_rect(draw, [6, 6, 57, 57], body, 4)
+    paste_layer(img, machine_body(body))
     # Gold coin stack
     coin_dark = rgba(170, 140, 10)
     coin_light = rgba(230, 200, 40)
@@ -634,21 +781,28 @@ def item_star():
     return img
 
 
-def make_potion(color_tuple):
-    """Generic potion bottle filled with color."""
-    img = Image.new("RGBA", (20, 20), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+def draw_potion_glass(draw):
+    """Glass outline, cork and shine shared by every potion."""
     bottle_glass = rgba(200, 200, 210, 140)
-    # Bottle body
-    draw.rectangle([5, 8, 14, 17], fill=color_tuple)
+    # Bottle body and neck outlines
     draw.rectangle([5, 8, 14, 17], outline=bottle_glass, width=1)
-    # Bottle neck
-    draw.rectangle([7, 4, 12, 8], fill=rgba(color_tuple[0], color_tuple[1], color_tuple[2], 120))
     draw.rectangle([7, 4, 12, 8], outline=bottle_glass, width=1)
     # Cork
     draw.rectangle([8, 2, 11, 4], fill=rgba(160, 120, 70))
     # Shine
     draw.line([6, 9, 6, 15], fill=rgba(255, 255, 255, 80), width=1)
+
+
+def make_potion(color_tuple):
+    """Generic potion bottle filled with color."""
+    img = Image.new("RGBA", (20, 20), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    # Liquid in the bottle body and neck. The glass layer goes on top: the
+    # neck fill only overlaps the body outline where the neck outline
+    # redraws the same glass, so drawing all glass last is identical.
+    draw.rectangle([5, 8, 14, 17], fill=color_tuple)
+    draw.rectangle([7, 4, 12, 8], fill=rgba(color_tuple[0], color_tuple[1], color_tuple[2], 120))
+    paste_layer(img, cached_layer("potion_glass", (20, 20), draw_potion_glass))
     return img
 
 
@@ -667,8 +821,31 @@ def item_bottle_overlay():
     return img
 
 
+def make_bottled_potion(color_tuple):
+    """Potion with the bottle overlay composited on, as Item.set_bottled shows it."""
+    return Image.alpha_composite(make_potion(color_tuple), item_bottle_overlay())
+
+
 # ── Player Spritesheet (128x192: 4 cols x 4 rows, 32x48 frames) ────────────
 
+def draw_player_hat_head(draw, hat, hat_band, skin):
+    """Pointy hat and head, in unbobbed frame coordinates."""
+    draw.polygon([(16, 2), (22, 14), (10, 14)], fill=hat)
+    # Hat brim
+    draw.rectangle([8, 14, 24, 17], fill=hat)
+    # Hat band
+    draw.rectangle([10, 12, 22, 14], fill=hat_band)
+    # Head (face)
+    draw.ellipse([11, 15, 21, 25], fill=skin)
+
+
+def draw_player_shoes(draw, shoe, leg_offset):
+    """Both shoes for a walk frame, in unbobbed frame coordinates."""
+    feet_y = 25 + 14  # body_y + 14
+    draw.rectangle([11 + leg_offset, feet_y, 15 + leg_offset, feet_y + 4], fill=shoe)
+    draw.rectangle([18 - leg_offset, feet_y, 22 - leg_offset, feet_y + 4], fill=shoe)
+
+
 def generate_player_spritesheet():
     """4 rows (down, right, up, left) x 4 columns (walk frames).
     Each frame is 32x48. Purple-robed wizard with pointy hat."""
@@ -694,22 +871,12 @@ def generate_player_spritesheet():
             # Leg offset for walking
             leg_offset = 2 if col == 1 else (-2 if col == 3 else 0)
 
-            # Hat (pointy, top of frame)
-            hat_tip_y = oy + 2 + bob
-            hat_base_y = oy + 14 + bob
-            draw.polygon([
-                (ox + 16, hat_tip_y),
-                (ox + 22, hat_base_y),
-                (ox + 10, hat_base_y)
-            ], fill=hat)
-            # Hat brim
-            draw.rectangle([ox + 8, hat_base_y, ox + 24, hat_base_y + 3], fill=hat)
-            # Hat band
-            draw.rectangle([ox + 10, hat_base_y - 2, ox + 22, hat_base_y], fill=hat_band)
-
-            # Head (face)
+            # Hat and head: the same shapes every frame, drawn once as a
+            # layer in frame coordinates and pasted at the bobbed frame origin
+            paste_layer(img, cached_layer(("player_hat_head", hat, hat_band, skin), (32, 48),
+                                          lambda d: draw_player_hat_head(d, hat, hat_band, skin)),
+                        (ox, oy + bob))
             head_y = oy + 15 + bob
-            draw.ellipse([ox + 11, head_y, ox + 21, head_y + 10], fill=skin)
 
             if row == 0:  # Facing down - show face
                 draw.point((ox + 14, head_y + 4), fill=rgba(40, 30, 20))
@@ -746,11 +913,9 @@ def generate_player_spritesheet():
                 draw.rectangle([ox + 22, arm_y, ox + 25, arm_y + 5], fill=robe)
 
             # Legs/shoes
-            feet_y = body_y + 14
-            left_foot_x = ox + 11 + leg_offset
-            right_foot_x = ox + 18 - leg_offset
-            draw.rectangle([left_foot_x, feet_y, left_foot_x + 4, feet_y + 4], fill=shoe)
-            draw.rectangle([right_foot_x, feet_y, right_foot_x + 4, feet_y + 4], fill=shoe)
+            paste_layer(img, cached_layer(("player_shoes", shoe, leg_offset), (32, 48),
+                                          lambda d: draw_player_shoes(d, shoe, leg_offset)),
+                        (ox, oy + bob))
 
     return img
 
@@ -759,8 +924,7 @@ def generate_player_spritesheet():
 
 def ui_wood_panel():
     """48x48 9-slice wood panel: warm brown planks, darker border edges (~6px margins)."""
-    img = Image.new("RGBA", (48, 48), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((48, 48))
     base = rgba(120, 82, 45)
     border = darken(base, 0.6)
     inner = lighten(base, 1.1)
@@ -793,19 +957,14 @@ def ui_wood_panel():
 
     # Subtle wood grain
     rng = random.Random(100)
-    for _ in range(30):
-        gx = rng.randint(7, 40)
-        gy = rng.randint(7, 40)
-        grain = darken(inner, rng.uniform(0.9, 0.97))
-        img.putpixel((gx, gy), grain)
+    scatter_pixels(img, rng, 30, (7, 40), (7, 40), darken, inner, (0.9, 0.97))
 
-    return img
+    return to_image(img)
 
 
 def ui_wood_panel_dark():
     """48x48 darker wood panel for tooltips."""
-    img = Image.new("RGBA", (48, 48), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((48, 48))
     base = rgba(75, 52, 30)
     border = darken(base, 0.55)
     inner = lighten(base, 1.1)
@@ -826,19 +985,14 @@ def ui_wood_panel_dark():
 
     # Grain
     rng = random.Random(101)
-    for _ in range(20):
-        gx = rng.randint(7, 40)
-        gy = rng.randint(7, 40)
-        grain = darken(inner, rng.uniform(0.9, 0.97))
-        img.putpixel((gx, gy), grain)
+    scatter_pixels(img, rng, 20, (7, 40), (7, 40), darken, inner, (0.9, 0.97))
 
-    return img
+    return to_image(img)
 
 
 def ui_parchment():
     """48x48 9-slice parchment: cream/tan aged paper."""
-    img = Image.new("RGBA", (48, 48), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((48, 48))
     base = rgba(225, 205, 165)
     border = darken(base, 0.7)
     inner = lighten(base, 1.05)
@@ -854,19 +1008,11 @@ def ui_parchment():
 
     # Aged spots/stains
     rng = random.Random(102)
-    for _ in range(40):
-        gx = rng.randint(5, 42)
-        gy = rng.randint(5, 42)
-        stain = darken(inner, rng.uniform(0.92, 0.98))
-        img.putpixel((gx, gy), stain)
+    scatter_pixels(img, rng, 40, (5, 42), (5, 42), darken, inner, (0.92, 0.98))
     # Lighter spots
-    for _ in range(15):
-        gx = rng.randint(5, 42)
-        gy = rng.randint(5, 42)
-        light = lighten(inner, rng.uniform(1.01, 1.04))
-        img.putpixel((gx, gy), light)
+    scatter_pixels(img, rng, 15, (5, 42), (5, 42), lighten, inner, (1.01, 1.04))
 
-    return img
+    return to_image(img)
 
 
 def ui_coin():
@@ -917,8 +1063,7 @@ def ui_lock():
 
 def ui_button_wood(variant="normal"):
     """32x16 9-slice wood button. variant: 'normal', 'hover', 'pressed'."""
-    img = Image.new("RGBA", (32, 16), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img, draw = new_canvas((32, 16))
 
     if variant == "normal":
         base = rgba(140, 100, 60)
@@ -947,126 +1092,695 @@ def ui_button_wood(variant="normal"):
     if variant != "pressed":
         draw.line([3, 3, 28, 3], fill=highlight, width=1)
 
-    return img
+    return to_image(img)
+
+
+# ── Animation Strips ─────────────────────────────────────────────────────────
+# Horizontal strips of 64x64 frames derived from the static machine art, so
+# the game plays them with AnimatedSprite2D instead of redrawing every frame.
+# Scrolling pastes a repeated period of columns at each frame's offset;
+# overlays composite a flat color over the pixels they cover.
+# Overlay geometry matches what Cauldron/Bottler._draw drew at runtime, in
+# sprite pixels (pixel x sits at x - 31.5 in node space).
+
+# name: (frame count, frames per second, loops)
+ANIMATIONS = {
+    "conveyor": (10, 20.0, True),       # rollers scroll 1px/frame
+    "fast_belt": (30, 20.0, True),      # rollers and chevrons 2px/frame (2x speed)
+    "cauldron_brew": (12, 16.0, True),  # one bubble orbit per 12 frames, 2 per BREW_TIME
+    "bottler_fill": (15, 15.0, False),  # fill bar 0..14px over BOTTLE_TIME (overlay)
+}
+ANIM_DIR = "anim"
+ANIM_TABLE = "anim/animations.json"
+BELT_ROWS = (21, 42)  # Track rows between the side rails
+
+
+def _scrolled(band, x0, period, width, shift):
+    """Columns x0..x0+period-1 of band repeated across `width` columns
+    (starting at x0), shifted right by shift."""
+    pattern = band.crop((x0, 0, x0 + period, band.height))
+    tiled = Image.new(band.mode, (width + 2 * period, band.height))
+    for x in range(0, tiled.width, period):
+        tiled.paste(pattern, (x, 0))
+    offset = -shift % period
+    return tiled.crop((offset, 0, offset + width, band.height))
+
+
+def _scroll_rollers(frame, base, x0, x1, tile_x0, period, shift):
+    """Scroll the roller pattern (one period starting at tile_x0) across x0..x1."""
+    y0, y1 = BELT_ROWS
+    band = base.crop((0, y0, base.width, y1 + 1))
+    # Column x shows pattern column (x - tile_x0 - shift) mod period
+    rolled = _scrolled(band, tile_x0, period, x1 - x0 + 1 + (x0 - tile_x0) % period, shift)
+    frame.paste(rolled.crop(((x0 - tile_x0) % period, 0, rolled.width, rolled.height)), (x0, y0))
+
+
+def _composite(frame, coverage, color):
+    """Alpha-composite a flat color over the frame's pixels in coverage."""
+    a = color[3] / 255.0
+    px = frame.load()
+    for x, y in coverage:
+        r, g, b, da = px[x, y]
+        da /= 255.0
+        out_a = a + da * (1 - a)
+        px[x, y] = tuple(round((c * a + d * (da * (1 - a))) / out_a)
+                         for c, d in zip(color[:3], (r, g, b))) + (round(out_a * 255),)
+
+
+def _strip(frames):
+    """Frames → one RGBA image, frames left to right."""
+    w, h = frames[0].size
+    strip = Image.new("RGBA", (len(frames) * w, h))
+    for i, frame in enumerate(frames):
+        strip.paste(frame, (i * w, 0))
+    return strip
+
+
+def _pixel_center(v, size=64):
+    """Node-space coordinate of sprite pixel v's center (sprite centered on the node)."""
+    return v - (size / 2 - 0.5)
+
+
+def _pixels_near(c, size=64, reach=4):
+    """Sprite pixels whose centers can be within reach - 1 of node-space c."""
+    v = int(c + (size / 2 - 0.5))
+    return range(max(0, v - reach), min(size, v + reach + 1))
+
+
+def anim_conveyor():
+    """Conveyor rollers scrolling toward the output, one roller gap per cycle."""
+    count = ANIMATIONS["conveyor"][0]
+    base = machine_conveyor()
+    frames = []
+    for shift in range(count):
+        frame = base.copy()
+        # Rollers every 10px; columns 16-25 are one roller plus the gap after it
+        _scroll_rollers(frame, base, 10, 53, 16, 10, shift)
+        frames.append(frame)
+    return _strip(frames)
+
+
+def anim_fast_belt():
+    """Fast belt rollers and speed chevrons scrolling at 2px per frame."""
+    count = ANIMATIONS["fast_belt"][0]
+    base = machine_fast_belt()
+    y0, y1 = BELT_ROWS
+    box = (18, y0, 54, y1 + 1)
+
+    # Chevrons every 12px: whatever differs from the bare rollers at shift 0.
+    # Columns 18-53 hold exactly three periods, so they wrap seamlessly.
+    bare = base.copy()
+    _scroll_rollers(bare, base, 10, 53, 10, 10, 0)
+    diff = ImageChops.difference(base.crop(box), bare.crop(box)).split()
+    chevrons = functools.reduce(ImageChops.lighter, diff).point(lambda v: 255 if v else 0)
+    color = base.crop(box)
+    frames = []
+    for shift in range(0, 2 * count, 2):
+        frame = base.copy()
+        # Rollers every 10px; columns 10-19 hold one roller and no chevron
+        _scroll_rollers(frame, base, 10, 53, 10, 10, shift)
+        frame.paste(_scrolled(color, 0, 36, 36, shift), box[:2], _scrolled(chevrons, 0, 36, 36, shift))
+        frames.append(frame)
+    return _strip(frames)
+
+
+def anim_cauldron_brew():
+    """Three bubbles orbiting the pot, as Cauldron._draw animated them while brewing."""
+    count = ANIMATIONS["cauldron_brew"][0]
+    base = machine_cauldron()
+    frames = []
+    for f in range(count):
+        coverage = set()
+        for bubble in range(3):
+            angle = (f / count + bubble / 3) * 2 * math.pi
+            cx, cy = 10.0 * math.cos(angle), 10.0 * math.sin(angle)
+            coverage.update((x, y) for y in _pixels_near(cy) for x in _pixels_near(cx)
+                            if (_pixel_center(x) - cx) ** 2 + (_pixel_center(y) - cy) ** 2 <= 9.0)
+        frame = base.copy()
+        _composite(frame, coverage, (204, 153, 255, 179))  # Color(0.8, 0.6, 1.0, 0.7)
+        frames.append(frame)
+    return _strip(frames)
+
+
+def anim_bottler_fill():
+    """Amber fill rising inside the bottle, as Bottler._draw showed progress.
+    Only the bar is baked: it plays unrotated over the machine sprite, so it
+    fills upward whichever way the bottler faces."""
+    count = ANIMATIONS["bottler_fill"][0]
+    frames = []
+    for height in range(count):  # 14px * progress
+        coverage = [(x, y) for y in range(64) for x in range(24, 40)
+                    if -5 <= _pixel_center(x) < 5 and 10 - height <= _pixel_center(y) < 10]
+        frame = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+        _composite(frame, coverage, (230, 204, 77, 153))  # Color(0.9, 0.8, 0.3, 0.6)
+        frames.append(frame)
+    return _strip(frames)
+
+
+ANIM_STRIPS = {
+    "conveyor": anim_conveyor,
+    "fast_belt": anim_fast_belt,
+    "cauldron_brew": anim_cauldron_brew,
+    "bottler_fill": anim_bottler_fill,
+}
+
+
+def animation_table():
+    """Frame metadata for SpriteAnimations (scripts/data/sprite_animations.gd)."""
+    table = {}
+    for name, (count, fps, loop) in ANIMATIONS.items():
+        table[name] = {
+            "texture": f"res://assets/sprites/{ANIM_DIR}/{name}.png",
+            "frame_size": [64, 64],
+            "frames": count,
+            "fps": fps,
+            "loop": loop,
+        }
+    return {"animations": table}
+
+
+def write_animation_table():
+    data = (json.dumps(animation_table(), indent=2, sort_keys=True) + "\n").encode()
+    ensure_dir(os.path.join(BASE, ANIM_DIR))
+    if pack_atlas.write_if_changed(os.path.join(BASE, ANIM_TABLE), data):
+        print(f"  {ANIM_TABLE}")
+
+
+# ── Sprite Table ─────────────────────────────────────────────────────────────
+
+MACHINES = {
+    "conveyor": machine_conveyor,
+    "fast_belt": machine_fast_belt,
+    "dispenser": machine_dispenser,
+    "cauldron": machine_cauldron,
+    "storage": machine_storage_chest,
+    "splitter": machine_splitter,
+    "sorter": machine_sorter,
+    "bottler": machine_bottler,
+    "auto_seller": machine_auto_seller,
+}
+
+# Ingredient sprites (custom per type)
+INGREDIENT_SPRITES = {
+    "mushroom": item_mushroom,
+    "herb": item_herb,
+    "crystal": item_crystal,
+    "water": item_water,
+    "feather": item_feather,
+    "lightning": item_lightning,
+    "rose": item_rose,
+    "heart": item_heart,
+    "shadow": item_shadow,
+    "moonlight": item_moonlight,
+    "ice": item_ice,
+    "lava": item_lava,
+    "dragon_scale": item_dragon_scale,
+    "ember": item_ember,
+    "glowshroom": item_glowshroom,
+    "eye": item_eye,
+    "seaweed": item_seaweed,
+    "bubble": item_bubble,
+    "clover": item_clover,
+    "star": item_star,
+}
+
+# Which items and machines exist, their sprite paths and potion colors all
+# come from tools/game_data.json (see game_data.py); the tables above only
+# map ids to generators. Potion sprites are a generic bottle in the potion color.
+GAME_DATA = game_data.load_data()
+POTION_COLORS = {item["id"].lower(): col_to_rgba(*item["color"])
+                 for item in game_data.potions(GAME_DATA)}
+
+UI_SPRITES = {
+    "wood_panel": ui_wood_panel,
+    "wood_panel_dark": ui_wood_panel_dark,
+    "parchment": ui_parchment,
+    "coin": ui_coin,
+    "lock": ui_lock,
+}
+
+BUTTON_VARIANTS = ["normal", "hover", "pressed"]
+
+
+def generator(table, name):
+    """The generator for a game_data.json entry, with a useful error if there is none."""
+    if name not in table:
+        raise SystemExit(f"game_data.json lists {name!r} but generate_sprites.py has no generator for it")
+    return table[name]
+
+
+def sprite_jobs():
+    """Every output sprite as (path relative to BASE, generator, args), in build order."""
+    jobs = [("tiles/floor_atlas.png", generate_floor_atlas, ())]
+    for machine in GAME_DATA["machines"]:
+        jobs.append((machine["sprite"], generator(MACHINES, machine["id"]), ()))
+    for item in game_data.ingredients(GAME_DATA):
+        jobs.append((item["sprite"], generator(INGREDIENT_SPRITES, item["id"].lower()), ()))
+    potions = game_data.potions(GAME_DATA)
+    for item in potions:
+        jobs.append((item["sprite"], make_potion, (POTION_COLORS[item["id"].lower()],)))
+    jobs.append(("items/bottle_overlay.png", item_bottle_overlay, ()))
+    for item in potions:
+        jobs.append((item["bottled_sprite"], make_bottled_potion, (POTION_COLORS[item["id"].lower()],)))
+    jobs.append(("player/player_spritesheet.png", generate_player_spritesheet, ()))
+    for name, fn in UI_SPRITES.items():
+        jobs.append((f"ui/{name}.png", fn, ()))
+    for variant in BUTTON_VARIANTS:
+        suffix = "" if variant == "normal" else f"_{variant}"
+        jobs.append((f"ui/button_wood{suffix}.png", ui_button_wood, (variant,)))
+    for name, fn in ANIM_STRIPS.items():
+        jobs.append((f"{ANIM_DIR}/{name}.png", fn, ()))
+    return jobs
+
+
+# ── Library API ──────────────────────────────────────────────────────────────
+#
+# Other tools can import this module and render sprites in memory:
+#
+#     import generate_sprites
+#     cauldron = generate_sprites.render("machines/cauldron", scale=2)
+#
+# Names are sprite paths relative to assets/sprites/ without ".png". Rendered
+# images are kept in a bounded LRU cache, so asking again costs a copy.
+
+RENDER_CACHE_SIZE = 128
+
+_registry = None
+
+
+def sprite_registry():
+    """{sprite name: (generator, args)} for every sprite, in build order."""
+    global _registry
+    if _registry is None:
+        _registry = {os.path.splitext(relpath)[0]: (fn, args) for relpath, fn, args in sprite_jobs()}
+    return _registry
+
+
+def sprite_names():
+    return list(sprite_registry())
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_cached(name, scale, backend):
+    if scale != 1:
+        img = _render_cached(name, 1, backend)
+        return img.resize((img.width * scale, img.height * scale), Image.NEAREST)
+    fn, args = sprite_registry()[name]
+    return fn(*args)
+
+
+def render(name, scale=1):
+    """Render one sprite (e.g. "machines/cauldron") as an RGBA image.
+
+    scale is an integer nearest-neighbor upscale. Returns a fresh copy, so
+    callers may draw on it without touching the cache.
+    """
+    name = name[:-4] if name.endswith(".png") else name
+    if name not in sprite_registry():
+        raise KeyError(f"unknown sprite {name!r}; see sprite_names()")
+    if not isinstance(scale, int) or scale < 1:
+        raise ValueError(f"scale must be a positive integer, got {scale!r}")
+    return _render_cached(name, scale, BACKEND).copy()
+
+
+def clear_render_cache():
+    _render_cached.cache_clear()
+
+
+# ── Build Cache ──────────────────────────────────────────────────────────────
+
+_source_cache = {}
+
+
+def _function_source(fn):
+    """Source lines spanned by fn's bytecode (cheaper than inspect.getsource)."""
+    if fn not in _source_cache:
+        code = fn.__code__
+        lines = linecache.getlines(code.co_filename)
+        last = max(line for _, _, line in code.co_lines() if line is not None)
+        _source_cache[fn] = "".join(lines[code.co_firstlineno - 1:last])
+    return _source_cache[fn]
+
+
+def _collect_dependencies(code, module_globals, functions, constants):
+    """Walk a code object for module-level functions and constants it reads."""
+    for name in code.co_names:
+        obj = module_globals.get(name)
+        if inspect.isfunction(obj):
+            if obj not in functions:
+                functions.add(obj)
+                _collect_dependencies(obj.__code__, module_globals, functions, constants)
+        elif isinstance(obj, (int, float, str, tuple, list, dict)) and not name.startswith("_"):
+            # Underscore names are caches (e.g. _layer_cache), not inputs
+            constants[name] = obj
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _collect_dependencies(const, module_globals, functions, constants)
+
+
+def job_key(fn, args, encoding="rgba"):
+    """Hash of a generator's source, every helper it calls, its arguments and
+    the PNG encoding."""
+    functions = {fn}
+    constants = {}
+    _collect_dependencies(fn.__code__, fn.__globals__, functions, constants)
+    h = hashlib.sha256()
+    h.update(PIL.__version__.encode())
+    for dep in sorted(functions, key=lambda f: f.__name__):
+        h.update(_function_source(dep).encode())
+    for name in sorted(constants):
+        h.update(f"{name}={constants[name]!r}".encode())
+    h.update(repr(args).encode())
+    if encoding != "rgba":
+        h.update(encoding.encode())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def stale_jobs(jobs, manifest, encoding="rgba"):
+    """Jobs whose cache key changed or whose output file is missing or edited.
+
+    Returns (stale, keys) where keys maps every job's path to its cache key.
+    """
+    stale = []
+    keys = {}
+    for job in jobs:
+        relpath, fn, args = job
+        keys[relpath] = job_key(fn, args, encoding)
+        entry = manifest.get(relpath, {})
+        if (entry.get("key") != keys[relpath]
+                or file_digest(os.path.join(BASE, relpath)) != entry.get("sha256")):
+            stale.append(job)
+    return stale, keys
+
+
+# ── Profiling ────────────────────────────────────────────────────────────────
+
+def profiled(stages, name, fn, *args, **kwargs):
+    """Call fn; with PROFILE on, record its time and peak allocation in stages[name]."""
+    if not PROFILE:
+        return fn(*args, **kwargs)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter_ns()
+    result = fn(*args, **kwargs)
+    end = time.perf_counter_ns()
+    stages[name] = {
+        "start_ns": start,
+        "dur_ns": end - start,
+        "peak_alloc": tracemalloc.get_traced_memory()[1] - base,
+        "pid": os.getpid(),
+    }
+    return result
+
+
+def write_profile(prefix, profile, meta):
+    """Write PREFIX.json (per-sprite summary) and PREFIX.trace.json (trace events)."""
+    ensure_dir(os.path.dirname(os.path.abspath(prefix)))
+    origin = min((st["start_ns"] for stages in profile.values() for st in stages.values()),
+                 default=0)
+    sprites = {}
+    events = []
+    for relpath in sorted(profile):
+        entry = {}
+        for name, st in profile[relpath].items():
+            entry[f"{name}_ms"] = round(st["dur_ns"] / 1e6, 3)
+            entry[f"{name}_peak_kb"] = round(st["peak_alloc"] / 1024, 1)
+            events.append({
+                "name": relpath, "cat": name, "ph": "X",
+                "ts": (st["start_ns"] - origin) / 1000, "dur": st["dur_ns"] / 1000,
+                "pid": st["pid"], "tid": st["pid"],
+                "args": {"peak_alloc_kb": entry[f"{name}_peak_kb"]},
+            })
+        sprites[relpath] = entry
+    totals = {}
+    for entry in sprites.values():
+        for field, value in entry.items():
+            if field.endswith("_ms"):
+                totals[field] = round(totals.get(field, 0) + value, 3)
+    report = {"meta": meta, "totals": totals, "sprites": sprites}
+
+    with open(prefix + ".json", "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    with open(prefix + ".trace.json", "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        f.write("\n")
+
+    slowest = sorted(sprites.items(), key=lambda e: -sum(v for k, v in e[1].items() if k.endswith("_ms")))
+    print(f"\nProfile: {prefix}.json, {prefix}.trace.json")
+    for relpath, entry in slowest[:5]:
+        print(f"  {relpath:40} render {entry.get('render_ms', 0):7.2f} ms  "
+              f"encode {entry.get('encode_ms', 0):7.2f} ms  "
+              f"peak {max(entry.get('render_peak_kb', 0), entry.get('encode_peak_kb', 0)):8.1f} KB")
 
 
 # ── Main Generation ──────────────────────────────────────────────────────────
 
-def main():
-    # Directories
-    tiles_dir = os.path.join(BASE, "tiles")
-    machines_dir = os.path.join(BASE, "machines")
-    items_dir = os.path.join(BASE, "items")
-    player_dir = os.path.join(BASE, "player")
-
-    for d in [tiles_dir, machines_dir, items_dir, player_dir]:
-        ensure_dir(d)
-
-    # ── Floor atlas ──
-    floor = generate_floor_atlas()
-    floor.save(os.path.join(tiles_dir, "floor_atlas.png"))
-    print("  tiles/floor_atlas.png")
-
-    # ── Machine sprites ──
-    machines = {
-        "conveyor": machine_conveyor,
-        "fast_belt": machine_fast_belt,
-        "dispenser": machine_dispenser,
-        "cauldron": machine_cauldron,
-        "storage": machine_storage_chest,
-        "splitter": machine_splitter,
-        "sorter": machine_sorter,
-        "bottler": machine_bottler,
-        "auto_seller": machine_auto_seller,
-    }
-    for name, fn in machines.items():
-        sprite = fn()
-        sprite.save(os.path.join(machines_dir, f"{name}.png"))
-        print(f"  machines/{name}.png")
-
-    # ── Item sprites ──
-    # Ingredient sprites (custom per type)
-    ingredient_sprites = {
-        "mushroom": item_mushroom,
-        "herb": item_herb,
-        "crystal": item_crystal,
-        "water": item_water,
-        "feather": item_feather,
-        "lightning": item_lightning,
-        "rose": item_rose,
-        "heart": item_heart,
-        "shadow": item_shadow,
-        "moonlight": item_moonlight,
-        "ice": item_ice,
-        "lava": item_lava,
-        "dragon_scale": item_dragon_scale,
-        "ember": item_ember,
-        "glowshroom": item_glowshroom,
-        "eye": item_eye,
-        "seaweed": item_seaweed,
-        "bubble": item_bubble,
-        "clover": item_clover,
-        "star": item_star,
-    }
-    for name, fn in ingredient_sprites.items():
-        sprite = fn()
-        sprite.save(os.path.join(items_dir, f"{name}.png"))
-        print(f"  items/{name}.png")
-
-    # Potion sprites (generic bottle filled with potion color)
-    potion_colors = {
-        "health_potion": col_to_rgba(1.0, 0.2, 0.3),
-        "mana_potion": col_to_rgba(0.3, 0.2, 1.0),
-        "speed_potion": col_to_rgba(1.0, 0.95, 0.1),
-        "love_potion": col_to_rgba(1.0, 0.3, 0.65),
-        "invisibility_potion": col_to_rgba(0.85, 0.85, 0.9),
-        "fire_resistance_potion": col_to_rgba(1.0, 0.5, 0.0),
-        "strength_potion": col_to_rgba(0.7, 0.1, 0.15),
-        "night_vision_potion": col_to_rgba(0.6, 1.0, 0.2),
-        "water_breathing_potion": col_to_rgba(0.1, 0.85, 0.85),
-        "lucky_potion": col_to_rgba(1.0, 0.8, 0.0),
-    }
-    for name, color in potion_colors.items():
-        sprite = make_potion(color)
-        sprite.save(os.path.join(items_dir, f"{name}.png"))
-        print(f"  items/{name}.png")
-
-    # Bottle overlay
-    overlay = item_bottle_overlay()
-    overlay.save(os.path.join(items_dir, "bottle_overlay.png"))
-    print("  items/bottle_overlay.png")
-
-    # ── Player spritesheet ──
-    player = generate_player_spritesheet()
-    player.save(os.path.join(player_dir, "player_spritesheet.png"))
-    print("  player/player_spritesheet.png")
-
-    # ── UI sprites ──
-    ui_dir = os.path.join(BASE, "ui")
-    ensure_dir(ui_dir)
-
-    ui_sprites = {
-        "wood_panel": ui_wood_panel,
-        "wood_panel_dark": ui_wood_panel_dark,
-        "parchment": ui_parchment,
-        "coin": ui_coin,
-        "lock": ui_lock,
-    }
-    for name, fn in ui_sprites.items():
-        sprite = fn()
-        sprite.save(os.path.join(ui_dir, f"{name}.png"))
-        print(f"  ui/{name}.png")
-
-    # Button variants
-    for variant in ["normal", "hover", "pressed"]:
-        suffix = "" if variant == "normal" else f"_{variant}"
-        sprite = ui_button_wood(variant)
-        sprite.save(os.path.join(ui_dir, f"button_wood{suffix}.png"))
-        print(f"  ui/button_wood{suffix}.png")
+def render_png(job):
+    """Render one job and encode it to PNG bytes. Runs in worker processes.
+
+    Returns (relpath, png bytes, CPU seconds, profile stages). CPU time,
+    unlike wall time, does not grow while workers wait for a core, so the
+    sum over jobs is what a serial build spends.
+    """
+    relpath, fn, args = job
+    stages = {}
+    start = time.process_time()
+    img = profiled(stages, "render", fn, *args)
+    buf = io.BytesIO()
+    profiled(stages, "encode", img.save, buf, format="PNG")
+    return relpath, buf.getvalue(), time.process_time() - start, stages
+
+
+def render_image(job):
+    """Render one job, leaving encoding to the caller. Runs in worker processes."""
+    relpath, fn, args = job
+    stages = {}
+    start = time.process_time()
+    img = profiled(stages, "render", fn, *args)
+    return relpath, img, time.process_time() - start, stages
+
+
+def write_sprite(relpath, data, note=""):
+    """Write PNG bytes unless the file already holds them. Returns True if written."""
+    path = os.path.join(BASE, relpath)
+    if file_digest(path) == hashlib.sha256(data).hexdigest():
+        return False
+    atomic_write(path, data)
+    print(f"  {relpath}{note}")
+    return True
+
+
+def atomic_write(path, data):
+    """Write bytes via a temp file in the same directory, then rename over path."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate all pixel art sprites.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="worker processes to render with (0 = one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every sprite, ignoring the build manifest")
+    parser.add_argument("--backend", choices=["pil", "numpy"], default="pil",
+                        help="raster backend for array-friendly generators (numpy is "
+                             "vectorized and pixel-identical)")
+    parser.add_argument("--out", metavar="DIR",
+                        help="output directory (default: assets/sprites)")
+    parser.add_argument("--palette", choices=["off", "file", "shared"], default="off",
+                        help="write sprites with <= 256 colors as palette-indexed PNGs, each "
+                             "with its own palette (file) or one project palette (shared)")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="write per-sprite timing/allocation report to PREFIX.json "
+                             "and Chrome trace events to PREFIX.trace.json")
+    parser.add_argument("--watch", action="store_true",
+                        help="stay resident and rebuild changed generators whenever this file is saved")
+    parser.add_argument("--no-pack", action="store_true",
+                        help="skip packing items and machines into atlas/ (tools/pack_atlas.py)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global PROFILE
+    args = parse_args(argv)
+    if args.watch:
+        watch(sys.argv[1:] if argv is None else argv)
+        return
+    set_backend(args.backend)
+    PROFILE = bool(args.profile)
+    if args.out:
+        set_output_dir(args.out)
+    start = time.perf_counter()
+    jobs = sprite_jobs()
+    workers = args.jobs or os.cpu_count() or 1
+
+    manifest = {} if args.force else load_manifest()
+    encoding = "rgba" if args.palette == "off" else f"palette-{args.palette}"
+    stale, keys = stale_jobs(jobs, manifest, encoding)
+    if args.palette == "shared" and stale:
+        # The shared palette is built from every sprite, so one changed
+        # sprite can move the indices of all the others
+        stale = jobs
 
-    ui_count = len(ui_sprites) + 3  # 3 button variants
-    total = 1 + len(machines) + len(ingredient_sprites) + len(potion_colors) + 1 + 1 + ui_count
-    print(f"\nDone! Generated {total} sprites.")
+    # Directories
+    for d in sorted({os.path.dirname(relpath) for relpath, _, _ in stale}):
+        ensure_dir(os.path.join(BASE, d))
+
+    render_start = time.perf_counter()
+    cpu_time = 0.0  # summed over jobs: the serial render time
+    written = 0
+    new_manifest = {relpath: manifest[relpath] for relpath in keys if relpath in manifest}
+
+    profile = {}
+
+    def finish(relpath, data, elapsed, stages, note=""):
+        nonlocal cpu_time, written
+        cpu_time += elapsed
+        profile[relpath] = stages
+        written += write_sprite(relpath, data, note)
+        new_manifest[relpath] = {"key": keys[relpath], "sha256": hashlib.sha256(data).hexdigest()}
+
+    # With --palette, workers hand back images and encoding happens here,
+    # after the shared palette is built from all of them.
+    render = render_png if args.palette == "off" else render_image
+    rendered = {}
+
+    def collect(result):
+        if render is render_png:
+            finish(*result)
+        else:
+            rendered[result[0]] = result
+
+    if workers <= 1 or len(stale) <= 1:
+        for job in stale:
+            collect(render(job))
+    else:
+        # Each generator seeds its own RNG, so completion order never changes output
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(args.backend, PROFILE)) as pool:
+            for future in as_completed([pool.submit(render, job) for job in stale]):
+                collect(future.result())
+    wall = time.perf_counter() - render_start
+
+    if rendered:
+        palette = None
+        if args.palette == "shared":
+            palette = png_palette.shared_palette(
+                [png_palette.sprite_colors(rendered[relpath][1]) for relpath, _, _ in stale])
+            png_palette.save_palette(PALETTE_PATH, palette)
+        rgba_total = saved_total = 0
+        kinds = {}
+        for relpath, _, _ in stale:
+            _, img, elapsed, stages = rendered[relpath]
+            data, rgba_size, kind = profiled(stages, "encode", png_palette.encode_png, img, palette)
+            rgba_total += rgba_size
+            saved_total += rgba_size - len(data)
+            kinds[kind] = kinds.get(kind, 0) + 1
+            finish(relpath, data, elapsed, stages,
+                   f"  ({kind}, {rgba_size} -> {len(data)} bytes, {rgba_size - len(data)} saved)")
+        if palette is not None:
+            print(f"  shared palette: {len(palette)} colors, {kinds.get('shared', 0)} of "
+                  f"{len(stale)} sprites indexed against it")
+        print(f"  palette encoding saved {saved_total} of {rgba_total} bytes "
+              f"({saved_total / rgba_total:.0%})")
+
+    if new_manifest != manifest:
+        save_manifest(new_manifest)
+
+    write_animation_table()
+
+    # Repack the item/machine atlas whenever a sprite changed
+    if not args.no_pack and (written or not os.path.exists(os.path.join(BASE, pack_atlas.TABLE_NAME))):
+        pack_atlas.build_atlases(sprites_dir=BASE,
+                                 registry_path=None if args.out else pack_atlas.REGISTRY_PATH)
+
+    print(f"\nDone! {len(jobs)} sprites: {len(jobs) - len(stale)} cached, "
+          f"{len(stale) - written} unchanged, {written} written "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms).")
+    if workers > 1 and len(stale) > 1:
+        # Wall time includes starting the pool and shipping results back, so
+        # on few cores or small builds this can honestly come out below 1x
+        print(f"{workers} workers: {wall:.3f}s wall vs {cpu_time:.3f}s serial "
+              f"({cpu_time / wall:.2f}x speedup)")
+
+    if PROFILE:
+        tracemalloc.stop()
+        write_profile(args.profile, profile, {
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "backend": args.backend,
+            "palette": args.palette,
+            "workers": workers,
+            "sprites": len(stale),
+            "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+        })
+
+
+# ── Watch Mode ───────────────────────────────────────────────────────────────
+
+def watch(argv, interval=0.05):
+    """Rebuild every time generate_sprites.py or game_data.json changes on disk, until Ctrl+C."""
+    import importlib
+    import traceback
+    import generate_sprites as module  # the importable copy, even when run as __main__
+
+    argv = [a for a in argv if a != "--watch"]
+    module.main(argv)
+    # Later builds are incremental even if the first one was forced
+    argv = [a for a in argv if a != "--force"]
+    path = module.__file__
+    paths = [path, game_data.DATA_PATH]
+    mtime = [os.stat(p).st_mtime_ns for p in paths]
+    print(f"\nWatching {', '.join(os.path.relpath(p) for p in paths)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                current = [os.stat(p).st_mtime_ns for p in paths]
+            except FileNotFoundError:  # editor mid-save (write + rename)
+                continue
+            if current == mtime:
+                continue
+            mtime = current
+            start = time.perf_counter()
+            try:
+                linecache.checkcache(path)
+                module = importlib.reload(module)
+                module.main(argv)
+            except Exception:
+                traceback.print_exc()
+                print("Build failed; waiting for the next save.")
+                continue
+            print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Search for the factory layout that earns the most gold per minute.
+
+Usage:
+    python3 tools/optimize_layout.py --budget 1000 --regions 0,1 --recipes 0,1,2
+    python3 tools/optimize_layout.py --budget 5000 --regions all --recipes all \\
+        --generations 400 --seed 7 --out best.json --log best.csv
+    python3 tools/optimize_layout.py --check
+
+The budget unlocks machine types (GameState.MACHINE_COSTS; placing a
+machine is free), best first: auto_seller, bottler, fast_belt, splitter,
+sorter, storage. Machines go only on the cells of the unlocked regions
+(RegionManager.REGIONS, region 0 always) and dispensers only make the
+unlocked recipes' ingredients.
+
+factory_sim/optimize.py anneals --chains layouts side by side. Each
+generation's proposals are scored by the event-driven Simulator
+(--warmup in-game minutes, then gold over --eval-minutes) on --workers
+processes (default: all cores), so throughput grows with cores up to one
+chain each. Runs are reproducible: the same --seed and settings give the
+same layout for any --workers.
+
+Writes a savegame.json SaveManager loads as is (copy it over the game's
+save) and a CSV convergence log: per generation, layouts scored so far,
+best and mean gold/min, acceptance rate, temperature and seconds elapsed.
+
+--check runs a short search on 1 and 2 workers and fails unless both
+give the same layout, every machine is on an unlocked cell, the unlocks
+fit the budget, and the saved file reloads and scores what the log says.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from factory_sim import layout_from_save, load_rules
+from factory_sim.optimize import (anneal, load_machine_costs, load_regions, make_problem,
+                                  save_data, score)
+from pack_atlas import write_if_changed
+
+RULES = None
+PROBLEM = None
+
+
+def init_worker(fps, problem):
+    """Pool initializer: parse the rules once per worker."""
+    global RULES, PROBLEM
+    RULES = load_rules(fps)
+    PROBLEM = problem
+
+
+def score_genes(genes):
+    return score(genes, RULES, PROBLEM)
+
+
+def optimize(rules, problem, workers, verbose=True, **settings):
+    """anneal() with each generation scored across `workers` processes."""
+
+    def report(row):
+        if verbose and (row.generation % 10 == 0 or row.generation == settings["generations"] - 1):
+            print(f"  gen {row.generation:4}  best {row.best:8.1f}  mean {row.mean:8.1f} gold/min  "
+                  f"accept {row.acceptance:4.0%}  T {row.temperature:6.2f}  "
+                  f"{row.evaluations} scored  {row.elapsed:6.1f} s")
+
+    if workers <= 1:
+        return anneal(rules, problem, lambda batch: [score(g, rules, problem) for g in batch],
+                      on_generation=report, **settings)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(rules.fps, problem)) as pool:
+        def score_batch(batch):
+            # A few chunks per worker: fewer round trips, still balanced
+            chunk = max(1, len(batch) // (4 * workers))
+            return list(pool.map(score_genes, batch, chunksize=chunk))
+
+        return anneal(rules, problem, score_batch, on_generation=report, **settings)
+
+
+def log_csv(log):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["generation", "evaluations", "best", "mean", "acceptance",
+                     "temperature", "elapsed"])
+    for row in log:
+        writer.writerow([row.generation, row.evaluations, f"{row.best:.3f}", f"{row.mean:.3f}",
+                         f"{row.acceptance:.3f}", f"{row.temperature:.4f}", f"{row.elapsed:.3f}"])
+    return out.getvalue().encode()
+
+
+def parse_indices(text, count, what, parser):
+    if text == "all":
+        return tuple(range(count))
+    values = tuple(sorted({int(v) for v in text.split(",")}))
+    if any(not 0 <= v < count for v in values):
+        parser.error(f"{what} are 0-{count - 1}")
+    return values
+
+
+# ── Check ────────────────────────────────────────────────────────────
+
+def check(rules, regions, costs):
+    problem = make_problem(rules, regions, (0, 1), (0, 3), 600, costs, minutes=1.0)
+    settings = dict(seed=3, chains=6, generations=30, sync=10)
+    results = []
+    for workers in (1, 2):
+        start = time.perf_counter()
+        best, best_score, log = optimize(rules, problem, workers, verbose=False, **settings)
+        wall = time.perf_counter() - start
+        print(f"  {workers} worker{'s' if workers > 1 else ' '}: {len(best)} machines, "
+              f"{best_score:.1f} gold/min, {log[-1].evaluations} layouts in {wall:.1f} s")
+        results.append((best, best_score, [(r.best, r.mean, r.acceptance) for r in log]))
+    ok = True
+    if results[0] != results[1]:
+        print("  FAIL: 1 and 2 workers found different layouts")
+        ok = False
+    best, best_score, _ = results[0]
+    outside = [g for g in best if (g[1], g[2]) not in problem.cells]
+    if outside:
+        print(f"  FAIL: {len(outside)} machines outside the unlocked regions")
+        ok = False
+    spent = 600 - problem.gold
+    if spent != sum(costs[key] for key in problem.machines) or problem.gold < 0:
+        print(f"  FAIL: unlocks cost {spent} of a 600 budget")
+        ok = False
+    data = json.loads(json.dumps(save_data(best, rules, problem)))
+    layout = layout_from_save(data, rules)
+    genes = tuple((m.kind, m.x, m.y, m.dx, m.dy, m.ingredient_type, m.filter_type)
+                  for m in layout.machines)
+    rescored = score(genes, rules, problem)
+    if genes != best or abs(rescored - best_score) > 1e-9:
+        print(f"  FAIL: the saved layout scores {rescored:.1f}, the log says {best_score:.1f}")
+        ok = False
+    if best_score <= 0:
+        print("  FAIL: the search found nothing that sells")
+        ok = False
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Anneal a savegame.json layout for gold/min.")
+    parser.add_argument("--budget", type=int, default=1000,
+                        help="gold for machine unlocks (default: 1000)")
+    parser.add_argument("--regions", default="0",
+                        help="comma-separated unlocked region ids, or all (default: 0)")
+    parser.add_argument("--recipes", default="0,1",
+                        help="comma-separated RECIPE_LIST indices, or all (default: 0,1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chains", type=int, default=16, help="annealing chains (default: 16)")
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--t0", type=float, default=20.0, help="start temperature, gold/min")
+    parser.add_argument("--t1", type=float, default=0.2, help="end temperature, gold/min")
+    parser.add_argument("--sync", type=int, default=25,
+                        help="generations between restarting the worst chains from the best")
+    parser.add_argument("--warmup", type=float, default=0.5,
+                        help="in-game minutes simulated before scoring starts")
+    parser.add_argument("--eval-minutes", type=float, default=2.0,
+                        help="in-game minutes of gold each layout is scored on")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="scoring processes (default: all cores)")
+    parser.add_argument("--out", default="savegame.json", help="where to write the best layout")
+    parser.add_argument("--log", default="convergence.csv", help="where to write the CSV log")
+    parser.add_argument("--check", action="store_true",
+                        help="verify reproducibility, constraints and the saved file")
+    args = parser.parse_args(argv)
+
+    rules = load_rules()
+    regions = load_regions()
+    costs = load_machine_costs()
+    if args.check:
+        if not check(rules, regions, costs):
+            sys.exit(1)
+        print("OK: runs reproduce across workers and the saved layout fits the unlocks.")
+        return
+    if args.budget < costs["auto_seller"]:
+        parser.error(f"nothing sells without an auto_seller ({costs['auto_seller']} gold)")
+    region_ids = set(parse_indices(args.regions, len(regions), "region ids", parser)) | {0}
+    recipes = parse_indices(args.recipes, len(rules.recipes), "recipe indices", parser)
+    problem = make_problem(rules, regions, region_ids, recipes, args.budget, costs,
+                           args.warmup, args.eval_minutes)
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{len(problem.cells)} cells in regions {list(problem.regions)}, recipes {list(recipes)}, "
+          f"unlocking {', '.join(problem.machines[3:])} ({problem.gold} gold left); "
+          f"{args.chains} chains on {workers} worker{'s' if workers > 1 else ''}")
+    best, best_score, log = optimize(rules, problem, workers, seed=args.seed, chains=args.chains,
+                                     generations=args.generations, t0=args.t0, t1=args.t1,
+                                     sync=args.sync)
+    write_if_changed(args.out, json.dumps(save_data(best, rules, problem), indent=2).encode())
+    write_if_changed(args.log, log_csv(log))
+    wall = log[-1].elapsed if log else 0.0
+    print(f"best: {len(best)} machines, {best_score:.1f} gold/min; {log[-1].evaluations} layouts "
+          f"scored, {log[-1].evaluations / max(wall, 1e-9):.1f}/s")
+    print(f"wrote {args.out} and {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Pack item and machine sprites into shared power-of-two texture atlases.
+
+Usage:
+    python3 tools/pack_atlas.py [--max-size 1024] [--padding 2]
+
+Reads every PNG in assets/sprites/items/ and assets/sprites/machines/ (run
+tools/generate_sprites.py first; it calls this stage itself), skyline-packs
+them into as few atlases as fit within --max-size, and writes:
+
+  assets/sprites/atlas/sprites_{n}.png   (smallest power-of-two size that fits)
+  assets/sprites/atlas/sprites.json      (region table, keyed by res:// path)
+  scripts/data/sprite_registry.gd        (the same table as GDScript consts,
+                                          with the atlases as preload()s)
+
+SpriteAtlas (scripts/data/sprite_atlas.gd) builds AtlasTextures from the
+registry, so every item and machine draws from the same texture and the
+game never parses the table or calls load() for a packed sprite.
+Sprites are separated by --padding transparent pixels so linear filtering
+and rotated machines never sample a neighbour.
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+from PIL import Image
+
+SPRITES = os.path.join(os.path.dirname(__file__), "..", "assets", "sprites")
+TABLE_NAME = os.path.join("atlas", "sprites.json")  # relative to the sprites dir
+RES_PREFIX = "res://assets/sprites/"
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), "..", "scripts", "data", "sprite_registry.gd")
+
+# Sprite folders that get packed (relative to assets/sprites/)
+PACKED_DIRS = ["items", "machines"]
+
+# Smallest atlas side pack() will try
+MIN_SIZE = 16
+
+
+def collect_sprites(sprites_dir=SPRITES):
+    """{relative path: Image} for every PNG in PACKED_DIRS, sorted by path."""
+    sprites = {}
+    for d in PACKED_DIRS:
+        for path in sorted(glob.glob(os.path.join(sprites_dir, d, "*.png"))):
+            sprites[f"{d}/{os.path.basename(path)}"] = Image.open(path).convert("RGBA")
+    return sprites
+
+
+def skyline_pack(sizes, width, height, padding):
+    """Bottom-left skyline packing of (name, (w, h)) entries, tallest first.
+
+    The skyline is a list of [x, y, width] segments tracing the top of
+    everything placed so far; each sprite goes wherever its top edge ends
+    up lowest. Returns (placements, leftover) where placements maps
+    name → (x, y) and leftover lists entries that did not fit.
+    """
+    # Pack padded sizes into a bin shrunk by one padding, then shift by it,
+    # so there is a padding gap around every sprite and the atlas edge.
+    bin_w, bin_h = width - padding, height - padding
+    skyline = [[0, 0, bin_w]]
+    placements = {}
+    leftover = []
+    for name, (w, h) in sizes:
+        pw, ph = w + padding, h + padding
+        best = None
+        for i, (sx, _, _) in enumerate(skyline):
+            if sx + pw > bin_w:
+                break
+            # Resting height: tallest segment under the sprite's span
+            top = 0
+            remaining = pw
+            j = i
+            while remaining > 0:
+                top = max(top, skyline[j][1])
+                remaining -= skyline[j][2]
+                j += 1
+            if top + ph <= bin_h and (best is None or (top + ph, sx) < best[0]):
+                best = ((top + ph, sx), i, sx, top)
+        if best is None:
+            leftover.append((name, (w, h)))
+            continue
+        _, i, x, y = best
+        placements[name] = (x + padding, y + padding)
+
+        # Raise the skyline under the sprite, trimming the segments it covers
+        skyline.insert(i, [x, y + ph, pw])
+        j = i + 1
+        while j < len(skyline) and skyline[j][0] < x + pw:
+            seg = skyline[j]
+            overlap = x + pw - seg[0]
+            if overlap >= seg[2]:
+                del skyline[j]
+            else:
+                seg[0] += overlap
+                seg[2] -= overlap
+                break
+        # Merge neighbours at the same height
+        j = 0
+        while j < len(skyline) - 1:
+            if skyline[j][1] == skyline[j + 1][1]:
+                skyline[j][2] += skyline.pop(j + 1)[2]
+            else:
+                j += 1
+    return placements, leftover
+
+
+def pot_sizes(max_size):
+    """Power-of-two (w, h) pairs up to max_size, smallest area first, squarest first."""
+    if max_size < MIN_SIZE:
+        raise ValueError(f"max_size {max_size} is below the smallest atlas side, {MIN_SIZE}px")
+    sides = [1 << n for n in range(MIN_SIZE.bit_length() - 1, max_size.bit_length())
+             if 1 << n <= max_size]
+    return sorted(((w, h) for w in sides for h in sides if w >= h),
+                  key=lambda s: (s[0] * s[1], s[0] - s[1]))
+
+
+def pack(sizes, max_size, padding):
+    """Split sizes across atlases. Returns [((w, h), placements), ...]."""
+    sides = pot_sizes(max_size)
+    remaining = sorted(sizes.items(), key=lambda e: (-e[1][1], -e[1][0], e[0]))
+    atlases = []
+    while remaining:
+        for size in sides:
+            placements, leftover = skyline_pack(remaining, *size, padding)
+            if not leftover:
+                break
+        if not placements:
+            name, (w, h) = remaining[0]
+            raise ValueError(f"{name} ({w}x{h}) does not fit in a {max_size}px atlas")
+        atlases.append((size, placements))
+        remaining = leftover
+    return atlases
+
+
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds them. Returns True if written."""
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    except FileNotFoundError:
+        pass
+    # Temp file + rename, so Godot never imports a half-written atlas
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def render_registry(table):
+    """SpriteRegistry GDScript source for a region table."""
+    atlases = "".join(f'\tpreload("{path}"),\n' for path in table["atlases"])
+    regions = "".join(f'\t"{path}": [{r["atlas"]}, Rect2({", ".join(str(v) for v in r["rect"])})],\n'
+                      for path, r in sorted(table["regions"].items()))
+    return (
+        "class_name SpriteRegistry\n"
+        "## Preloaded sprite atlases and their region table, for SpriteAtlas.\n"
+        "##\n"
+        "## GENERATED by tools/pack_atlas.py along with the atlas PNGs. Do not edit.\n"
+        "\n"
+        f"const ATLASES: Array = [\n{atlases}]\n"
+        "\n"
+        "# res:// sprite path → [atlas index, region]\n"
+        f"const REGIONS: Dictionary = {{\n{regions}}}\n"
+    )
+
+
+def build_atlases(max_size=1024, padding=2, sprites_dir=SPRITES, registry_path=REGISTRY_PATH):
+    """Pack the current sprites and write atlas PNGs plus the region table.
+
+    The table is also written as GDScript to registry_path, unless it is None
+    (packing a tree the game doesn't load, e.g. generate_sprites.py --out).
+    """
+    sprites = collect_sprites(sprites_dir)
+    atlases = pack({name: img.size for name, img in sprites.items()}, max_size, padding)
+    table_path = os.path.join(sprites_dir, TABLE_NAME)
+    atlas_dir = os.path.dirname(table_path)
+    os.makedirs(atlas_dir, exist_ok=True)
+
+    table = {"atlases": [], "regions": {}}
+    for index, ((w, h), placements) in enumerate(atlases):
+        sheet = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        for name, (x, y) in placements.items():
+            sheet.paste(sprites[name], (x, y))
+            sw, sh = sprites[name].size
+            table["regions"][RES_PREFIX + name] = {"atlas": index, "rect": [x, y, sw, sh]}
+        filename = f"sprites_{index}.png"
+        table["atlases"].append(RES_PREFIX + "atlas/" + filename)
+
+        buf = io.BytesIO()
+        sheet.save(buf, format="PNG")
+        if write_if_changed(os.path.join(atlas_dir, filename), buf.getvalue()):
+            print(f"  atlas/{filename}")
+        used = sum(sprites[name].size[0] * sprites[name].size[1] for name in placements)
+        print(f"  atlas {index}: {w}x{h}, {len(placements)} sprites, {used / (w * h):.0%} filled")
+
+    # Remove atlases left over from a previous, larger packing
+    for stale in glob.glob(os.path.join(atlas_dir, "sprites_*.png")):
+        if RES_PREFIX + "atlas/" + os.path.basename(stale) not in table["atlases"]:
+            os.remove(stale)
+
+    data = (json.dumps(table, indent=2, sort_keys=True) + "\n").encode()
+    if write_if_changed(table_path, data):
+        print("  atlas/sprites.json")
+    if registry_path is not None and write_if_changed(registry_path, render_registry(table).encode()):
+        print(f"  {os.path.relpath(registry_path)}")
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack item and machine sprites into atlases.")
+    parser.add_argument("--max-size", type=int, default=1024,
+                        help="largest atlas side in pixels (power of two)")
+    parser.add_argument("--padding", type=int, default=2,
+                        help="transparent pixels between and around sprites")
+    args = parser.parse_args(argv)
+    if args.max_size < MIN_SIZE:
+        parser.error(f"--max-size must be at least {MIN_SIZE}")
+    build_atlases(args.max_size, args.padding)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Plan the fewest machines and belt lanes that hit a production target.
+
+Usage:
+    python3 tools/plan_production.py --gold 3000                 # every recipe unlocked
+    python3 tools/plan_production.py --potions 60 --unlocked 0,1,4 --each
+    python3 tools/plan_production.py --gold 3000 --all-subsets   # all 2^10 unlock sets
+    python3 tools/plan_production.py --check
+
+Reads RECIPE_LIST, PRICE_BY_RECIPE and the machine timing constants from
+the .gd sources (factory_sim/rules.py) and sizes production lines with
+factory_sim/plan.py: dispenser pairs, cauldrons, bottlers, sellers, and
+belt lanes per ingredient and for the potions. --potions X or --gold Y is
+a total per minute across the unlocked recipes, or with --each, per
+recipe. --fast plans fast-belt lanes.
+
+Every query is answered from a table of plans for all 2^len(RECIPE_LIST)
+unlock subsets, cached in tools/.plan_cache.json per target and rebuilt
+when the .gd constants change. --all-subsets summarises that table.
+
+--check brute-forces the cheapest mix of recipes, pair counts and
+bottling for a range of targets and unlock sets and fails if a plan uses
+more machines, then checks the line rates against the simulator on the
+tiled full grid (one dispenser pair, cauldron, bottler and seller per
+tile).
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+
+import game_data
+from factory_sim import Simulator, load_rules
+from factory_sim.plan import machine_rates, plan, plan_all, plan_line, size_line
+from factory_sim.synthetic import tiled_layout
+from pack_atlas import write_if_changed
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".plan_cache.json")
+
+
+def potion_names(rules):
+    data = game_data.load_data()
+    values = game_data.type_values(data)
+    names = {values[item["id"]]: item["name"] for item in data["items"]}
+    return [names.get(potion, str(potion)) for _, _, potion in rules.recipes]
+
+
+# ── Cache ────────────────────────────────────────────────────────────
+
+def query_key(potions, gold, each, fast):
+    target = f"potions={potions:g}" if potions is not None else f"gold={gold:g}"
+    return f"{target},each={int(each)},fast={int(fast)}"
+
+
+def lookup(rules, potions, gold, each, fast, path=CACHE_PATH):
+    """{bitmask: [Line]} for the query, from the cache or computed into it.
+    The file keeps each subset's lines as [recipe, pairs, bottled]."""
+    stamp = hashlib.sha1(repr(rules).encode()).hexdigest()
+    cache = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            cache = json.load(f)
+        if cache.get("stamp") != stamp:
+            cache = {}
+    rates = machine_rates(rules, fast)
+    key = query_key(potions, gold, each, fast)
+    queries = cache.setdefault("queries", {})
+    if key not in queries:
+        table = plan_all(rules, rates, potions, gold, each)
+        queries[key] = {str(mask): [[l.recipe, l.pairs, l.bottled] for l in lines]
+                        for mask, lines in table.items()}
+        cache["stamp"] = stamp
+        if path:
+            write_if_changed(path, json.dumps(cache, separators=(",", ":")).encode())
+    return {int(mask): [size_line(rules, rates, *line) for line in lines]
+            for mask, lines in queries[key].items()}
+
+
+# ── Report ───────────────────────────────────────────────────────────
+
+def print_plan(lines, names):
+    for line in lines:
+        print(f"  {names[line.recipe]}{' (bottled)' if line.bottled else ''}: "
+              f"{line.potions_per_minute:.1f} potions/min, {line.gold_per_minute:.0f} gold/min")
+        print(f"    {line.pairs} dispenser pairs, {line.cauldrons} cauldrons, "
+              f"{line.bottlers} bottlers, {line.sellers} sellers = {line.machines} machines")
+        print(f"    lanes: {line.ingredient_lanes} per ingredient, {line.potion_lanes} for potions")
+    if len(lines) > 1:
+        print(f"  total: {sum(l.machines for l in lines)} machines, "
+              f"{sum(2 * l.ingredient_lanes + l.potion_lanes for l in lines)} lanes, "
+              f"{sum(l.gold_per_minute for l in lines):.0f} gold/min")
+
+
+def describe_lines(lines, names):
+    return " + ".join(f"{names[l.recipe]} x{l.pairs}{' bottled' if l.bottled else ''}" for l in lines)
+
+
+def print_summary(table, names, top=12):
+    machines = [sum(l.machines for l in lines) for lines in table.values() if lines]
+    print(f"  {len(table)} unlock subsets: {min(machines)}-{max(machines)} machines "
+          f"(median {statistics.median(machines):g})")
+    by_plan = {}
+    for mask, lines in table.items():
+        if lines:
+            by_plan.setdefault(tuple((l.recipe, l.pairs, l.bottled) for l in lines), []).append(mask)
+    if len(by_plan) < len(machines):
+        print(f"  {len(by_plan)} distinct plans, most shared first:")
+        for key, masks in sorted(by_plan.items(), key=lambda kv: -len(kv[1]))[:top]:
+            lines = table[masks[0]]
+            print(f"    {len(masks):4} subsets  {sum(l.machines for l in lines):4} machines  "
+                  f"{describe_lines(lines, names)}")
+
+
+# ── Check ────────────────────────────────────────────────────────────
+
+def cheapest(rules, rates, unlocked, potions, gold, limit):
+    """Fewest machines over every mix of up to 2 recipes with up to `limit`
+    pairs each, bottled or not (brute force)."""
+    best = None
+    options = [size_line(rules, rates, r, pairs, bottled)
+               for r in unlocked for pairs in range(1, limit + 1) for bottled in (False, True)]
+    for size in (1, 2):
+        for mix in itertools.combinations(options, size):
+            if len({l.recipe for l in mix}) < size:
+                continue
+            made = sum(l.potions_per_minute if potions is not None else l.gold_per_minute
+                       for l in mix)
+            if made + 1e-9 >= (potions if potions is not None else gold):
+                machines = sum(l.machines for l in mix)
+                best = machines if best is None else min(best, machines)
+    return best
+
+
+def check(rules):
+    rng = random.Random(0)
+    ok = True
+    rates = machine_rates(rules)
+    count = len(rules.recipes)
+    for potions, gold in [(10, None), (45, None), (100, None),
+                          (None, 200), (None, 1000), (None, 2500), (None, 6000)]:
+        worse = 0
+        for _ in range(12):
+            unlocked = tuple(sorted(rng.sample(range(count), rng.randint(1, 4))))
+            planned = sum(l.machines for l in plan(rules, rates, unlocked, potions, gold))
+            lines = [plan_line(rules, rates, r, potions, gold) for r in unlocked]
+            limit = max(l.pairs for l in lines)
+            if cheapest(rules, rates, unlocked, potions, gold, limit) < planned:
+                worse += 1
+        name = f"{potions} potions/min" if potions is not None else f"{gold} gold/min"
+        print(f"  {name:16} {'ok' if not worse else f'{worse} plans beaten by brute force'}")
+        ok = ok and not worse
+
+    layout = tiled_layout(rules)
+    sim = Simulator(layout, rules)
+    sim.run(60 * rules.fps)
+    before = sum(sim.sold.values())
+    minutes = 10
+    sim.run(minutes * 60 * rules.fps)
+    tiles = len(layout.machines) // 30
+    measured = (sum(sim.sold.values()) - before) / minutes / tiles
+    line = size_line(rules, rates, 0, 1, True)
+    agree = abs(measured - line.potions_per_minute) <= 0.01 * line.potions_per_minute + 1 / minutes
+    print(f"  tiled grid: {measured:.2f} potions/min per tile, planned "
+          f"{line.potions_per_minute:.2f} with {line.cauldrons} cauldron, {line.bottlers} bottler, "
+          f"{line.sellers} seller  {'ok' if agree else 'MISMATCH'}")
+    return ok and agree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fewest machines for a potions or gold target.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--potions", type=float, help="potions per minute")
+    target.add_argument("--gold", type=float, help="gold per minute")
+    parser.add_argument("--unlocked", default="all",
+                        help="comma-separated RECIPE_LIST indices (default: all)")
+    parser.add_argument("--each", action="store_true",
+                        help="the target applies to every unlocked recipe, not their total")
+    parser.add_argument("--fast", action="store_true", help="plan fast-belt lanes")
+    parser.add_argument("--all-subsets", action="store_true",
+                        help="summarise the plans of every unlock subset")
+    parser.add_argument("--no-cache", action="store_true", help=f"don't read or write {CACHE_PATH}")
+    parser.add_argument("--check", action="store_true",
+                        help="verify plans by brute force and rates against the simulator")
+    args = parser.parse_args(argv)
+
+    rules = load_rules()
+    if args.check:
+        if not check(rules):
+            sys.exit(1)
+        print("OK: no cheaper mix exists and the rates match the simulator.")
+        return
+    if args.potions is None and args.gold is None:
+        parser.error("give --potions or --gold")
+    count = len(rules.recipes)
+    if args.unlocked == "all":
+        unlocked = tuple(range(count))
+    else:
+        unlocked = tuple(sorted({int(v) for v in args.unlocked.split(",")}))
+        if any(not 0 <= r < count for r in unlocked):
+            parser.error(f"recipe indices are 0-{count - 1}")
+    table = lookup(rules, args.potions, args.gold, args.each, args.fast,
+                   None if args.no_cache else CACHE_PATH)
+    names = potion_names(rules)
+    target = f"{args.potions:g} potions/min" if args.potions is not None else f"{args.gold:g} gold/min"
+    if args.all_subsets:
+        print(f"{target}{' each' if args.each else ''}:")
+        print_summary(table, names)
+        return
+    print(f"{target}{' each' if args.each else ''} from recipes {list(unlocked)}:")
+    print_plan(table[sum(1 << r for r in unlocked)], names)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Lossless palette-indexed PNG encoding for generate_sprites.py (--palette).
+
+A sprite with 256 or fewer distinct RGBA values is stored as a P-mode PNG:
+the colors go in PLTE, their alphas in tRNS, and pixels become 1-8 bit
+indices (Pillow picks the smallest bit depth the palette allows). Anything
+else, or any encoding that would not decode back to the exact same pixels,
+is stored as plain RGBA, as is a sprite whose own-palette file would
+come out larger.
+
+Palettes list translucent colors first so the tRNS chunk stops at the last
+one, and are otherwise ordered by pixel count, so output is deterministic.
+
+shared_palette() builds one project-wide palette from every sprite's
+colors before anything is encoded: the colors of as many sprites as fit in
+256, fewest-colored sprites first, ordered by how many sprites use each.
+Every sprite it covers is indexed against it, even where its own palette
+or RGBA would be smaller: the shared indices are the point (one palette
+for palette swaps and a shared texture import), and each file's PLTE
+stops at the highest index it uses to limit the cost. Sprites it does not
+cover get a palette of their own.
+"""
+
+import io
+import json
+
+from PIL import Image
+
+
+def encode_rgba(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def sprite_colors(img):
+    """Distinct RGBA values of img, translucent first and then most used
+    first, or None if over 256."""
+    colors = img.convert("RGBA").getcolors(256)
+    if colors is None:
+        return None
+    return [rgba for _, rgba in sorted(colors, key=lambda c: (c[1][3] == 255, -c[0], c[1]))]
+
+
+def encode_indexed(img, palette):
+    """P-mode PNG bytes of img against palette ([(r, g, b, a), ...]).
+
+    Every color of img must be in palette. Returns None if the result does
+    not decode back to exactly img.
+    """
+    img = img.convert("RGBA")
+    index = {bytes(rgba): i for i, rgba in enumerate(palette)}
+    rgba_bytes = img.tobytes()
+    pixels = bytes(index[rgba_bytes[i:i + 4]] for i in range(0, len(rgba_bytes), 4))
+    # PLTE only needs to reach the highest index used
+    palette = palette[:max(pixels) + 1]
+    indexed = Image.frombytes("P", img.size, pixels)
+    indexed.putpalette([c for rgba in palette for c in rgba[:3]], rawmode="RGB")
+    alphas = bytes(rgba[3] for rgba in palette)
+    opaque_tail = len(alphas.rstrip(b"\xff"))
+    params = {"transparency": alphas[:opaque_tail]} if opaque_tail else {}
+    buf = io.BytesIO()
+    indexed.save(buf, format="PNG", **params)
+    data = buf.getvalue()
+    if Image.open(io.BytesIO(data)).convert("RGBA").tobytes() != img.tobytes():
+        return None
+    return data
+
+
+def shared_palette(sprites):
+    """One palette for sprites (their sprite_colors() lists; None for
+    sprites over 256 colors): every color of as many sprites as fit,
+    translucent first, then the colors most sprites use."""
+    sprites = [colors for colors in sprites if colors is not None]
+    palette = set()
+    for colors in sorted(sprites, key=len):
+        new = palette.union(colors)
+        if len(new) <= 256:
+            palette = new
+    users = {}
+    for colors in sprites:
+        for rgba in colors:
+            users[rgba] = users.get(rgba, 0) + 1
+    return sorted(palette, key=lambda rgba: (rgba[3] == 255, -users[rgba], rgba))
+
+
+def save_palette(path, palette):
+    """Write palette as JSON, unless the file already holds it."""
+    data = (json.dumps([list(rgba) for rgba in palette]) + "\n").encode()
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def encode_png(img, palette=None):
+    """Lossless encoding of img. Returns (png bytes, rgba size, kind).
+
+    kind is "shared" (indexed against palette, whenever it holds every
+    color of img), "indexed" (own palette, when smaller than RGBA) or
+    "rgba".
+    """
+    rgba = encode_rgba(img)
+    colors = sprite_colors(img)
+    if colors is None:
+        return rgba, len(rgba), "rgba"
+    if palette is not None and set(colors) <= set(palette):
+        data = encode_indexed(img, palette)
+        if data is not None:
+            return data, len(rgba), "shared"
+    data = encode_indexed(img, colors)
+    if data is None or len(data) >= len(rgba):
+        return rgba, len(rgba), "rgba"
+    return data, len(rgba), "indexed"
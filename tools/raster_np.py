@@ -0,0 +1,190 @@
+"""NumPy raster backend for generate_sprites.py (--backend numpy).
+
+ArrayCanvas stands in for both the RGBA Image and its ImageDraw in the
+generators that only need axis-aligned primitives: rects and 1px lines are
+slice assignments, ellipses are boolean-mask fills, and random pixel scatter
+(wood grain, parchment stains) is computed for every pixel in one shot.
+
+Output is pixel-identical to the PIL path:
+  - ImageDraw on an RGBA image writes ink without blending, so every fill
+    here is a plain assignment.
+  - Ellipse masks are rasterized once per (size, bbox) by PIL itself and cached.
+  - Scatter replays the exact Mersenne Twister words random.Random would
+    consume (randint rejection sampling included) and leaves the rng in the
+    same state afterwards, so later draws from it also match.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+_ellipse_masks = {}
+
+
+def ellipse_mask(size, bbox):
+    """Boolean (h, w) mask of PIL's filled ellipse, cached per size and bbox."""
+    key = (size, tuple(bbox))
+    if key not in _ellipse_masks:
+        mask = Image.new("1", size, 0)
+        ImageDraw.Draw(mask).ellipse(bbox, fill=1)
+        _ellipse_masks[key] = np.array(mask, dtype=bool)
+    return _ellipse_masks[key]
+
+
+# ── Mersenne Twister replay ────────────────────────────────────────────────
+
+def _mt_state(rng):
+    state = np.random.RandomState()
+    internal = rng.getstate()[1]
+    state.set_state(("MT19937", np.array(internal[:-1], dtype=np.uint32), internal[-1]))
+    return state
+
+
+def _mt_words(rng, count):
+    """The next `count` 32-bit outputs of rng, without advancing it."""
+    return _mt_state(rng).randint(0, 2 ** 32, size=count, dtype=np.uint32)
+
+
+def _mt_advance(rng, count):
+    """Advance rng past `count` 32-bit outputs."""
+    state = _mt_state(rng)
+    state.randint(0, 2 ** 32, size=count, dtype=np.uint32)
+    _, key, pos = state.get_state()[:3]
+    rng.setstate((3, tuple(int(k) for k in key) + (int(pos),), None))
+
+
+def _randint_accepts(words, lo, hi):
+    """(accepted?, value) per word for random.randint(lo, hi).
+
+    randint draws getrandbits(k) = word >> (32 - k), k = n.bit_length(),
+    and rejects results >= n.
+    """
+    n = hi - lo + 1
+    bits = words >> np.uint32(32 - n.bit_length())
+    return bits < n, bits.astype(np.int64) + lo
+
+
+def _next_true(mask):
+    """For each index, the first index >= it where mask is set (len(mask) if none)."""
+    length = len(mask)
+    idx = np.where(mask, np.arange(length), length)
+    return np.append(np.minimum.accumulate(idx[::-1])[::-1], length)
+
+
+def replay_scatter_draws(rng, count, x_range, y_range, factors):
+    """Vectorized equivalent of `count` rounds of
+    (rng.randint(*x_range), rng.randint(*y_range), rng.uniform(*factors)).
+
+    Returns (xs, ys, fs) arrays and advances rng exactly as the loop would.
+    """
+    length = count * 8 + 64
+    while True:
+        words = _mt_words(rng, length)
+        x_ok, x_val = _randint_accepts(words, *x_range)
+        y_ok, y_val = _randint_accepts(words, *y_range)
+        next_x = _next_true(x_ok)
+        next_y = _next_true(y_ok)
+
+        # step[p]: where the next round starts if one starts at word p
+        # (x scan, y scan, then two words for uniform). Clamped sentinel = length.
+        pos = np.arange(length + 1)
+        x_at = next_x[pos]
+        y_at = next_y[np.minimum(x_at + 1, length)]
+        step = np.minimum(y_at + 3, length)
+
+        # Start of every round via pointer doubling: start[t] = step^t(0)
+        rounds = np.arange(count + 1)
+        starts = np.zeros(count + 1, dtype=np.int64)
+        jump = step
+        bit = 0
+        while (1 << bit) <= count:
+            take = (rounds >> bit) & 1 == 1
+            starts[take] = jump[starts[take]]
+            jump = jump[jump]
+            bit += 1
+
+        if starts[-1] < length:
+            break
+        length *= 2  # Unlucky run of rejections: replay a longer stream
+
+    starts = starts[:-1]
+    xi = next_x[starts]
+    yi = next_y[xi + 1]
+    # random.random(): (a * 2**26 + b) / 2**53 from two words
+    a = (words[yi + 1] >> np.uint32(5)).astype(np.float64)
+    b = (words[yi + 2] >> np.uint32(6)).astype(np.float64)
+    uniform = (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+    lo, hi = factors
+    fs = lo + (hi - lo) * uniform
+
+    _mt_advance(rng, int(yi[-1]) + 3 if count else 0)
+    return x_val[xi], y_val[yi], fs
+
+
+# ── Canvas ─────────────────────────────────────────────────────────────────
+
+class ArrayCanvas:
+    """RGBA pixel array supporting the ImageDraw subset used by array-friendly generators."""
+
+    def __init__(self, size, color=(0, 0, 0, 0)):
+        self.size = size
+        self.pixels = np.empty((size[1], size[0], 4), dtype=np.uint8)
+        self.pixels[:] = color
+
+    def _fill_box(self, x0, y0, x1, y1, fill):
+        w, h = self.size
+        self.pixels[max(y0, 0):min(y1 + 1, h), max(x0, 0):min(x1 + 1, w)] = fill
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        if outline is not None:
+            raise NotImplementedError("ArrayCanvas.rectangle supports fill only")
+        x0, y0, x1, y1 = xy
+        self._fill_box(x0, y0, x1, y1, fill)
+
+    def line(self, xy, fill=None, width=1):
+        x0, y0, x1, y1 = xy
+        if width != 1 or (x0 != x1 and y0 != y1):
+            raise NotImplementedError("ArrayCanvas.line supports 1px axis-aligned lines only")
+        self._fill_box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1), fill)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        if outline is not None:
+            raise NotImplementedError("ArrayCanvas.ellipse supports fill only")
+        self.pixels[ellipse_mask(self.size, xy)] = fill
+
+    def putpixel(self, xy, color):
+        x, y = xy
+        self.pixels[y, x] = color
+
+    def scatter(self, rng, count, x_range, y_range, color, factors, ox=0):
+        """Set `count` random pixels to clamp(int(color * factor)), alpha kept.
+
+        That is what both darken() and lighten() compute. Later pixels win
+        where coordinates repeat, as with sequential putpixel calls.
+        """
+        xs, ys, fs = replay_scatter_draws(rng, count, x_range, y_range, factors)
+        w = self.size[0]
+        # Keep only the last write to each pixel
+        flat = (ys * w + xs + ox)[::-1]
+        _, last = np.unique(flat, return_index=True)
+        keep = count - 1 - last
+        rgb = np.clip(np.trunc(np.asarray(color[:3], dtype=np.float64) * fs[keep, None]), 0, 255)
+        self.pixels[ys[keep], xs[keep] + ox, :3] = rgb.astype(np.uint8)
+        self.pixels[ys[keep], xs[keep] + ox, 3] = color[3]
+
+    def paste(self, im, xy, mask):
+        """Copy im's pixels where mask is nonzero (Image.paste with a 0/255 mask)."""
+        x, y = xy
+        src = np.asarray(im.convert("RGBA"))
+        covered = np.asarray(mask) > 0
+        h, w = src.shape[:2]
+        # Clip to the canvas
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.size[0]), min(y + h, self.size[1])
+        if x0 >= x1 or y0 >= y1:
+            return
+        sub = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        region = self.pixels[y0:y1, x0:x1]
+        region[covered[sub]] = src[sub][covered[sub]]
+
+    def to_image(self):
+        return Image.fromarray(self.pixels, "RGBA")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Simulate a saved factory headlessly and report gold per minute.
+
+Usage:
+    python3 tools/simulate_factory.py                        # the game's own save
+    python3 tools/simulate_factory.py savegame.json --minutes 30
+    python3 tools/simulate_factory.py --full-grid            # tiled 60x35 benchmark layout
+    python3 tools/simulate_factory.py --full-grid --size 600x350 --kernel --minutes 1
+    python3 tools/simulate_factory.py --check                # engine vs frame-by-frame reference
+
+Loads the `machines` array SaveManager writes (default: the save in
+Godot's user:// directory on Linux) and runs it with the factory_sim
+package: the push + reservation model of MachineBase on a flat 60x35 cell
+array, with belt and fast-belt speeds, dispenser, brew, bottle and sell
+times, recipes and prices all read from the .gd sources. Timings are
+whole frames at --fps (60 by default), reproduced frame-exactly.
+
+The report covers --minutes of game time after --warmup seconds (lines
+start empty), plus how many times faster than real time it ran. Gold is
+AutoSeller income only; order rewards are random and left out.
+
+--kernel runs the vectorized tick kernel (factory_sim/kernel.py) instead,
+reports item-moves per second, and compares its gold/min and speed with
+the exact engine on the same layout and on --kernel-seeds random layouts.
+--size sets the --full-grid dimensions.
+
+--check runs the event-driven engine and the kernel against a literal
+frame-by-frame transcription of the machine scripts
+(factory_sim/reference.py) on the given save, a tiled grid and --seeds
+random layouts of every machine type, and fails unless every machine
+holds the same item each second and every sale happens on the same frame
+(for the kernel: the same gold each second).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import game_data
+from factory_sim import Simulator, layout_from_save, load_rules
+from factory_sim.kernel import Kernel
+from factory_sim.layout import SAVE_PATH
+from factory_sim.reference import ReferenceWorld
+from factory_sim.rules import DEFAULT_FPS
+from factory_sim.synthetic import random_layout, tiled_layout
+
+
+def potion_names():
+    data = game_data.load_data()
+    values = game_data.type_values(data)
+    return {values[item["id"]]: item["name"] for item in data["items"]}
+
+
+# ── Report ───────────────────────────────────────────────────────────
+
+def simulate(layout, rules, minutes, warmup, kernel=False):
+    """(Simulator or Kernel, potions sold and gold made during the measured
+    window, wall seconds)."""
+    sim = (Kernel if kernel else Simulator)(layout, rules)
+    start = time.perf_counter()
+    sim.run(round(warmup * rules.fps))
+    gold, before = sim.gold, Counter(sim.sold)
+    sim.run(round(minutes * 60 * rules.fps))
+    wall = time.perf_counter() - start
+    sold = Counter(sim.sold)
+    sold.subtract(before)
+    return sim, sold, sim.gold - gold, wall
+
+
+def report(name, layout, rules, minutes, warmup, kernel=False):
+    sim, sold, gold, wall = simulate(layout, rules, minutes, warmup, kernel)
+    game_seconds = warmup + minutes * 60
+    names = potion_names()
+    print(f"{name}: {len(layout.machines)} machines, recipes {list(layout.unlocked_recipes)}")
+    print(f"  {gold / minutes:.1f} gold/min over {minutes:g} min after a {warmup:g} s warmup")
+    for (potion_type, bottled), count in sorted(sold.items()):
+        if count:
+            label = names.get(potion_type, str(potion_type)) + (" (bottled)" if bottled else "")
+            print(f"    {count / minutes:7.2f}/min  {label}")
+    if sim.lost:
+        print(f"  {sim.lost} items lost to machines that refused them")
+    print(f"  {game_seconds:g} game seconds in {wall * 1000:.0f} ms "
+          f"({game_seconds / wall:.0f}x real time)")
+    if kernel:
+        print(f"  {sim.item_moves} item-moves, {sim.item_moves / wall / 1e6:.2f} million/s")
+        _, _, exact, exact_wall = simulate(layout, rules, minutes, warmup)
+        diff = f" ({(gold - exact) / exact:+.1%})" if exact else ""
+        print(f"  exact engine: {exact / minutes:.1f} gold/min{diff}, "
+              f"{game_seconds / exact_wall:.0f}x real time")
+
+
+def compare_kernel(rules, seeds, minutes, warmup):
+    """Kernel against the exact engine on random layouts: gold and speed."""
+    game_seconds = warmup + minutes * 60
+    errors = []
+    print(f"kernel vs engine on {seeds} random 14x12 layouts, {minutes:g} min:")
+    for seed in range(seeds):
+        layout = random_layout(rules, seed, 14, 12, 24)
+        _, _, gold, wall = simulate(layout, rules, minutes, warmup, kernel=True)
+        _, _, exact, exact_wall = simulate(layout, rules, minutes, warmup)
+        error = (gold - exact) / exact if exact else 0.0
+        errors.append(error)
+        print(f"  random seed {seed:<3} {gold / minutes:8.1f} vs {exact / minutes:8.1f} gold/min "
+              f"({error:+6.1%})  kernel {game_seconds / wall:5.0f}x, "
+              f"engine {game_seconds / exact_wall:6.0f}x real time")
+    if errors:
+        worst = max(range(seeds), key=lambda i: abs(errors[i]))
+        print(f"  exact on {sum(e == 0 for e in errors)} of {seeds}, mean |error| "
+              f"{sum(abs(e) for e in errors) / seeds:.1%}, worst {errors[worst]:+.1%} (seed {worst})")
+
+
+# ── Check ────────────────────────────────────────────────────────────
+
+def compare(name, layout, rules, seconds):
+    """Run engine, kernel and reference side by side, comparing what every
+    machine holds each second and every sale (the kernel's gold); print and
+    return whether they agree."""
+    sim = Simulator(layout, rules, log_sales=True)
+    kernel = Kernel(layout, rules)
+    ref = ReferenceWorld(layout, rules)
+    mismatch = None
+    for second in range(1, round(seconds) + 1):
+        sim.run(rules.fps)
+        kernel.run(rules.fps)
+        for _ in range(rules.fps):
+            ref.step()
+        held = [(m.current_item.item_type, m.current_item.is_bottled) if m.current_item else None
+                for m in ref.machines]
+        if held != [(item[0], item[1]) if item else None for item in sim.cur]:
+            mismatch = f"machine contents differ after {second} s"
+            break
+        if sim.sales != ref.sales:
+            mismatch = f"sales differ after {second} s"
+            break
+        types, bottled = kernel.items["type"].tolist(), kernel.items["bottled"].tolist()
+        if held != [(t, b) if t else None for t, b in zip(types, bottled)]:
+            mismatch = f"kernel machine contents differ after {second} s"
+            break
+        if kernel.gold != ref.gold:
+            mismatch = f"kernel gold differs after {second} s"
+            break
+    print(f"  {name:18} {len(layout.machines):4} machines, {len(ref.sales):4} sales, "
+          f"{ref.gold:6} gold  {'MISMATCH: ' + mismatch if mismatch else 'ok'}")
+    return mismatch is None
+
+
+def check(rules, save, seeds, seconds):
+    layouts = []
+    if save is not None:
+        layouts.append((os.path.basename(save[0]), save[1]))
+    layouts.append(("tiled 12x10", tiled_layout(rules, 12, 10)))
+    layouts += [(f"random seed {seed}", random_layout(rules, seed)) for seed in range(seeds)]
+    return all([compare(name, layout, rules, seconds) for name, layout in layouts])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless factory simulation of savegame.json.")
+    parser.add_argument("save", nargs="?", help=f"savegame.json (default: {SAVE_PATH})")
+    parser.add_argument("--minutes", type=float, default=10.0, help="measured game minutes")
+    parser.add_argument("--warmup", type=float, default=60.0, help="game seconds before measuring")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS, help="frame rate the game runs at")
+    parser.add_argument("--full-grid", action="store_true",
+                        help="simulate a tiled layout filling the whole grid instead of a save")
+    parser.add_argument("--size", default=None, metavar="WxH",
+                        help="grid size for --full-grid (default: the game's)")
+    parser.add_argument("--kernel", action="store_true",
+                        help="run the vectorized tick kernel and compare it with the engine")
+    parser.add_argument("--kernel-seeds", type=int, default=8,
+                        help="random layouts --kernel also compares with the engine")
+    parser.add_argument("--check", action="store_true",
+                        help="compare the engine with the frame-by-frame reference")
+    parser.add_argument("--seeds", type=int, default=12, help="random layouts for --check")
+    parser.add_argument("--check-seconds", type=float, default=90.0,
+                        help="game seconds per --check layout")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.fps)
+    save = None
+    path = args.save or SAVE_PATH
+    if not args.full_grid and (args.save or os.path.exists(path)):
+        with open(path) as f:
+            save = (path, layout_from_save(json.load(f), rules))
+
+    if args.check:
+        if not check(rules, save, args.seeds, args.check_seconds):
+            sys.exit(1)
+        print("OK: the engine and the kernel match the frame-by-frame reference.")
+        return
+    if args.full_grid:
+        width, height = rules.width, rules.height
+        if args.size:
+            width, height = (int(v) for v in args.size.lower().split("x"))
+        report(f"full grid {width}x{height}", tiled_layout(rules, width, height), rules,
+               args.minutes, args.warmup, args.kernel)
+    elif save is not None:
+        report(path, save[1], rules, args.minutes, args.warmup, args.kernel)
+    else:
+        parser.error(f"no save at {path}; pass one or use --full-grid")
+    if args.kernel and args.kernel_seeds:
+        compare_kernel(rules, args.kernel_seeds, args.minutes, args.warmup)
+
+
+if __name__ == "__main__":
+    main()